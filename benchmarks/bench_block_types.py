@@ -0,0 +1,84 @@
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from conversion import BlockType, block_to_block_type, blocks_to_block_types
+
+def block_to_block_type_chained(block):
+    # The previous if/elif chain
+    if block.startswith("# "):
+        return BlockType.HEADING
+    elif block.startswith("## "):
+        return BlockType.HEADING
+    elif block.startswith("### "):
+        return BlockType.HEADING
+    elif block.startswith("#### "):
+        return BlockType.HEADING
+    elif block.startswith("##### "):
+        return BlockType.HEADING
+    elif block.startswith("###### "):
+        return BlockType.HEADING
+    elif block.startswith("> "):
+        return BlockType.QUOTE
+    elif block.startswith("- ") or block.startswith("* ") or re.match(r"^\d+\. ", block):
+        if re.match(r"^\d+\. ", block):
+            return BlockType.ORDERED_LIST
+        else:
+            return BlockType.UNORDERED_LIST
+    elif block.startswith("```") and block.endswith("```"):
+        return BlockType.CODE
+    else:
+        return BlockType.PARAGRAPH
+
+def chained_checks(block):
+    # Number of startswith/re.match calls the chain above makes for a block
+    for level in range(1, 7):
+        if block.startswith("#" * level + " "):
+            return level
+    if block.startswith("> "):
+        return 7
+    if block.startswith("- "):
+        return 9
+    if block.startswith("* "):
+        return 10
+    if re.match(r"^\d+\. ", block):
+        return 11
+    return 12 if block.startswith("```") else 11
+
+def table_checks(block):
+    # The table runs the one rule registered for the first character
+    return 1 if block[:1] in "#>-*`" or block[:1].isdecimal() else 0
+
+# Rough share of each block type on a documentation page
+MIX = [
+    ("This is a paragraph of prose with **bold** text.", 50),
+    ("## A section heading", 15),
+    ("- an item\n- another item", 12),
+    ("1. first step\n2. second step", 8),
+    ("```python\nprint('hello')\n```", 10),
+    ("> a quoted remark", 5),
+]
+
+def main():
+    blocks = [block for block, weight in MIX for _ in range(weight)] * 200
+    assert blocks_to_block_types(blocks) == [block_to_block_type_chained(b) for b in blocks]
+
+    print(f"{'block type':>16} {'checks (chain)':>15} {'checks (table)':>15}")
+    for block, _ in MIX:
+        block_type = block_to_block_type(block)
+        print(f"{block_type.value:>16} {chained_checks(block):>15} {table_checks(block):>15}")
+
+    print()
+    chained = min(timeit.repeat(lambda: [block_to_block_type_chained(b) for b in blocks], number=10, repeat=5))
+    single = min(timeit.repeat(lambda: [block_to_block_type(b) for b in blocks], number=10, repeat=5))
+    batch = min(timeit.repeat(lambda: blocks_to_block_types(blocks), number=10, repeat=5))
+    per_block = 1e9 / (10 * len(blocks))
+    print(f"{'if/elif chain':>16} {chained * per_block:>8.1f} ns/block")
+    print(f"{'table':>16} {single * per_block:>8.1f} ns/block")
+    print(f"{'table (batch)':>16} {batch * per_block:>8.1f} ns/block")
+
+if __name__ == "__main__":
+    main()
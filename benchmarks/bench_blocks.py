@@ -0,0 +1,56 @@
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from conversion import iter_markdown_blocks, markdown_to_blocks
+
+BLOCK = (
+    "## Section heading\n\n"
+    "A paragraph of documentation text with a [link](https://example.com) "
+    "and some **bold** words that wraps\nonto a second line.\n\n"
+    "- first item\n- second item\n- third item\n\n"
+)
+
+def write_corpus(path, megabytes):
+    with open(path, "w", encoding="utf-8") as f:
+        for _ in range(megabytes * 1024 * 1024 // len(BLOCK)):
+            f.write(BLOCK)
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, elapsed, peak
+
+def main():
+    print(f"{'MB':>5} {'mode':>12} {'blocks':>8} {'time (s)':>9} {'peak (MB)':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "corpus.md")
+        for megabytes in (4, 16, 32):
+            write_corpus(path, megabytes)
+
+            def whole_string():
+                with open(path, encoding="utf-8") as f:
+                    return len(markdown_to_blocks(f.read()))
+
+            def streamed():
+                with open(path, encoding="utf-8") as f:
+                    return sum(1 for _ in iter_markdown_blocks(f))
+
+            def mmapped():
+                with open(path, "rb") as f:
+                    return sum(1 for _ in iter_markdown_blocks(f, use_mmap=True))
+
+            for name, func in (("string", whole_string), ("stream", streamed), ("mmap", mmapped)):
+                count, elapsed, peak = measure(func)
+                print(f"{megabytes:>5} {name:>12} {count:>8} {elapsed:>9.2f} {peak / 2**20:>10.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from conversion import block_to_html_node, markdown_to_html_node
+
+def api_reference(rng, functions=40):
+    # Listings with blank lines between definitions, as in generated API docs
+    parts = ["# API reference", "Functions exported by the client module."]
+    for i in range(functions):
+        body = "\n".join(f"    value_{j} = fetch(session, limit={rng.randrange(100)}) if a < b else None" for j in range(6))
+        parts.append(f"## Fetch {i}")
+        parts.append(f"```python\ndef fetch_{i}(session, limit=10):\n    \"\"\"Doc for fetch_{i}.\"\"\"\n\n{body}\n\n    return value_0\n```")
+    return "\n\n".join(parts)
+
+def log_dump(rng, lines=600):
+    levels = ("INFO", "WARN", "DEBUG", "ERROR")
+    entries = []
+    for i in range(lines):
+        entries.append(f"2024-01-01T00:{i // 60 % 60:02d}:{i % 60:02d} [{rng.choice(levels)}] worker_{rng.randrange(8)} <job id={i}> took {rng.random():.3f}s & retried")
+        if rng.random() < 0.1:
+            entries.append("")
+    return "# Nightly log\n\n```\n" + "\n".join(entries) + "\n```"
+
+def legacy_render(markdown):
+    # The old path: blank lines split the fence into paragraphs, each of which
+    # went through inline parsing (and often tripped over "_")
+    html, errors = [], 0
+    for block in (part.strip() for part in markdown.split("\n\n")):
+        if not block:
+            continue
+        try:
+            html.append(block_to_html_node(block).to_html())
+        except ValueError:
+            errors += 1
+    return "".join(html), errors
+
+def best_of(func, pages, repeats=5):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for page in pages:
+            func(page)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    rng = random.Random(17)
+    corpora = {
+        "api reference": [api_reference(rng) for _ in range(50)],
+        "log dump": [log_dump(rng) for _ in range(50)],
+    }
+    print(f"{'corpus':>14} {'MB':>6} {'legacy (ms)':>12} {'errors':>7} {'fenced (ms)':>12} {'MB/s':>7} {'speedup':>8}")
+    for name, pages in corpora.items():
+        megabytes = sum(len(page) for page in pages) / 2**20
+        errors = sum(legacy_render(page)[1] for page in pages)
+        legacy = best_of(legacy_render, pages)
+        fenced = best_of(lambda page: markdown_to_html_node(page).to_html(), pages)
+        print(
+            f"{name:>14} {megabytes:>6.2f} {legacy * 1e3:>12.1f} {errors:>7} {fenced * 1e3:>12.1f} "
+            f"{megabytes / fenced:>7.1f} {legacy / fenced:>7.1f}x"
+        )
+
+if __name__ == "__main__":
+    main()
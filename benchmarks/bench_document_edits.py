@@ -0,0 +1,52 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from conversion import markdown_to_html_node
+from corpus import generate
+from document import Document
+
+def document_of(blocks):
+    pages = generate("mixed", max(1, blocks // 20), blocks=20)
+    return "\n\n".join(pages)
+
+def type_into(doc, offset, keystrokes):
+    # Types characters one at a time, as an editor would send them
+    start = time.perf_counter()
+    for i, char in enumerate(keystrokes):
+        doc.apply_edit(offset + i, 0, char)
+    return (time.perf_counter() - start) / len(keystrokes)
+
+def main():
+    keystrokes = "typing a few more words "
+    print(f"{'blocks':>7} {'MB':>6} {'full parse (ms)':>16} {'edit (us)':>10} {'alternating ends (us)':>22}")
+    for blocks in (100, 1_000, 10_000, 50_000):
+        markdown = document_of(blocks)
+        start = time.perf_counter()
+        markdown_to_html_node(markdown)
+        full = time.perf_counter() - start
+
+        doc = Document(markdown)
+        middle = markdown.index("\n\n", len(markdown) // 2)
+        local = type_into(doc, middle, keystrokes)
+
+        # Alternating between the two ends makes every edit move the offsets
+        # of all the blocks in between; only the per-chunk shifts should grow
+        # with the document
+        doc = Document(markdown)
+        start = time.perf_counter()
+        for i in range(len(keystrokes)):
+            if i % 2 == 0:
+                doc.apply_edit(0, 0, "x")
+            else:
+                doc.apply_edit(len(doc), 0, "\n\nx")
+        alternating = (time.perf_counter() - start) / len(keystrokes)
+        print(
+            f"{blocks:>7} {len(markdown) / 2**20:>6.2f} {full * 1e3:>16.1f} "
+            f"{local * 1e6:>10.1f} {alternating * 1e6:>22.1f}"
+        )
+
+if __name__ == "__main__":
+    main()
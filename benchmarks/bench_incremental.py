@@ -0,0 +1,49 @@
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from build import build_site
+
+TEMPLATE = "<html><head><title>{{ Title }}</title></head><body>{{ Content }}</body></html>"
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+def page(i, edited=False):
+    paragraphs = [
+        f"Paragraph {j} of page {i} with **bold**, _italic_ and a [link](/section-{j}/page-{i}.html)."
+        for j in range(20)
+    ]
+    if edited:
+        paragraphs.append("An edit.")
+    return f"# Page {i}\n\n" + "\n\n".join(paragraphs)
+
+def main():
+    with tempfile.TemporaryDirectory() as root:
+        content = os.path.join(root, "content")
+        static = os.path.join(root, "static")
+        public = os.path.join(root, "public")
+        template = os.path.join(root, "template.html")
+        write(template, TEMPLATE)
+        write(os.path.join(static, "styles.css"), "body { margin: 0; }")
+        for i in range(2_000):
+            write(os.path.join(content, f"section-{i % 20}", f"page-{i}.md"), page(i))
+
+        def run(label):
+            report = build_site(content, template, public, static)
+            print(f"{label:>18} {len(report.rebuilt):>8} {len(report.skipped):>8} {report.elapsed * 1e3:>10.1f}")
+
+        print(f"{'build':>18} {'rebuilt':>8} {'skipped':>8} {'time (ms)':>10}")
+        run("full")
+        run("no-op")
+        write(os.path.join(content, "section-7", "page-7.md"), page(7, edited=True))
+        run("one file changed")
+        write(template, TEMPLATE.replace("<body>", "<body class='x'>"))
+        run("template changed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from textnode import TextNode, TextType
+from conversion import (
+    split_nodes_delimiter,
+    split_nodes_images,
+    split_nodes_links,
+    text_to_text_nodes,
+)
+
+WORDS = ["lorem", "ipsum", "dolor", "sit", "amet", "consectetur", "adipiscing", "elit"]
+MARKUP = [
+    "**bold words**",
+    "_italic words_",
+    "`inline code`",
+    "[a link](https://example.com/docs)",
+    "![an image](https://example.com/image.png)",
+]
+
+def split_in_passes(text):
+    nodes = [TextNode(text, TextType.TEXT)]
+    nodes = split_nodes_images(nodes)
+    nodes = split_nodes_links(nodes)
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    return nodes
+
+def make_paragraph(words, density):
+    # density is the share of tokens that are inline markup
+    parts = []
+    every = round(1 / density) if density else 0
+    for i in range(words):
+        if every and i % every == 0:
+            parts.append(MARKUP[(i // every) % len(MARKUP)])
+        else:
+            parts.append(WORDS[i % len(WORDS)])
+    return " ".join(parts)
+
+def best_of(func, text, number):
+    return min(timeit.repeat(lambda: func(text), number=number, repeat=5)) / number
+
+def main():
+    # text_to_text_nodes is the same passes behind a no-markup shortcut, so
+    # "shortcut" is what skipping them saves: about 1.00x once there is markup
+    print(f"{'words':>7} {'density':>8} {'passes (us)':>12} {'text_to_text_nodes (us)':>24} {'shortcut':>9}")
+    for words in (50, 500, 5000):
+        for density in (0.0, 0.05, 0.2, 0.5):
+            text = make_paragraph(words, density)
+            assert text_to_text_nodes(text) == split_in_passes(text)
+            number = max(1, 20000 // words)
+            passes = best_of(split_in_passes, text, number)
+            current = best_of(text_to_text_nodes, text, number)
+            print(f"{words:>7} {density:>8.2f} {passes * 1e6:>12.1f} {current * 1e6:>24.1f} {passes / current:>8.2f}x")
+
+if __name__ == "__main__":
+    main()
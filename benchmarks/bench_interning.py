@@ -0,0 +1,45 @@
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from conversion import LeafNodeInterner, text_node_to_html_node, text_to_text_nodes
+
+NAV = " | ".join(f"[{name}](/{name.lower()}/)" for name in ("Home", "Docs", "Blog", "About", "Contact"))
+FOOTER = (
+    "![GitHub](/icons/github.svg) ![RSS](/icons/rss.svg) "
+    "**Example Corp** _since 2009_ [Privacy](/privacy/) [Terms](/terms/)"
+)
+
+def page(i):
+    # Boilerplate nav and footer around a body that is unique to the page
+    body = f"Page {i} explains [topic {i}](/docs/topic-{i}/) with **detail {i}** and `code{i}`."
+    return [NAV, body, FOOTER]
+
+def convert(pages, to_html):
+    return [[to_html(node) for block in blocks for node in text_to_text_nodes(block)] for blocks in pages]
+
+def measure(pages, to_html):
+    start = time.perf_counter()
+    convert(pages, to_html)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    result = convert(pages, to_html)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, retained, sum(len(leaves) for leaves in result)
+
+def main():
+    print(f"{'pages':>7} {'mode':>9} {'leaves':>8} {'time (ms)':>10} {'retained MB':>12} {'hit rate':>9}")
+    for count in (1_000, 5_000, 20_000):
+        pages = [page(i) for i in range(count)]
+        elapsed, retained, leaves = measure(pages, text_node_to_html_node)
+        print(f"{count:>7} {'plain':>9} {leaves:>8} {elapsed * 1e3:>10.1f} {retained / 2**20:>12.2f} {'-':>9}")
+        interner = LeafNodeInterner(maxsize=1024)
+        elapsed, retained, leaves = measure(pages, interner)
+        print(f"{count:>7} {'interned':>9} {leaves:>8} {elapsed * 1e3:>10.1f} {retained / 2**20:>12.2f} {interner.hit_rate:>8.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from build import build_site
+
+TEMPLATE = "<html><head><title>{{ Title }}</title></head><body>{{ Content }}</body></html>"
+
+def write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+def page(i):
+    return (f"# Page {i}\n\nA short page with a [link](/p/{i + 1}.html) and **bold** text.\n").encode()
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    with tempfile.TemporaryDirectory() as root:
+        content = os.path.join(root, "content")
+        static = os.path.join(root, "static")
+        template = os.path.join(root, "template.html")
+        write(template, TEMPLATE.encode())
+        for i in range(pages):
+            write(os.path.join(content, f"s{i % 100}", f"p{i}.md"), page(i))
+        for i in range(pages // 10):
+            write(os.path.join(static, "img", f"{i}.bin"), os.urandom(32 * 1024))
+
+        print(f"{pages} pages, {pages // 10} static files of 32 KiB")
+        print(f"{'build':>16} {'io threads':>10} {'read':>8} {'render':>8} {'write':>8} {'copy':>8} {'total':>8} {'written':>8}")
+        for workers in (1, 8):
+            public = os.path.join(root, f"public-{workers}")
+            for label, force in (("full", False), ("forced, same", True)):
+                report = build_site(content, template, public, static, force=force, io_workers=workers)
+                t = {stage: seconds * 1e3 for stage, seconds in report.timings.items()}
+                written = len(report.rebuilt) - len(report.unchanged)
+                print(
+                    f"{label:>16} {workers:>10} {t['read']:>8.1f} {t['render']:>8.1f} {t['write']:>8.1f} "
+                    f"{t['copy']:>8.1f} {report.elapsed * 1e3:>8.1f} {written:>8}"
+                )
+        print("times in ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from html.parser import HTMLParser
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from build import build_site
+from conversion import markdown_to_html_node
+from corpus import WORDS, generate
+from links import LinkIndex, page_links
+
+# Share of links that point at pages which do not exist
+BROKEN = 0.02
+
+_LINK_RE = re.compile(r"\]\(/[a-z]+/\d+/\)")
+
+def site_pages(pages):
+    # The links corpus, laid out as section-<n>/page-<i>.md, with its links
+    # pointed at other pages of the site and a few at missing ones
+    rng = random.Random(5)
+
+    def target(_):
+        index = rng.randrange(pages)
+        if rng.random() < BROKEN:
+            return f"](/missing/page-{index})"
+        return f"](/section-{index % 10}/page-{index})"
+
+    return {
+        f"section-{index % 10}/page-{index}.md": _LINK_RE.sub(target, markdown)
+        for index, markdown in enumerate(generate("links", pages, blocks=8))
+    }
+
+def write_site(content, static, sources):
+    for source, markdown in sources.items():
+        path = os.path.join(content, source)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(markdown)
+    os.makedirs(os.path.join(static, "images"))
+    for word in WORDS:
+        with open(os.path.join(static, "images", f"{word}.png"), "wb") as f:
+            f.write(b"png")
+
+def collect(trees, static):
+    # Links taken from the node trees the build already has in memory
+    index = LinkIndex()
+    for source, tree in trees.items():
+        index.add_page(source, source[:-3] + ".html", page_links(tree))
+    for path in static:
+        index.add_static(path)
+    return index.check()
+
+class LinkCollector(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.urls = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "a" and "href" in attrs:
+            self.urls.append(attrs["href"])
+        elif tag == "img" and "src" in attrs:
+            self.urls.append(attrs["src"])
+
+def crawl(public_dir):
+    # The separate job this replaces: re-read and parse every output page
+    index = LinkIndex()
+    for directory, _, names in os.walk(public_dir):
+        for name in names:
+            path = os.path.join(directory, name)
+            relative = os.path.relpath(path, public_dir)
+            if not name.endswith(".html"):
+                index.add_static(relative)
+                continue
+            collector = LinkCollector()
+            with open(path, encoding="utf-8") as f:
+                collector.feed(f.read())
+            index.add_page(relative, relative, collector.urls)
+    return index.check()
+
+def main(pages=2_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        content = os.path.join(tmp, "content")
+        static = os.path.join(tmp, "static")
+        public = os.path.join(tmp, "public")
+        template = os.path.join(tmp, "template.html")
+        with open(template, "w", encoding="utf-8") as f:
+            f.write("<html><title>{{ Title }}</title><body>{{ Content }}</body></html>")
+        sources = site_pages(pages)
+        write_site(content, static, sources)
+        report = build_site(content, template, public, static)
+
+        trees = {source: markdown_to_html_node(markdown) for source, markdown in sources.items()}
+        static_files = [f"images/{word}.png" for word in WORDS]
+        start = time.perf_counter()
+        collected = collect(trees, static_files)
+        collect_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        crawled = crawl(public)
+        crawl_time = time.perf_counter() - start
+
+        link_count = sum(len(page_links(tree)) for tree in trees.values())
+        print(f"{pages} pages, {link_count} links, {len(report.links.broken)} broken")
+        print(f"{'render (build)':>26} {report.timings['render'] * 1e3:>9.1f} ms")
+        # Both include LinkIndex.check()
+        print(f"{'collect from node trees':>26} {collect_time * 1e3:>9.1f} ms")
+        print(f"{'crawl public/ afterwards':>26} {crawl_time * 1e3:>9.1f} ms")
+        assert len(collected.broken) == len(crawled.broken) == len(report.links.broken)
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000)
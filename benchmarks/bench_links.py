@@ -0,0 +1,57 @@
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from textnode import TextNode, TextType
+from conversion import extract_markdown_links, split_nodes_links
+
+def split_nodes_links_by_str_split(old_nodes):
+    # The previous implementation: rebuild the markdown for each match and
+    # split the remaining text on it
+    new_nodes = []
+    for node in old_nodes:
+        if node.text_type != TextType.TEXT:
+            new_nodes.append(node)
+            continue
+        extracted_links = extract_markdown_links(node.text)
+        if not extracted_links:
+            new_nodes.append(node)
+            continue
+        current_text = node.text
+        for link_text, url in extracted_links:
+            parts = current_text.split(f"[{link_text}]({url})", 1)
+            if parts[0]:
+                new_nodes.append(TextNode(parts[0], TextType.TEXT))
+            new_nodes.append(TextNode(link_text, TextType.LINKS, url))
+            current_text = parts[1] if len(parts) > 1 else ""
+        if current_text:
+            new_nodes.append(TextNode(current_text, TextType.TEXT))
+    return new_nodes
+
+def changelog(links):
+    return " ".join(
+        f"Fixed [#{i}](https://github.com/example/project/pull/{i}) in release {i // 50}."
+        for i in range(links)
+    )
+
+def link_index(links):
+    return " | ".join(f"[Page {i}](/docs/section-{i % 40}/page-{i}.html)" for i in range(links))
+
+def best_of(func, nodes, number):
+    return min(timeit.repeat(lambda: func(nodes), number=number, repeat=3)) / number
+
+def main():
+    print(f"{'corpus':>10} {'links':>7} {'str.split (ms)':>15} {'offsets (ms)':>13} {'us/link':>8}")
+    for name, make in (("changelog", changelog), ("index", link_index)):
+        for links in (100, 1000, 10000, 30000):
+            nodes = [TextNode(make(links), TextType.TEXT)]
+            assert split_nodes_links(nodes) == split_nodes_links_by_str_split(nodes)
+            number = max(1, 3000 // links)
+            old = best_of(split_nodes_links_by_str_split, nodes, number)
+            new = best_of(split_nodes_links, nodes, number)
+            print(f"{name:>10} {links:>7} {old * 1e3:>15.2f} {new * 1e3:>13.2f} {new / links * 1e6:>8.2f}")
+
+if __name__ == "__main__":
+    main()
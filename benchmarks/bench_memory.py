@@ -0,0 +1,78 @@
+import os
+import resource
+import subprocess
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from textnode import TextNode, TextType
+from htmlnode import LeafNode, ParentNode
+from conversion import markdown_to_blocks, text_node_to_html_node, text_to_text_nodes
+
+class DictTextNode:
+    # TextNode and LeafNode as they were before __slots__
+    def __init__(self, text, text_type, url=None):
+        self.text = text
+        self.text_type = text_type
+        self.url = url
+
+class DictLeafNode:
+    def __init__(self, tag, value, props=None):
+        self.tag = tag
+        self.value = value
+        self.children = []
+        self.props = props
+
+PARAGRAPH = (
+    "Read the **installation guide** before you start, then follow the "
+    "[quick start](https://example.com/start) and _skim_ the `config` reference. "
+    "![diagram](https://example.com/diagram.png)"
+)
+
+def bytes_per_node(make, count=100_000):
+    tracemalloc.start()
+    nodes = [make(i) for i in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Don't charge the node list itself to the nodes
+    return (size - sys.getsizeof(nodes)) / count
+
+def build_tree(paragraphs):
+    markdown = "\n\n".join([PARAGRAPH] * paragraphs)
+    children = []
+    for block in markdown_to_blocks(markdown):
+        leaves = [text_node_to_html_node(node) for node in text_to_text_nodes(block)]
+        children.append(ParentNode("p", leaves))
+    return ParentNode("div", children)
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def main():
+    if len(sys.argv) == 3 and sys.argv[1] == "--tree":
+        tree = build_tree(int(sys.argv[2]))
+        nodes = 1 + sum(1 + len(child.children) for child in tree.children)
+        print(f"{nodes} {peak_rss_mb():.1f}")
+        return
+
+    text = "shared text"
+    print(f"{'node':>10} {'dict B/node':>12} {'slots B/node':>13}")
+    print(f"{'TextNode':>10} {bytes_per_node(lambda i: DictTextNode(text, TextType.TEXT)):>12.0f} "
+          f"{bytes_per_node(lambda i: TextNode(text, TextType.TEXT)):>13.0f}")
+    print(f"{'LeafNode':>10} {bytes_per_node(lambda i: DictLeafNode('b', text)):>12.0f} "
+          f"{bytes_per_node(lambda i: LeafNode('b', text)):>13.0f}")
+
+    print()
+    print(f"{'paragraphs':>10} {'nodes':>9} {'peak RSS (MB)':>14}")
+    for paragraphs in (10_000, 50_000, 200_000):
+        # A fresh interpreter per size, so ru_maxrss is not carried over
+        output = subprocess.run(
+            [sys.executable, __file__, "--tree", str(paragraphs)],
+            check=True, capture_output=True, text=True,
+        ).stdout.split()
+        print(f"{paragraphs:>10} {int(output[0]):>9} {float(output[1]):>14.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import hashlib
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from build import build_site
+
+TEMPLATE = "<html><head><title>{{ Title }}</title></head><body>{{ Content }}</body></html>"
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+def page(i):
+    blocks = [f"# Page {i}"]
+    for j in range(10):
+        blocks.append(f"Paragraph {j} with **bold**, _italic_, `code` and a [link](/p/{i}/{j}.html).")
+        blocks.append(f"- item {j}\n- another item with ![icon](/img/{j}.png)")
+    return "\n\n".join(blocks)
+
+def tree_digest(public):
+    digest = hashlib.sha256()
+    for directory, _, names in sorted(os.walk(public)):
+        for name in sorted(names):
+            if name.endswith(".html"):
+                with open(os.path.join(directory, name), "rb") as f:
+                    digest.update(f.read())
+    return digest.hexdigest()
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    print(f"{pages} pages on {os.cpu_count()} CPUs")
+    with tempfile.TemporaryDirectory() as root:
+        content = os.path.join(root, "content")
+        template = os.path.join(root, "template.html")
+        write(template, TEMPLATE)
+        for i in range(pages):
+            write(os.path.join(content, f"section-{i % 50}", f"page-{i}.md"), page(i))
+
+        print(f"{'jobs':>5} {'time (s)':>9} {'speedup':>8} {'identical':>10}")
+        serial_time = serial_digest = None
+        for jobs in (1, 2, 4, 8):
+            public = os.path.join(root, f"public-{jobs}")
+            report = build_site(content, template, public, jobs=jobs)
+            digest = tree_digest(public)
+            if serial_time is None:
+                serial_time, serial_digest = report.elapsed, digest
+            print(f"{jobs:>5} {report.elapsed:>9.2f} {serial_time / report.elapsed:>7.2f}x {str(digest == serial_digest):>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from conversion import markdown_to_html_node
+from profiling import Profiler
+
+def page(i):
+    return (
+        f"# Page {i}\n\n"
+        f"Intro with **bold {i}**, _italic_, `code` and a [link](/p/{i}/).\n\n"
+        "- first item\n- second item\n- third item\n\n"
+        "> a quote\n> over two lines\n\n"
+        "```\nprint('hello')\n```"
+    )
+
+def render(pages):
+    start = time.perf_counter()
+    for markdown in pages:
+        markdown_to_html_node(markdown).to_html()
+    return time.perf_counter() - start
+
+def main():
+    pages = [page(i) for i in range(5_000)]
+    render(pages)  # warm up
+    print(f"{'mode':>12} {'time (ms)':>10} {'overhead':>9}")
+    baseline = min(render(pages) for _ in range(3))
+    print(f"{'off':>12} {baseline * 1e3:>10.1f} {'-':>9}")
+    profiler = Profiler()
+    with profiler:
+        profiled = min(render(pages) for _ in range(3))
+    print(f"{'on':>12} {profiled * 1e3:>10.1f} {profiled / baseline - 1:>8.1%}")
+    with Profiler(trace=True):
+        traced = min(render(pages) for _ in range(3))
+    print(f"{'on + trace':>12} {traced * 1e3:>10.1f} {traced / baseline - 1:>8.1%}")
+    # Uninstalled again, so this must match the first row
+    after = min(render(pages) for _ in range(3))
+    print(f"{'off again':>12} {after * 1e3:>10.1f} {after / baseline - 1:>8.1%}")
+    print()
+    print(profiler.summary_table())
+
+if __name__ == "__main__":
+    main()
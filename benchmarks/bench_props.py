@@ -0,0 +1,45 @@
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from htmlnode import LeafNode, ParentNode
+
+def props_to_html_concatenated(props):
+    # The previous props_to_html: += concatenation, no escaping, no cache
+    prop_string = ""
+    for prop in props or {}:
+        prop_string += f'{prop}="{props[prop]}" '
+    return prop_string.strip()
+
+def link_dense_page(links):
+    items = []
+    for i in range(links):
+        items.append(LeafNode("a", f"page {i}", {"href": f"/docs/section-{i % 40}/page-{i}.html", "class": "nav"}))
+        if i % 10 == 0:
+            items.append(LeafNode("img", "", {"src": f"/img/badge-{i}.svg", "alt": f"badge {i}"}))
+    return ParentNode("div", items)
+
+def main():
+    page = link_dense_page(20_000)
+    leaves = page.children
+    attributes = sum(len(leaf.props) for leaf in leaves)
+
+    concatenated = min(timeit.repeat(lambda: [props_to_html_concatenated(leaf.props) for leaf in leaves], number=5, repeat=3)) / 5
+
+    uncached = float("inf")
+    for _ in range(3):
+        fresh = link_dense_page(20_000).children
+        uncached = min(uncached, timeit.timeit(lambda: [leaf.props_to_html() for leaf in fresh], number=1))
+    cached = min(timeit.repeat(lambda: [leaf.props_to_html() for leaf in leaves], number=5, repeat=3)) / 5
+    page_render = min(timeit.repeat(page.to_html, number=5, repeat=3)) / 5
+
+    print(f"{attributes} attributes on {len(leaves)} leaves")
+    print(f"{'+= concatenation':>24} {concatenated / attributes * 1e9:>8.1f} ns/attribute")
+    print(f"{'escaped, first render':>24} {uncached / attributes * 1e9:>8.1f} ns/attribute")
+    print(f"{'escaped, cached':>24} {cached / attributes * 1e9:>8.1f} ns/attribute")
+    print(f"{'whole page to_html':>24} {page_render * 1e3:>8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import conversion
+from corpus import generate
+
+# The original link pattern, with the lookbehind in front of the "["
+LOOKBEHIND_LINK_RE = re.compile(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)")
+
+ADVERSARIAL = {
+    "[ x 200k": "[" * 200_000,
+    "[a]( x 50k": "[a](" * 50_000,
+    "![ x 100k": "![" * 100_000,
+    "[ + 200k text": "[" + "a" * 200_000 + "[" * 1_000,
+}
+
+def best_of(func, repeats=5):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def inline_texts():
+    paragraphs = []
+    for markdown in generate("links", 100) + generate("emphasis", 100):
+        paragraphs += [block for block in conversion.markdown_to_blocks(markdown) if block[:1] not in "#-0123456789>`"]
+    return paragraphs
+
+def main():
+    texts = inline_texts()
+    megabytes = sum(len(text) for text in texts) / 2**20
+    original = conversion._GRAMMAR
+    print(f"{'engine':>8} {'inline MB/s':>12} {'links MB/s':>11} " + " ".join(f"{name:>14}" for name in ADVERSARIAL))
+    try:
+        for name in ("re", "regex", "re2"):
+            try:
+                grammar = conversion.use_regex_engine(name)
+            except ImportError:
+                print(f"{name:>8} not installed")
+                continue
+            inline = best_of(lambda: [conversion.text_to_text_nodes(text) for text in texts])
+            links = best_of(lambda: [conversion.extract_markdown_links(text) for text in texts])
+            worst = [best_of(lambda: list(grammar.iter_links(text)), repeats=3) for text in ADVERSARIAL.values()]
+            print(
+                f"{name:>8} {megabytes / inline:>12.1f} {megabytes / links:>11.1f} "
+                + " ".join(f"{seconds * 1e3:>11.1f} ms" for seconds in worst)
+            )
+    finally:
+        conversion._GRAMMAR = original
+
+    links = best_of(lambda: [LOOKBEHIND_LINK_RE.findall(text) for text in texts])
+    worst = [best_of(lambda: LOOKBEHIND_LINK_RE.findall(text), repeats=3) for text in ADVERSARIAL.values()]
+    print(
+        f"{'(?<!!)':>8} {'-':>12} {megabytes / links:>11.1f} "
+        + " ".join(f"{seconds * 1e3:>11.1f} ms" for seconds in worst)
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from conversion import markdown_to_html_node
+from render_cache import BlockRenderCache
+
+def make_page(i):
+    return "\n\n".join([
+        f"# Page {i}",
+        f"Intro to page {i} with **bold** text, _emphasis_ and a [link](/pages/{i + 1}).",
+        "- shared list item\n- another shared item with `code`",
+        f"> Quote number {i} from the [archive](/archive/{i}).",
+        "1. step one\n2. step two\n3. step three",
+        f"Closing paragraph {i} with ![figure](/img/{i}.png).",
+    ])
+
+def build(pages, cache=None):
+    start = time.perf_counter()
+    if cache is None:
+        html = [markdown_to_html_node(page).to_html() for page in pages]
+    else:
+        html = [cache.render_markdown(page) for page in pages]
+    return html, time.perf_counter() - start
+
+def main():
+    pages = [make_page(i) for i in range(5_000)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "blocks.json")
+        baseline, elapsed = build(pages)
+        print(f"{'build':>22} {'time (ms)':>10} {'hit rate':>9}")
+        print(f"{'no cache':>22} {elapsed * 1e3:>10.1f} {'-':>9}")
+
+        cold = BlockRenderCache(path)
+        html, elapsed = build(pages, cold)
+        assert html == baseline
+        cold.save()
+        print(f"{'first build (cold)':>22} {elapsed * 1e3:>10.1f} {cold.hit_rate:>8.1%}")
+
+        start = time.perf_counter()
+        warm = BlockRenderCache(path)
+        load = time.perf_counter() - start
+        html, elapsed = build(pages, warm)
+        assert html == baseline
+        print(f"{'second build (warm)':>22} {elapsed * 1e3:>10.1f} {warm.hit_rate:>8.1%}")
+        print(f"{'cache load':>22} {load * 1e3:>10.1f}")
+
+        edited = pages[:]
+        for i in range(0, len(edited), 100):
+            edited[i] = edited[i].replace("Closing paragraph", "Edited closing paragraph")
+        warm = BlockRenderCache(path)
+        _, elapsed = build(edited, warm)
+        print(f"{'1% of pages edited':>22} {elapsed * 1e3:>10.1f} {warm.hit_rate:>8.1%}")
+
+if __name__ == "__main__":
+    main()
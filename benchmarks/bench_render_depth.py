@@ -0,0 +1,60 @@
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from conversion import markdown_to_html_node
+from corpus import generate
+from htmlnode import LeafNode, ParentNode
+
+def recursive_to_html(node):
+    # The previous ParentNode.to_html: one Python call per level
+    if not isinstance(node, ParentNode):
+        return node.to_html()
+    children_html = "".join(recursive_to_html(child) for child in node.children)
+    return f"{node._opening_tag()}{children_html}</{node.tag}>"
+
+def deep(depth):
+    node = LeafNode(None, "innermost")
+    for level in range(depth):
+        node = ParentNode("li", [LeafNode(None, f"level {level} "), ParentNode("ul", [node])])
+    return node
+
+def wide(items):
+    return ParentNode("ul", [
+        ParentNode("li", [LeafNode(None, f"item {i} "), LeafNode("a", "link", {"href": f"/p/{i}"})])
+        for i in range(items)
+    ])
+
+def pages():
+    # Real page trees, as the build renders them, under one root
+    return ParentNode("main", [markdown_to_html_node(markdown) for markdown in generate("mixed", 200)])
+
+def main():
+    print(f"{'tree':>12} {'recursive (ms)':>15} {'stack (ms)':>11} {'ratio':>6}")
+    sys.setrecursionlimit(10_000)
+    trees = [
+        ("pages", pages()),
+        ("wide 20k", wide(20_000)),
+        ("deep 10", deep(10)),
+        ("deep 50", deep(50)),
+        ("deep 100", deep(100)),
+        ("deep 1000", deep(1000)),
+        ("deep 10000", deep(10_000)),
+        ("deep 100000", deep(100_000)),
+    ]
+    for name, tree in trees:
+        stack = min(timeit.repeat(tree.to_html, number=3, repeat=3)) / 3
+        try:
+            assert recursive_to_html(tree) == tree.to_html()
+            recursive = min(timeit.repeat(lambda: recursive_to_html(tree), number=3, repeat=3)) / 3
+            recursive_ms = f"{recursive * 1e3:>15.2f}"
+            ratio = f"{recursive / stack:>5.2f}x"
+        except RecursionError:
+            recursive_ms = f"{'RecursionError':>15}"
+            ratio = f"{'-':>6}"
+        print(f"{name:>12} {recursive_ms} {stack * 1e3:>11.2f} {ratio}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from conversion import markdown_to_html_node
+from corpus import write_corpus
+from pages import extract_title, load_template, render_pages
+
+# A layout of realistic size: nav, sidebar and footer around the two slots
+TEMPLATE = (
+    "<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>{{ Title }} | Example</title>"
+    + "<link rel=\"stylesheet\" href=\"/index.css\">" * 10
+    + "</head><body><nav>"
+    + "".join(f"<a href=\"/section-{i}/\">Section {i}</a>" for i in range(40))
+    + "</nav><main>{{ Content }}</main><footer>"
+    + "<p>Footer text with links and legal notes.</p>" * 30
+    + "</footer></body></html>"
+)
+
+def reread_and_replace(paths, template_path):
+    # What a wrapper had to do before: read and substitute per page
+    pages = []
+    for path in paths:
+        with open(template_path, encoding="utf-8") as f:
+            template = f.read()
+        with open(path, encoding="utf-8") as f:
+            markdown = f.read()
+        html = markdown_to_html_node(markdown).to_html()
+        pages.append(template.replace("{{ Title }}", extract_title(markdown)).replace("{{ Content }}", html))
+    return pages
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+def main(pages=10_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        content = os.path.join(tmp, "content")
+        write_corpus(content, "mixed", pages, blocks=6)
+        template_path = os.path.join(tmp, "template.html")
+        with open(template_path, "w", encoding="utf-8") as f:
+            f.write(TEMPLATE)
+        paths = sorted(
+            os.path.join(directory, name) for directory, _, names in os.walk(content) for name in names
+        )
+
+        print(f"{pages} pages, template {len(TEMPLATE) / 1024:.1f} KB")
+        print(f"{'mode':>22} {'time (s)':>9} {'pages/s':>9}")
+        legacy, expected = timed(reread_and_replace, paths, template_path)
+        print(f"{'re-read + replace':>22} {legacy:>9.2f} {pages / legacy:>9.0f}")
+        compiled, result = timed(render_pages, paths, template_path)
+        print(f"{'render_pages':>22} {compiled:>9.2f} {pages / compiled:>9.0f}")
+        assert result == expected
+        # Just the assembly step, on pre-rendered bodies
+        template = load_template(template_path)
+        bodies = [("Title", "<div>" + "<p>body text</p>" * 40 + "</div>")] * pages
+        replace, _ = timed(lambda: [TEMPLATE.replace("{{ Title }}", t).replace("{{ Content }}", c) for t, c in bodies])
+        joined, _ = timed(lambda: [template.render(t, c) for t, c in bodies])
+        print(f"{'assembly: replace':>22} {replace:>9.3f} {pages / replace:>9.0f}")
+        print(f"{'assembly: join':>22} {joined:>9.3f} {pages / joined:>9.0f}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
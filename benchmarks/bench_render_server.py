@@ -0,0 +1,73 @@
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from corpus import generate
+from render_server import RenderClient
+
+# Per-fragment latency of rendering small fragments the way CI does: one
+# `main.py render` process per fragment, versus one render-server reached
+# over its stdin/stdout or a Unix socket.
+
+MAIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "main.py")
+
+def fragments(count):
+    # A few blocks each, like a PR preview or a snippet
+    return generate("mixed", count, seed=3, blocks=4)
+
+def one_shot(fragment):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, MAIN, "render"], input=fragment, capture_output=True, text=True, check=True)
+    return time.perf_counter() - start
+
+def through(client, fragment):
+    start = time.perf_counter()
+    client.render(fragment)
+    return time.perf_counter() - start
+
+def connect(path, timeout=10):
+    # The socket file appears at bind(), before the server listens on it
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return RenderClient.connect(path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.01)
+
+def report(mode, latencies):
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(f"{mode:<14} {statistics.median(latencies) * 1e3:>12.3f} {p95 * 1e3:>10.3f} {len(latencies) / sum(latencies):>10.0f}")
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    texts = fragments(count)
+    print(f"{'mode':<14} {'median (ms)':>12} {'p95 (ms)':>10} {'per sec':>10}")
+
+    report("one-shot", [one_shot(text) for text in texts[:max(1, count // 4)]])
+
+    server = subprocess.Popen([sys.executable, MAIN, "render-server"], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    client = RenderClient(server.stdout, server.stdin)
+    through(client, texts[0])  # the first request pays for the imports
+    report("server stdin", [through(client, text) for text in texts])
+    server.stdin.close()
+    server.wait()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "render.sock")
+        server = subprocess.Popen([sys.executable, MAIN, "render-server", "--socket", path])
+        with connect(path) as client:
+            through(client, texts[0])
+            report("server socket", [through(client, text) for text in texts])
+        server.terminate()
+        server.wait()
+
+if __name__ == "__main__":
+    main()
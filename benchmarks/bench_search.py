@@ -0,0 +1,54 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from build import build_site
+from corpus import WORDS, write_corpus
+from search import SEARCH_DIR, search
+
+def directory_size(path):
+    return sum(os.path.getsize(os.path.join(directory, name)) for directory, _, names in os.walk(path) for name in names)
+
+def build(content, template, public, **kwargs):
+    start = time.perf_counter()
+    build_site(content, template, public, force=True, **kwargs)
+    return time.perf_counter() - start
+
+def main():
+    rng = random.Random(3)
+    queries = [" ".join(rng.sample(WORDS, rng.randint(1, 3))) for _ in range(200)]
+    print(f"{'pages':>6} {'build (s)':>10} {'+ index (s)':>12} {'index MB':>9} {'MB / 1k pages':>14} {'query (ms)':>11} {'phrase (ms)':>12}")
+    for pages in (1_000, 5_000):
+        with tempfile.TemporaryDirectory() as tmp:
+            content = os.path.join(tmp, "content")
+            public = os.path.join(tmp, "public")
+            template = os.path.join(tmp, "template.html")
+            with open(template, "w", encoding="utf-8") as f:
+                f.write("<html><title>{{ Title }}</title><body>{{ Content }}</body></html>")
+            write_corpus(content, "mixed", pages, blocks=10)
+
+            plain = build(content, template, public)
+            indexed = build(content, template, public, search=True)
+            size = directory_size(os.path.join(public, SEARCH_DIR)) / 2**20
+
+            search_dir = os.path.join(public, SEARCH_DIR)
+            start = time.perf_counter()
+            for query in queries:
+                search(search_dir, query)
+            query_time = (time.perf_counter() - start) / len(queries)
+            start = time.perf_counter()
+            for query in queries:
+                search(search_dir, query, phrase=True)
+            phrase_time = (time.perf_counter() - start) / len(queries)
+
+            print(
+                f"{pages:>6} {plain:>10.2f} {indexed:>12.2f} {size:>9.2f} {size / pages * 1000:>14.2f} "
+                f"{query_time * 1e3:>11.1f} {phrase_time * 1e3:>12.1f}"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from htmlnode import LeafNode, ParentNode
+
+def nested_list(depth, items):
+    # <ul> of `items` entries, the last of which holds the next level down
+    node = ParentNode("ul", [ParentNode("li", [LeafNode(None, "leaf item")])])
+    for level in range(depth):
+        children = [
+            ParentNode("li", [LeafNode(None, f"item {i} at level {level} with "), LeafNode("b", "bold")])
+            for i in range(items - 1)
+        ]
+        children.append(ParentNode("li", [LeafNode(None, f"level {level}"), node]))
+        node = ParentNode("ul", children)
+    return node
+
+def nested_quotes(depth, paragraphs):
+    node = ParentNode("blockquote", [ParentNode("p", [LeafNode(None, "innermost")])])
+    for level in range(depth):
+        children = [
+            ParentNode("p", [LeafNode(None, f"quoted paragraph {i} at level {level} "), LeafNode("i", "emphasis")])
+            for i in range(paragraphs)
+        ]
+        children.append(node)
+        node = ParentNode("blockquote", children)
+    return node
+
+def measure(func):
+    # Timed without tracemalloc, which slows allocation down considerably
+    start = time.perf_counter()
+    size = func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, elapsed, peak
+
+def main():
+    trees = [
+        ("list d=50", nested_list(50, 200)),
+        ("list d=100", nested_list(100, 100)),
+        ("quote d=50", nested_quotes(50, 200)),
+        ("quote d=200", nested_quotes(200, 50)),
+    ]
+    print(f"{'tree':>12} {'method':>14} {'MB out':>7} {'MB/s':>8} {'peak MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "out.html")
+        for name, tree in trees:
+            def to_html():
+                return len(tree.to_html())
+
+            def to_stringio():
+                stream = io.StringIO()
+                tree.write_html(stream)
+                return stream.tell()
+
+            def to_file():
+                with open(path, "w", encoding="utf-8") as f:
+                    tree.write_html(f)
+                    return f.tell()
+
+            for method, func in (("to_html", to_html), ("write StringIO", to_stringio), ("write file", to_file)):
+                size, elapsed, peak = measure(func)
+                mb = size / 2**20
+                print(f"{name:>12} {method:>14} {mb:>7.2f} {mb / elapsed:>8.1f} {peak / 2**20:>8.2f}")
+
+if __name__ == "__main__":
+    main()
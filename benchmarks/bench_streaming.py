@@ -0,0 +1,68 @@
+import os
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from corpus import generate
+
+# Peak memory of converting one large document whole versus streamed. Each
+# conversion runs in a fresh interpreter so ru_maxrss is its own. Sizes in MB
+# come from argv, e.g. `bench_streaming.py 10 100 1024`; whole-document
+# conversion is skipped above --whole-limit MB.
+
+_CONVERT = """
+import resource, sys, time
+sys.path.insert(0, {src!r})
+from conversion import markdown_to_html_node, stream_markdown_to_html
+start = time.perf_counter()
+with open({path!r}, encoding="utf-8") as f, open({output!r}, "w", encoding="utf-8") as out:
+    if {mode!r} == "whole":
+        out.write(markdown_to_html_node(f.read()).to_html())
+    else:
+        stream_markdown_to_html(f, out)
+seconds = time.perf_counter() - start
+print(seconds, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+def write_document(path, megabytes):
+    # Repeats a generated corpus, with one large code block per chunk
+    chunk = "\n\n".join(generate("mixed", 50, seed=1)) + "\n\n```\n" + "let x = 1;\n" * 20_000 + "```\n\n"
+    target = megabytes * 2**20
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("# Large document\n\n")
+        while written < target:
+            f.write(chunk)
+            written += len(chunk)
+
+def convert(mode, path, output):
+    src = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+    code = _CONVERT.format(src=src, path=path, output=output, mode=mode)
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    seconds, max_rss = result.stdout.split()
+    return float(seconds), int(max_rss) / 1024
+
+def main(argv):
+    whole_limit = 200
+    if "--whole-limit" in argv:
+        index = argv.index("--whole-limit")
+        whole_limit = int(argv[index + 1])
+        del argv[index:index + 2]
+    sizes = [int(size) for size in argv] or [10, 100]
+    print(f"{'MB':>6} {'mode':<8} {'time (s)':>9} {'peak RSS (MB)':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "large.md")
+        output = os.path.join(tmp, "large.html")
+        for size in sizes:
+            write_document(path, size)
+            for mode in ("whole", "stream"):
+                if mode == "whole" and size > whole_limit:
+                    continue
+                seconds, peak = convert(mode, path, output)
+                print(f"{size:>6} {mode:<8} {seconds:>9.2f} {peak:>14.1f}")
+            os.remove(path)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,96 @@
+import argparse
+import os
+import random
+
+# Deterministic markdown corpora for the benchmarks. Each profile weights the
+# kinds of block a page is made of and how much inline markup their text
+# carries; the same profile, page count and seed always give the same pages.
+
+WORDS = (
+    "alpha beta gamma delta render parse block inline node tree page site build cache "
+    "token stream buffer index query value label header footer layout theme server"
+).split()
+
+PROFILES = {
+    # block weights: paragraph, heading, list, quote, code
+    "mixed": {"blocks": (6, 2, 2, 1, 1), "markup": 0.15, "list_items": 5, "code_lines": 8},
+    "links": {"blocks": (8, 1, 2, 0, 0), "markup": 0.5, "markup_kinds": ("link", "image"), "list_items": 6, "code_lines": 0},
+    "emphasis": {"blocks": (8, 1, 1, 1, 0), "markup": 0.5, "markup_kinds": ("bold", "italic", "code"), "list_items": 4, "code_lines": 0},
+    "lists": {"blocks": (1, 1, 8, 0, 0), "markup": 0.1, "list_items": 40, "code_lines": 0},
+    "code": {"blocks": (2, 1, 0, 0, 7), "markup": 0.05, "list_items": 3, "code_lines": 80},
+}
+
+MARKUP_KINDS = ("bold", "italic", "code", "link", "image")
+
+def _phrase(rng, count):
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+def _inline_text(rng, profile, words):
+    kinds = profile.get("markup_kinds", MARKUP_KINDS)
+    parts = []
+    for _ in range(words):
+        word = rng.choice(WORDS)
+        if rng.random() < profile["markup"]:
+            kind = rng.choice(kinds)
+            if kind == "bold":
+                word = f"**{word}**"
+            elif kind == "italic":
+                word = f"_{word}_"
+            elif kind == "code":
+                word = f"`{word}`"
+            elif kind == "link":
+                word = f"[{word}](/{rng.choice(WORDS)}/{rng.randrange(1000)}/)"
+            else:
+                word = f"![{word}](/images/{rng.choice(WORDS)}.png)"
+        parts.append(word)
+    return " ".join(parts)
+
+def _block(rng, profile, kind):
+    if kind == "paragraph":
+        lines = [_inline_text(rng, profile, rng.randint(8, 16)) for _ in range(rng.randint(1, 4))]
+        return "\n".join(lines)
+    if kind == "heading":
+        return f"{'#' * rng.randint(2, 6)} {_inline_text(rng, profile, rng.randint(2, 6))}"
+    if kind == "list":
+        count = rng.randint(max(1, profile["list_items"] // 2), profile["list_items"])
+        if rng.random() < 0.5:
+            return "\n".join(f"- {_inline_text(rng, profile, rng.randint(3, 10))}" for _ in range(count))
+        return "\n".join(f"{i}. {_inline_text(rng, profile, rng.randint(3, 10))}" for i in range(1, count + 1))
+    if kind == "quote":
+        return "\n".join(f"> {_inline_text(rng, profile, rng.randint(6, 12))}" for _ in range(rng.randint(1, 3)))
+    lines = [
+        f"{' ' * 4 * rng.randint(0, 3)}{rng.choice(WORDS)}({_phrase(rng, rng.randint(0, 3))}) < {rng.randrange(100)} && x > 0"
+        for _ in range(rng.randint(max(1, profile["code_lines"] // 2), profile["code_lines"]))
+    ]
+    return "```\n" + "\n".join(lines) + "\n```"
+
+def generate_page(profile_name: str, index: int, seed: int = 0, blocks: int = 20):
+    profile = PROFILES[profile_name]
+    rng = random.Random(f"{profile_name}:{seed}:{index}")
+    kinds = rng.choices(("paragraph", "heading", "list", "quote", "code"), weights=profile["blocks"], k=blocks)
+    title = f"# {_phrase(rng, 3).title()} {index}"
+    return "\n\n".join([title] + [_block(rng, profile, kind) for kind in kinds])
+
+def generate(profile_name: str, pages: int, seed: int = 0, blocks: int = 20):
+    return [generate_page(profile_name, index, seed, blocks) for index in range(pages)]
+
+def write_corpus(directory: str, profile_name: str, pages: int, seed: int = 0, blocks: int = 20):
+    # Spreads pages over subdirectories like a real content/ tree
+    for index, markdown in enumerate(generate(profile_name, pages, seed, blocks)):
+        path = os.path.join(directory, f"section-{index % 10}", f"page-{index}.md")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(markdown)
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic markdown corpus to a content directory.")
+    parser.add_argument("directory")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="mixed")
+    parser.add_argument("--pages", type=int, default=1_000)
+    parser.add_argument("--blocks", type=int, default=20, help="blocks per page")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    write_corpus(args.directory, args.profile, args.pages, args.seed, args.blocks)
+
+if __name__ == "__main__":
+    main()
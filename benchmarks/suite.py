@@ -0,0 +1,166 @@
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import conversion
+from corpus import PROFILES, generate
+
+# Times each conversion stage in isolation on every corpus profile, keeping
+# the best of several repeats. Results are stored as JSON; --compare exits
+# non-zero when any stage got slower than a saved baseline by more than
+# --threshold.
+
+def _capture_inline_inputs(markdowns):
+    # Records the exact texts and nodes the pipeline hands to the inline
+    # stages, so those stages can be timed on their own
+    texts = []
+    original = conversion.text_to_text_nodes
+
+    def recording(text):
+        texts.append(text)
+        return original(text)
+
+    conversion.text_to_text_nodes = recording
+    try:
+        for markdown in markdowns:
+            conversion.markdown_to_html_node(markdown)
+    finally:
+        conversion.text_to_text_nodes = original
+    nodes = [node for text in texts for node in original(text)]
+    return texts, nodes
+
+def prepare(markdowns):
+    blocks = [block for markdown in markdowns for block in conversion.markdown_to_blocks(markdown)]
+    typed_blocks = list(zip(blocks, conversion.blocks_to_block_types(blocks)))
+    texts, nodes = _capture_inline_inputs(markdowns)
+    trees = [conversion.markdown_to_html_node(markdown) for markdown in markdowns]
+    return {
+        "markdowns": markdowns,
+        "blocks": blocks,
+        "typed_blocks": typed_blocks,
+        "texts": texts,
+        "nodes": nodes,
+        "trees": trees,
+    }
+
+def _write_all(trees):
+    for tree in trees:
+        tree.write_html(io.StringIO())
+
+STAGES = {
+    "markdown_to_blocks": lambda data: [conversion.markdown_to_blocks(markdown) for markdown in data["markdowns"]],
+    "block_to_block_type": lambda data: [conversion.block_to_block_type(block) for block in data["blocks"]],
+    "text_to_text_nodes": lambda data: [conversion.text_to_text_nodes(text) for text in data["texts"]],
+    "text_node_to_html_node": lambda data: [conversion.text_node_to_html_node(node) for node in data["nodes"]],
+    "block_to_html_node": lambda data: [conversion.block_to_html_node(block, block_type) for block, block_type in data["typed_blocks"]],
+    "to_html": lambda data: [tree.to_html() for tree in data["trees"]],
+    "write_html": lambda data: _write_all(data["trees"]),
+    "end_to_end": lambda data: [conversion.markdown_to_html_node(markdown).to_html() for markdown in data["markdowns"]],
+}
+
+def time_stage(stage, data, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        stage(data)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def run(profiles, pages, seed, repeats, stages=STAGES):
+    results = {}
+    for profile in profiles:
+        markdowns = generate(profile, pages, seed)
+        data = prepare(markdowns)
+        megabytes = sum(len(markdown) for markdown in markdowns) / 2**20
+        results[profile] = {"megabytes": megabytes, "stages": {}}
+        for name, stage in stages.items():
+            results[profile]["stages"][name] = time_stage(stage, data, repeats)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "pages": pages,
+            "seed": seed,
+            "repeats": repeats,
+        },
+        "results": results,
+    }
+
+def compare(current, baseline, threshold, min_seconds):
+    # Returns (profile, stage, baseline seconds, current seconds, ratio) for
+    # every stage both runs measured, and the subset that regressed
+    rows = []
+    regressions = []
+    for profile, entry in baseline["results"].items():
+        measured = current["results"].get(profile, {}).get("stages", {})
+        for stage, before in entry["stages"].items():
+            if stage not in measured:
+                continue
+            after = measured[stage]
+            ratio = after / before if before else float("inf")
+            row = (profile, stage, before, after, ratio)
+            rows.append(row)
+            # Stages this short are mostly timer noise
+            if ratio > 1 + threshold and after >= min_seconds:
+                regressions.append(row)
+    return rows, regressions
+
+def print_results(report):
+    print(f"{'corpus':<10} {'stage':<24} {'time (ms)':>10} {'MB/s':>8}")
+    for profile, entry in report["results"].items():
+        for stage, seconds in entry["stages"].items():
+            rate = entry["megabytes"] / seconds if seconds else 0.0
+            print(f"{profile:<10} {stage:<24} {seconds * 1e3:>10.2f} {rate:>8.1f}")
+
+def print_comparison(rows, regressions):
+    flagged = set(regressions)
+    print(f"{'corpus':<10} {'stage':<24} {'base (ms)':>10} {'now (ms)':>10} {'change':>8}")
+    for row in rows:
+        profile, stage, before, after, ratio = row
+        marker = "  REGRESSED" if row in flagged else ""
+        print(f"{profile:<10} {stage:<24} {before * 1e3:>10.2f} {after * 1e3:>10.2f} {ratio - 1:>+8.1%}{marker}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time each conversion stage on synthetic corpora.")
+    parser.add_argument("--profiles", default=",".join(PROFILES), help="comma-separated corpus profiles")
+    parser.add_argument("--pages", type=int, default=200, help="pages per corpus")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=5, help="runs per stage; the fastest is kept")
+    parser.add_argument("--output", metavar="PATH", help="write results as JSON to PATH")
+    parser.add_argument("--compare", metavar="BASELINE", help="fail if a stage regressed against this results file")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown before failing (0.25 = 25%%)")
+    parser.add_argument("--min-ms", type=float, default=1.0, help="ignore regressions in stages faster than this")
+    args = parser.parse_args(argv)
+
+    profiles = [name for name in args.profiles.split(",") if name]
+    unknown = [name for name in profiles if name not in PROFILES]
+    if unknown:
+        parser.error(f"unknown profile: {', '.join(unknown)}")
+
+    report = run(profiles, args.pages, args.seed, args.repeats)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1)
+
+    if not args.compare:
+        print_results(report)
+        return 0
+    with open(args.compare, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline["meta"]["pages"] != args.pages or baseline["meta"]["seed"] != args.seed:
+        parser.error("baseline was recorded with a different --pages or --seed")
+    rows, regressions = compare(report, baseline, args.threshold, args.min_ms / 1e3)
+    print_comparison(rows, regressions)
+    if regressions:
+        print(f"\n{len(regressions)} stage(s) slower than the baseline by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,304 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+
+from conversion import LeafNodeInterner
+from links import LinkIndex
+from pages import extract_title, load_template, render_markdown_page
+from render_cache import BlockRenderCache, converter_version
+from search import SEARCH_DIR, SearchIndex, page_url
+from site_io import BulkIO
+
+MANIFEST_NAME = ".build-manifest.json"
+# Rendered blocks kept between serial builds; see BlockRenderCache
+RENDER_CACHE_NAME = ".render-cache.json"
+# The cache file is read and written whole at about 25 MB/s, while pages
+# render at about 2 MB/s of markdown. A cache more than this many times the
+# size of the markdown to render costs more to load than it saves.
+RENDER_CACHE_RATIO = 12
+
+# Pages are read, rendered and written this many at a time
+BATCH_SIZE = 256
+
+class BuildReport:
+    def __init__(self):
+        self.rebuilt = []
+        self.skipped = []
+        self.deleted = []
+        self.copied = []
+        self.unchanged = []
+        self.timings = {"read": 0.0, "render": 0.0, "write": 0.0, "copy": 0.0}
+        self.elapsed = 0.0
+        self.links = None
+        # Block render cache lookups; parallel builds render without it
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def summary(self):
+        return (
+            f"rebuilt {len(self.rebuilt)} pages, skipped {len(self.skipped)}, "
+            f"deleted {len(self.deleted)}, copied {len(self.copied)} static files "
+            f"in {self.elapsed * 1000:.1f} ms"
+        )
+
+    def timing_summary(self):
+        return ", ".join(f"{stage} {seconds * 1000:.1f} ms" for stage, seconds in self.timings.items())
+
+    @property
+    def cache_hit_rate(self):
+        lookups = self.cache_hits + self.cache_misses
+        return self.cache_hits / lookups if lookups else 0.0
+
+    def cache_summary(self):
+        lookups = self.cache_hits + self.cache_misses
+        return f"block cache: {self.cache_hits} of {lookups} blocks reused ({self.cache_hit_rate:.0%})"
+
+# Set once per worker process by the pool initializer, so the compiled
+# template is not pickled along with every page
+_worker_template = None
+_worker_with_terms = False
+_worker_interner = None
+
+def _init_worker(template, with_terms, intern=False):
+    global _worker_template, _worker_with_terms, _worker_interner
+    _worker_template = template
+    _worker_with_terms = with_terms
+    # Each worker process interns into its own cache
+    _worker_interner = LeafNodeInterner() if intern else None
+
+def _render_page(markdown):
+    return render_markdown_page(markdown, _worker_template, _worker_with_terms, leaf_factory=_worker_interner)
+
+def _render_batch(markdowns, template, pool, jobs, with_terms=False, cache=None, interner=None):
+    # (html, link urls, search terms or None) for each page
+    if pool is None:
+        return [render_markdown_page(markdown, template, with_terms, cache, interner) for markdown in markdowns]
+    chunksize = max(1, len(markdowns) // (jobs * 4))
+    return list(pool.map(_render_page, markdowns, chunksize=chunksize))
+
+def output_path_for(relative_source: str):
+    return os.path.splitext(relative_source)[0] + ".html"
+
+def _walk_files(root, suffix=None):
+    files = []
+    for directory, _, names in os.walk(root):
+        for name in names:
+            if suffix is None or name.endswith(suffix):
+                files.append(os.path.relpath(os.path.join(directory, name), root))
+    return sorted(files)
+
+def _file_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+def _fingerprint(path, previous):
+    # mtime and size are enough to skip hashing an untouched file; when they
+    # moved, the content hash decides (a save without edits keeps the hash)
+    stat = os.stat(path)
+    entry = {"mtime": stat.st_mtime_ns, "size": stat.st_size}
+    if previous and previous["mtime"] == entry["mtime"] and previous["size"] == entry["size"]:
+        entry["hash"] = previous["hash"]
+    else:
+        entry["hash"] = _file_digest(path)
+    return entry
+
+def _changed(entry, previous):
+    return previous is None or previous["hash"] != entry["hash"]
+
+def load_manifest(public_dir):
+    try:
+        with open(os.path.join(public_dir, MANIFEST_NAME), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def _save_manifest(public_dir, manifest):
+    path = os.path.join(public_dir, MANIFEST_NAME)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+def _remove_output(public_dir, relative_output):
+    path = os.path.join(public_dir, relative_output)
+    if os.path.exists(path):
+        os.remove(path)
+    # Drop directories left empty, but never public_dir itself
+    directory = os.path.dirname(path)
+    while os.path.abspath(directory) != os.path.abspath(public_dir) and not os.listdir(directory):
+        os.rmdir(directory)
+        directory = os.path.dirname(directory)
+
+def _render_cache_pays_off(path, markdown_bytes):
+    try:
+        size = os.path.getsize(path)
+    except FileNotFoundError:
+        return True
+    return size <= markdown_bytes * RENDER_CACHE_RATIO
+
+def _batches(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def build_site(
+    content_dir: str,
+    template_path: str,
+    public_dir: str,
+    static_dir: str = None,
+    force: bool = False,
+    jobs: int = 1,
+    io_workers: int = 8,
+    search: bool = False,
+    cache: BlockRenderCache = None,
+    intern: bool = False,
+):
+    # cache is a BlockRenderCache to render through in place of the one in
+    # public_dir, for callers that keep one between builds. intern shares
+    # one leaf node between identical links, images and inline snippets.
+    start = time.perf_counter()
+    report = BuildReport()
+    if not os.path.isdir(content_dir):
+        # Otherwise every page built so far would look deleted
+        raise FileNotFoundError(f"content directory not found: {content_dir}")
+    os.makedirs(public_dir, exist_ok=True)
+
+    previous = load_manifest(public_dir)
+    previous_pages = previous.get("pages", {})
+    previous_static = previous.get("static", {})
+
+    template_entry = _fingerprint(template_path, previous.get("template"))
+    # A new template or converter invalidates every page
+    rebuild_all = (
+        force
+        or previous.get("version") != converter_version()
+        or _changed(template_entry, previous.get("template"))
+    )
+    template = load_template(template_path)
+
+    search_index = None
+    if search:
+        # Skipped pages keep their postings from the last index, so without
+        # one that is known to be current every page is indexed again
+        if previous.get("search") and not rebuild_all:
+            search_index = SearchIndex.load(public_dir)
+        if search_index is None:
+            search_index = SearchIndex()
+            rebuild_all = True
+    elif previous.get("search"):
+        # Rebuilt pages would not be re-indexed, so drop the stale index
+        shutil.rmtree(os.path.join(public_dir, SEARCH_DIR), ignore_errors=True)
+
+    pages = {}
+    for source in _walk_files(content_dir, ".md"):
+        entry = _fingerprint(os.path.join(content_dir, source), previous_pages.get(source))
+        entry["output"] = output_path_for(source)
+        pages[source] = entry
+        output = os.path.join(public_dir, entry["output"])
+        previous_entry = previous_pages.get(source)
+        if (
+            rebuild_all
+            or _changed(entry, previous_entry)
+            or "links" not in previous_entry
+            or not os.path.exists(output)
+        ):
+            report.rebuilt.append(source)
+        else:
+            entry["links"] = previous_entry["links"]
+            report.skipped.append(source)
+
+    with BulkIO(io_workers) as bulk:
+        pool = None
+        if jobs > 1 and len(report.rebuilt) > 1:
+            # Imported here: multiprocessing is a sizeable share of startup
+            # for the serial builds that never need it
+            from concurrent.futures import ProcessPoolExecutor
+
+            pool = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(template, search, intern))
+            cache = None
+        elif report.rebuilt and cache is None:
+            cache_path = os.path.join(public_dir, RENDER_CACHE_NAME)
+            if _render_cache_pays_off(cache_path, sum(pages[source]["size"] for source in report.rebuilt)):
+                cache = BlockRenderCache(cache_path)
+        hits, misses = (cache.hits, cache.misses) if cache is not None else (0, 0)
+        interner = LeafNodeInterner() if intern and pool is None else None
+        try:
+            # Results keep the order of their batch, so a parallel build
+            # writes exactly what a serial one would
+            for batch in _batches(report.rebuilt, BATCH_SIZE):
+                step = time.perf_counter()
+                markdowns = bulk.read_texts([os.path.join(content_dir, source) for source in batch])
+                report.timings["read"] += time.perf_counter() - step
+
+                step = time.perf_counter()
+                rendered = _render_batch(markdowns, template, pool, jobs, search, cache, interner)
+                for source, markdown, (_, urls, terms) in zip(batch, markdowns, rendered):
+                    pages[source]["links"] = urls
+                    if search_index is not None:
+                        url = page_url(pages[source]["output"])
+                        search_index.add_page(source, url, extract_title(markdown), terms)
+                report.timings["render"] += time.perf_counter() - step
+
+                step = time.perf_counter()
+                outputs = [os.path.join(public_dir, pages[source]["output"]) for source in batch]
+                for source, written in zip(batch, bulk.write_texts(outputs, [html for html, _, _ in rendered])):
+                    if not written:
+                        report.unchanged.append(source)
+                report.timings["write"] += time.perf_counter() - step
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        if cache is not None and report.rebuilt:
+            report.cache_hits, report.cache_misses = cache.hits - hits, cache.misses - misses
+            if report.cache_misses:
+                cache.save()
+
+        static = {}
+        changed_static = []
+        if static_dir is not None and os.path.isdir(static_dir):
+            for source in _walk_files(static_dir):
+                entry = _fingerprint(os.path.join(static_dir, source), previous_static.get(source))
+                static[source] = entry
+                if _changed(entry, previous_static.get(source)) or not os.path.exists(os.path.join(public_dir, source)):
+                    changed_static.append(source)
+
+        step = time.perf_counter()
+        copied = bulk.copy_files(
+            [os.path.join(static_dir, source) for source in changed_static],
+            [os.path.join(public_dir, source) for source in changed_static],
+        )
+        report.copied = [source for source, was_copied in zip(changed_static, copied) if was_copied]
+        report.timings["copy"] += time.perf_counter() - step
+
+    # Only outputs this build recorded earlier are ever deleted
+    for source, entry in previous_pages.items():
+        if source not in pages:
+            _remove_output(public_dir, entry["output"])
+            report.deleted.append(source)
+    for source in previous_static:
+        if source not in static:
+            _remove_output(public_dir, source)
+            report.deleted.append(source)
+
+    if search_index is not None:
+        for source in search_index.sources() - pages.keys():
+            search_index.remove_page(source)
+        search_index.write(public_dir)
+
+    # Links of skipped pages come from the manifest, so no page is re-read
+    index = LinkIndex()
+    for source, entry in pages.items():
+        index.add_page(source, entry["output"], entry["links"])
+    for source in static:
+        index.add_static(source)
+    report.links = index.check()
+
+    _save_manifest(public_dir, {
+        "version": converter_version(),
+        "template": template_entry,
+        "pages": pages,
+        "static": static,
+        "search": search,
+    })
+    report.elapsed = time.perf_counter() - start
+    return report
@@ -1,7 +1,86 @@
+import functools
+import html
+import importlib
+import io
+import mmap
+import os
 import re
 from enum import Enum
 from textnode import TextNode, TextType
-from htmlnode import LeafNode
+from htmlnode import FrozenLeafNode, LeafNode, ParentNode
+
+_IMAGE_PATTERN = r"!\[([^\[\]]*)\]\(([^\(\)]*)\)"
+# Links are images without the "!". RE2 has no lookbehind, so with it
+# InlineGrammar.iter_links checks the previous character itself.
+_LINK_PATTERN = r"\[([^\[\]]*)\]\(([^\(\)]*)\)"
+# Backtracking engines rule the "!" out in the pattern. The lookbehind comes
+# after the "[" so the pattern still starts with a literal, which re finds
+# with a fast prefix search; a leading (?<!!) would make it try every position.
+_BACKTRACKING_LINK_PATTERN = r"\[(?<!!\[)([^\[\]]*)\]\(([^\(\)]*)\)"
+
+# Preferred first: re2 guarantees linear time, regex is a faster backtracker
+_REGEX_ENGINES = ("re2", "regex", "re")
+
+def load_regex_engine(name: str = "auto"):
+    if name == "auto":
+        for candidate in _REGEX_ENGINES:
+            try:
+                return importlib.import_module(candidate)
+            except ImportError:
+                continue
+    if name not in _REGEX_ENGINES:
+        raise ValueError(f"unknown regex engine: {name}")
+    return importlib.import_module(name)
+
+class InlineGrammar:
+    # The image and link patterns, compiled once by one regex engine. There
+    # is no combined alternation over every inline construct: scanning with
+    # one was no faster than the split passes at realistic markup density,
+    # so text_to_text_nodes uses these two plus the delimiter splits.
+    def __init__(self, engine=re):
+        self.engine = engine
+        self.image = engine.compile(_IMAGE_PATTERN)
+        self._lookbehind = engine.__name__ != "re2"
+        self.link = engine.compile(_BACKTRACKING_LINK_PATTERN if self._lookbehind else _LINK_PATTERN)
+
+    @property
+    def engine_name(self):
+        return self.engine.__name__
+
+    def iter_images(self, text):
+        return self.image.finditer(text)
+
+    def iter_links(self, text):
+        if self._lookbehind:
+            return self.link.finditer(text)
+        return self._iter_links_checking_bang(text)
+
+    def _iter_links_checking_bang(self, text):
+        search = self.link.search
+        match = search(text)
+        while match:
+            start = match.start()
+            if start and text[start - 1] == "!":
+                # Part of an image, or a "!" that isn't one; try the next "["
+                match = search(text, start + 1)
+            else:
+                yield match
+                match = search(text, match.end())
+
+# Built on first use, so importing this module doesn't probe for regex
+# engines or compile patterns a short-lived process may never need
+_GRAMMAR = None
+
+def _grammar():
+    global _GRAMMAR
+    if _GRAMMAR is None:
+        _GRAMMAR = InlineGrammar(load_regex_engine(os.environ.get("SSG_REGEX_ENGINE", "auto")))
+    return _GRAMMAR
+
+def use_regex_engine(name: str):
+    global _GRAMMAR
+    _GRAMMAR = InlineGrammar(load_regex_engine(name))
+    return _GRAMMAR
 
 class BlockType(Enum):
     PARAGRAPH = "paragraph"
@@ -12,14 +91,10 @@ class BlockType(Enum):
     ORDERED_LIST = "ordered_list"
 
 def extract_markdown_images(text):
-    pattern = r"!\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    matches = re.findall(pattern, text)
-    return matches
+    return [match.groups() for match in _grammar().iter_images(text)]
 
 def extract_markdown_links(text):
-    pattern = r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    matches = re.findall(pattern, text)
-    return matches
+    return [match.groups() for match in _grammar().iter_links(text)]
 
 def text_node_to_html_node(text_node: TextNode):
     match text_node.text_type:
@@ -38,75 +113,64 @@ def text_node_to_html_node(text_node: TextNode):
         case _:
             raise Exception("node text type is not a valid TextType")
         
-def split_nodes_images(old_nodes):
+class LeafNodeInterner:
+    # Hands out one shared FrozenLeafNode per (text_type, text, url), for
+    # the nav links, badges and snippets that repeat on every page of a
+    # site. The cache is a bounded LRU.
+    def __init__(self, maxsize: int = 4096):
+        self._lookup = functools.lru_cache(maxsize=maxsize)(self._build)
+
+    @staticmethod
+    def _build(text_type, text, url):
+        node = text_node_to_html_node(TextNode(text, text_type, url))
+        return FrozenLeafNode(node.tag, node.value, node.props)
+
+    def __call__(self, text_node: TextNode):
+        return self._lookup(text_node.text_type, text_node.text, text_node.url)
+
+    def cache_info(self):
+        return self._lookup.cache_info()
+
+    @property
+    def hit_rate(self):
+        info = self._lookup.cache_info()
+        lookups = info.hits + info.misses
+        return info.hits / lookups if lookups else 0.0
+
+    def clear(self):
+        self._lookup.cache_clear()
+
+def _split_nodes_on_matches(old_nodes, find_matches, text_type):
     new_nodes = []
     for node in old_nodes:
         if node.text_type != TextType.TEXT:
             new_nodes.append(node)
             continue
-            
-        extracted_images = extract_markdown_images(node.text)
-        
-        if not extracted_images:
+
+        text = node.text
+        position = 0
+
+        # Slice between match offsets instead of searching the rest of the
+        # text again for each match
+        for match in find_matches(text):
+            start, end = match.span()
+            if start > position:
+                new_nodes.append(TextNode(text[position:start], TextType.TEXT))
+            new_nodes.append(TextNode(match.group(1), text_type, match.group(2)))
+            position = end
+
+        if position == 0:
             new_nodes.append(node)
-            continue
-        
-        current_text = node.text
-        
-        for alt_text, url in extracted_images:
-            image_markdown = f"![{alt_text}]({url})"
-            parts = current_text.split(image_markdown, 1)  # Split only once
-            
-            # Add text before the image (if any)
-            if parts[0]:
-                new_nodes.append(TextNode(parts[0], TextType.TEXT))
-            
-            # Add the image node
-            new_nodes.append(TextNode(alt_text, TextType.IMAGES, url))
-            
-            # Continue with the remaining text
-            current_text = parts[1] if len(parts) > 1 else ""
-        
-        # Add any remaining text after the last image
-        if current_text:
-            new_nodes.append(TextNode(current_text, TextType.TEXT))
-    
+        elif position < len(text):
+            new_nodes.append(TextNode(text[position:], TextType.TEXT))
+
     return new_nodes
-    
+
+def split_nodes_images(old_nodes):
+    return _split_nodes_on_matches(old_nodes, _grammar().iter_images, TextType.IMAGES)
+
 def split_nodes_links(old_nodes):
-    new_nodes = []
-    for node in old_nodes:
-        if node.text_type != TextType.TEXT:
-            new_nodes.append(node)
-            continue
-            
-        extracted_links = extract_markdown_links(node.text)
-        
-        if not extracted_links:
-            new_nodes.append(node)
-            continue
-        
-        current_text = node.text
-        
-        for link_text, url in extracted_links:
-            link_markdown = f"[{link_text}]({url})"
-            parts = current_text.split(link_markdown, 1)  # Split only once
-            
-            # Add text before the link (if any)
-            if parts[0]:
-                new_nodes.append(TextNode(parts[0], TextType.TEXT))
-            
-            # Add the link node
-            new_nodes.append(TextNode(link_text, TextType.LINKS, url))
-            
-            # Continue with the remaining text
-            current_text = parts[1] if len(parts) > 1 else ""
-        
-        # Add any remaining text after the last link
-        if current_text:
-            new_nodes.append(TextNode(current_text, TextType.TEXT))
-    
-    return new_nodes
+    return _split_nodes_on_matches(old_nodes, _grammar().iter_links, TextType.LINKS)
 
 def split_nodes_delimiter(old_nodes, delimiter, text_type):
     new_nodes = []
@@ -129,8 +193,10 @@ def split_nodes_delimiter(old_nodes, delimiter, text_type):
     return new_nodes
 
 def text_to_text_nodes(text: str):
-    original_text_node = TextNode(text, TextType.TEXT)
-    text_nodes = [original_text_node]
+    # Most lines of prose have no inline markup at all
+    if "[" not in text and "*" not in text and "_" not in text and "`" not in text:
+        return [TextNode(text, TextType.TEXT)]
+    text_nodes = [TextNode(text, TextType.TEXT)]
     text_nodes = split_nodes_images(text_nodes)
     text_nodes = split_nodes_links(text_nodes)
     text_nodes = split_nodes_delimiter(text_nodes, "**", TextType.BOLD)
@@ -138,32 +204,306 @@ def text_to_text_nodes(text: str):
     text_nodes = split_nodes_delimiter(text_nodes, "`", TextType.CODE)
     return text_nodes
 
-def markdown_to_blocks(markdown: str):
-    # For simplicity, split by double newlines to get paragraphs
-    blocks = [p.strip() for p in markdown.split("\n\n") if p.strip()]
-    return blocks
+def _iter_mmap_lines(fileobj, encoding):
+    if os.fstat(fileobj.fileno()).st_size == 0:
+        return  # mmap refuses empty files
+    with mmap.mmap(fileobj.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        for line in iter(mapped.readline, b""):
+            line = line.decode(encoding)
+            if "\r" not in line:
+                yield line
+                continue
+            # Newlines as a text-mode file reads them: "\r\n" and a lone "\r"
+            # both end a line
+            *ended, rest = line.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+            for part in ended:
+                yield part + "\n"
+            if rest:
+                yield rest
 
-def block_to_block_type(block: str):
-    if block.startswith("# "):
-        return BlockType.HEADING
-    elif block.startswith("## "):
-        return BlockType.HEADING
-    elif block.startswith("### "):
-        return BlockType.HEADING
-    elif block.startswith("#### "):
-        return BlockType.HEADING
-    elif block.startswith("##### "):
-        return BlockType.HEADING
-    elif block.startswith("###### "):
-        return BlockType.HEADING
-    elif block.startswith("> "):
-        return BlockType.QUOTE
-    elif block.startswith("- ") or block.startswith("* ") or re.match(r"^\d+\. ", block):
-        if re.match(r"^\d+\. ", block):
-            return BlockType.ORDERED_LIST
+def _opens_fence(line: str):
+    stripped = line.strip()
+    # "```code```" on one line opens and closes at once
+    return stripped.startswith("```") and not (len(stripped) >= 6 and stripped.endswith("```"))
+
+def _split_on_blank_lines(lines):
+    block_lines = []
+    for line in lines:
+        if line == "\n":
+            block = "".join(block_lines).strip()
+            if block:
+                yield block
+            block_lines = []
+        else:
+            block_lines.append(line)
+
+    block = "".join(block_lines).strip()
+    if block:
+        yield block
+
+def iter_markdown_blocks(fileobj, use_mmap: bool = False, encoding: str = "utf-8"):
+    # Blocks are separated by blank lines ("\n\n"), except inside a fenced
+    # code block, which is kept whole from its opening ``` to the closing
+    # one. Only the lines of the current block are held, so memory follows
+    # block size, not file size.
+    lines = _iter_mmap_lines(fileobj, encoding) if use_mmap else fileobj
+    block_lines = []
+    in_fence = False
+    for line in lines:
+        if in_fence:
+            block_lines.append(line)
+            if line.rstrip().endswith("```"):
+                in_fence = False
+        elif line == "\n":
+            block = "".join(block_lines).strip()
+            if block:
+                yield block
+            block_lines = []
+        else:
+            if not block_lines and _opens_fence(line):
+                in_fence = True
+            block_lines.append(line)
+
+    if in_fence:
+        # A fence that is never closed is ordinary text after all
+        yield from _split_on_blank_lines(block_lines)
+        return
+    block = "".join(block_lines).strip()
+    if block:
+        yield block
+
+def _line_spans(text: str, pos: int, stop: int):
+    while pos < stop:
+        newline = text.find("\n", pos, stop)
+        line_end = stop if newline == -1 else newline + 1
+        yield pos, line_end
+        pos = line_end
+
+def _plain_block_spans(text: str, pos: int, stop: int):
+    start = None
+    for line_start, line_end in _line_spans(text, pos, stop):
+        if line_end - line_start == 1 and text[line_start] == "\n":
+            if start is not None and not text[start:line_start].isspace():
+                yield start, line_start, True
+            start = None
+        elif start is None:
+            start = line_start
+    if start is not None and not text[start:stop].isspace():
+        yield start, stop, True
+
+def iter_block_spans(text: str, pos: int = 0):
+    # Offsets of the blocks iter_markdown_blocks yields, as (start, end,
+    # in_open_fence) with text[start:end].strip() being the block. pos must
+    # be the start of a line outside any block. in_open_fence marks blocks
+    # after a fence that is never closed: they depend on everything before
+    # them up to the fence, not just on their own lines.
+    stop = len(text)
+    start = None
+    in_fence = False
+    for line_start, line_end in _line_spans(text, pos, stop):
+        if in_fence:
+            if text[line_start:line_end].rstrip().endswith("```"):
+                in_fence = False
+        elif line_end - line_start == 1 and text[line_start] == "\n":
+            if start is not None and not text[start:line_start].isspace():
+                yield start, line_start, False
+            start = None
+        elif start is None:
+            start = line_start
+            in_fence = _opens_fence(text[line_start:line_end])
+
+    if in_fence:
+        yield from _plain_block_spans(text, start, stop)
+    elif start is not None and not text[start:stop].isspace():
+        yield start, stop, False
+
+# Largest block stream_markdown_to_html holds in memory, in characters
+DEFAULT_MAX_BLOCK_SIZE = 16 * 1024 * 1024
+
+class _StreamedCode:
+    # The rest of a fenced code block too large to hold: iterating yields
+    # its code lines, read from the shared line iterator up to the closing
+    # fence. Must be consumed before the next block is read.
+    def __init__(self, held_lines, lines):
+        self._held_lines = held_lines
+        self._lines = lines
+
+    def __iter__(self):
+        # The opening line is the fence and its info string
+        yield from self._held_lines[1:]
+        for line in self._lines:
+            stripped = line.rstrip()
+            if stripped.endswith("```"):
+                yield stripped[:-3]
+                return
+            yield line
+
+def _iter_bounded_blocks(lines, max_block_size):
+    # iter_markdown_blocks with a cap on the size of a block. A fence that
+    # outgrows it is handed over as a _StreamedCode (and runs to the end of
+    # the input if it is never closed); any other block raises ValueError.
+    # So does text right after a streamed fence's closing line: held whole,
+    # it would have joined the fence into one paragraph.
+    lines = iter(lines)
+    block_lines = []
+    size = 0
+    in_fence = False
+    after_streamed = False
+    for line in lines:
+        if after_streamed:
+            after_streamed = False
+            if line != "\n":
+                raise ValueError("a streamed code block must be followed by a blank line")
+            continue
+        if in_fence:
+            block_lines.append(line)
+            size += len(line)
+            if line.rstrip().endswith("```"):
+                in_fence = False
+            elif size > max_block_size:
+                yield _StreamedCode(block_lines, lines)
+                block_lines = []
+                size = 0
+                in_fence = False
+                after_streamed = True
+        elif line == "\n":
+            block = "".join(block_lines).strip()
+            if block:
+                yield block
+            block_lines = []
+            size = 0
         else:
-            return BlockType.UNORDERED_LIST
-    elif block.startswith("```") and block.endswith("```"):
+            if not block_lines and _opens_fence(line):
+                in_fence = True
+            block_lines.append(line)
+            size += len(line)
+            if size > max_block_size and not in_fence:
+                raise ValueError(f"block is larger than the {max_block_size} character limit")
+
+    if in_fence:
+        yield from _split_on_blank_lines(block_lines)
+        return
+    block = "".join(block_lines).strip()
+    if block:
+        yield block
+
+def markdown_to_blocks(markdown: str):
+    return list(iter_markdown_blocks(io.StringIO(markdown)))
+
+_HEADING_RE = re.compile(r"#{1,6} ")
+_ORDERED_LIST_RE = re.compile(r"\d+\. ")
+
+def _classify_heading(block: str):
+    return BlockType.HEADING if _HEADING_RE.match(block) else BlockType.PARAGRAPH
+
+def _classify_quote(block: str):
+    return BlockType.QUOTE if block.startswith("> ") else BlockType.PARAGRAPH
+
+def _classify_unordered_list(block: str):
+    return BlockType.UNORDERED_LIST if block[1:2] == " " else BlockType.PARAGRAPH
+
+def _classify_ordered_list(block: str):
+    return BlockType.ORDERED_LIST if _ORDERED_LIST_RE.match(block) else BlockType.PARAGRAPH
+
+def _classify_code(block: str):
+    if block.startswith("```") and block.endswith("```"):
         return BlockType.CODE
-    else:
-        return BlockType.PARAGRAPH
+    return BlockType.PARAGRAPH
+
+def _classify_other(block: str):
+    # \d also matches non-ASCII decimal digits
+    if block[:1].isdecimal():
+        return _classify_ordered_list(block)
+    return BlockType.PARAGRAPH
+
+# Each block type can only start with one of a few characters, so the first
+# character picks the single rule worth checking.
+_BLOCK_CLASSIFIERS = {
+    "#": _classify_heading,
+    ">": _classify_quote,
+    "-": _classify_unordered_list,
+    "*": _classify_unordered_list,
+    "`": _classify_code,
+    **{digit: _classify_ordered_list for digit in "0123456789"},
+}
+
+def block_to_block_type(block: str):
+    return _BLOCK_CLASSIFIERS.get(block[:1], _classify_other)(block)
+
+def blocks_to_block_types(blocks):
+    get_classifier = _BLOCK_CLASSIFIERS.get
+    return [get_classifier(block[:1], _classify_other)(block) for block in blocks]
+
+def text_to_children(text: str, leaf_factory=None):
+    # leaf_factory turns each TextNode into a leaf in place of
+    # text_node_to_html_node, e.g. a LeafNodeInterner
+    to_leaf = leaf_factory or text_node_to_html_node
+    children = [to_leaf(node) for node in text_to_text_nodes(text)]
+    # Markup with nothing inside it ("****") leaves no nodes at all
+    return children or [LeafNode(None, "")]
+
+def _strip_list_marker(line: str, block_type: BlockType):
+    if block_type is BlockType.ORDERED_LIST:
+        match = _ORDERED_LIST_RE.match(line)
+        return line[match.end():] if match else line
+    return line[2:] if line[:2] in ("- ", "* ") else line
+
+def block_to_html_node(block: str, block_type: BlockType = None, leaf_factory=None):
+    if block_type is None:
+        block_type = block_to_block_type(block)
+
+    match block_type:
+        case BlockType.HEADING:
+            level = len(block) - len(block.lstrip("#"))
+            return ParentNode(f"h{level}", text_to_children(block[level + 1:], leaf_factory))
+        case BlockType.CODE:
+            code = block[3:-3]
+            newline = code.find("\n")
+            if newline != -1:
+                # Drop the opening fence line and its info string ("``` python")
+                code = code[newline + 1:]
+            # Code is never parsed for markup, only escaped in a single pass
+            return ParentNode("pre", [LeafNode("code", html.escape(code, quote=False))])
+        case BlockType.QUOTE:
+            lines = [line.lstrip(">").strip() for line in block.split("\n")]
+            return ParentNode("blockquote", text_to_children(" ".join(lines), leaf_factory))
+        case BlockType.UNORDERED_LIST | BlockType.ORDERED_LIST:
+            items = [
+                ParentNode("li", text_to_children(_strip_list_marker(line, block_type), leaf_factory))
+                for line in block.split("\n")
+            ]
+            return ParentNode("ul" if block_type is BlockType.UNORDERED_LIST else "ol", items)
+        case BlockType.PARAGRAPH:
+            return ParentNode("p", text_to_children(" ".join(block.split("\n")), leaf_factory))
+        case _:
+            raise ValueError("block type is not a valid BlockType")
+
+def markdown_to_html_node(markdown: str, leaf_factory=None):
+    blocks = markdown_to_blocks(markdown)
+    children = [block_to_html_node(block, leaf_factory=leaf_factory) for block in blocks]
+    return ParentNode("div", children or [LeafNode(None, "")])
+
+def stream_markdown_to_html(
+    fileobj,
+    out,
+    max_block_size: int = DEFAULT_MAX_BLOCK_SIZE,
+    use_mmap: bool = False,
+    encoding: str = "utf-8",
+):
+    # Writes what markdown_to_html_node(markdown).to_html() returns, one
+    # block at a time, so memory follows the largest block instead of the
+    # document. Code fences are streamed line by line past max_block_size,
+    # which differs from markdown_to_html_node in two cases: a streamed fence
+    # that is never closed is code to the end of the input rather than text,
+    # and one followed by text without a blank line raises ValueError.
+    lines = _iter_mmap_lines(fileobj, encoding) if use_mmap else fileobj
+    out.write("<div>")
+    for block in _iter_bounded_blocks(lines, max_block_size):
+        if isinstance(block, str):
+            block_to_html_node(block).write_html(out)
+            continue
+        out.write("<pre><code>")
+        for line in block:
+            out.write(html.escape(line, quote=False))
+        out.write("</code></pre>")
+    out.write("</div>")
@@ -0,0 +1,248 @@
+from bisect import bisect_right
+from itertools import accumulate
+
+from conversion import block_to_block_type, block_to_html_node, iter_block_spans
+from htmlnode import LeafNode, ParentNode
+
+# Blocks per chunk of a Document. An edit rebuilds the chunks it touches and
+# moves the offsets of the later ones, so it costs about _CHUNK_BLOCKS plus
+# the number of chunks.
+_CHUNK_BLOCKS = 128
+
+class Block:
+    # piece is the block's markdown plus the blank lines after it, up to the
+    # next block, so the pieces of all blocks put together give the document
+    __slots__ = ("start", "length", "piece", "source", "block_type", "html_node", "in_open_fence")
+
+    def __init__(self, start, length, piece, source, block_type, html_node, in_open_fence):
+        self.start = start
+        self.length = length
+        self.piece = piece
+        self.source = source
+        self.block_type = block_type
+        self.html_node = html_node
+        self.in_open_fence = in_open_fence
+
+    def __repr__(self):
+        return f"Block({self.block_type}, {self.source!r})"
+
+def _parse_spans(text, spans, offset, reusable):
+    # Blocks for spans of text, which starts at document offset offset; each
+    # span is (start, end, in_open_fence, piece_end)
+    blocks = []
+    for start, end, in_open_fence, piece_end in spans:
+        source = text[start:end].strip()
+        previous = reusable.get(source)
+        if previous is not None:
+            block_type, html_node = previous.block_type, previous.html_node
+        else:
+            block_type = block_to_block_type(source)
+            html_node = block_to_html_node(source, block_type)
+        blocks.append(Block(offset + start, end - start, text[start:piece_end], source, block_type, html_node, in_open_fence))
+    return blocks
+
+def _with_piece_ends(spans, text_end):
+    spans = list(spans)
+    return [
+        (start, end, in_open_fence, spans[index + 1][0] if index + 1 < len(spans) else text_end)
+        for index, (start, end, in_open_fence) in enumerate(spans)
+    ]
+
+def _chunked(blocks):
+    return [blocks[index:index + _CHUNK_BLOCKS] for index in range(0, len(blocks), _CHUNK_BLOCKS)]
+
+class Document:
+    # A parsed markdown document that can be edited in place. Each edit
+    # re-parses from the block it starts in until the new blocks line up with
+    # the old ones again; every other block keeps its HTMLNode subtree.
+    #
+    # The text is held as one piece per block, so an edit only rebuilds the
+    # few pieces it touches. Blocks are kept in chunks, and a block in chunk
+    # k starts _shifts[k] characters after its stored start: an edit rebuilds
+    # the chunks it touches and adds its change in length to the shifts of
+    # the chunks after them, instead of moving every later block.
+    def __init__(self, markdown: str = ""):
+        spans = _with_piece_ends(iter_block_spans(markdown), len(markdown))
+        self._head = markdown[:spans[0][0]] if spans else markdown
+        self._chunks = _chunked(_parse_spans(markdown, spans, 0, {}))
+        self._shifts = [0] * len(self._chunks)
+        self._index_chunks()
+        self._length = len(markdown)
+        self._text = markdown
+
+    def _index_chunks(self):
+        # _firsts[k] is the index of chunk k's first block; the last entry is
+        # the number of blocks
+        self._firsts = [0, *accumulate(len(chunk) for chunk in self._chunks)]
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = self._head + "".join(block.piece for chunk in self._chunks for block in chunk)
+        return self._text
+
+    def __len__(self):
+        return self._length
+
+    def _locate(self, index):
+        chunk = bisect_right(self._firsts, index) - 1
+        return chunk, index - self._firsts[chunk]
+
+    def _block(self, index):
+        chunk, position = self._locate(index)
+        return self._chunks[chunk][position]
+
+    def _start(self, index):
+        chunk, position = self._locate(index)
+        return self._chunks[chunk][position].start + self._shifts[chunk]
+
+    def _slice(self, low, high):
+        blocks = []
+        if low >= high:
+            return blocks
+        chunk, position = self._locate(low)
+        while len(blocks) < high - low:
+            blocks.extend(self._chunks[chunk][position:position + high - low - len(blocks)])
+            chunk, position = chunk + 1, 0
+        return blocks
+
+    def _block_at(self, offset):
+        # Index of the last block starting at or before offset, or -1
+        low, high = 0, self._firsts[-1]
+        while low < high:
+            middle = (low + high) // 2
+            if self._start(middle) <= offset:
+                low = middle + 1
+            else:
+                high = middle
+        return low - 1
+
+    def _splice(self, low, high, parsed, delta):
+        # Replaces blocks low .. high with parsed, whose starts are final, and
+        # moves the blocks after them by delta
+        chunks, shifts, firsts = self._chunks, self._shifts, self._firsts
+        last = len(chunks) - 1
+        first_chunk = max(min(bisect_right(firsts, low) - 1, last), 0)
+        end_chunk = max(min(bisect_right(firsts, max(high - 1, low)) - 1, last) + 1, first_chunk)
+        # A short chunk left at the end takes in the next one, so deletions
+        # do not leave a trail of tiny chunks
+        size = firsts[end_chunk] - firsts[first_chunk] - (high - low) + len(parsed)
+        if end_chunk <= last and size % _CHUNK_BLOCKS < _CHUNK_BLOCKS // 2:
+            end_chunk += 1
+
+        blocks = []
+        for chunk in range(first_chunk, end_chunk):
+            shift = shifts[chunk]
+            if shift:
+                for block in chunks[chunk]:
+                    block.start += shift
+            blocks.extend(chunks[chunk])
+        low -= firsts[first_chunk]
+        high -= firsts[first_chunk]
+        if delta:
+            for block in blocks[high:]:
+                block.start += delta
+        blocks[low:high] = parsed
+
+        rebuilt = _chunked(blocks)
+        chunks[first_chunk:end_chunk] = rebuilt
+        shifts[first_chunk:end_chunk] = [0] * len(rebuilt)
+        later = first_chunk + len(rebuilt)
+        if delta:
+            shifts[later:] = [shift + delta for shift in shifts[later:]]
+        self._index_chunks()
+
+    @property
+    def blocks(self):
+        for chunk, shift in zip(self._chunks, self._shifts):
+            if shift:
+                for block in chunk:
+                    block.start += shift
+        self._shifts = [0] * len(self._chunks)
+        return [block for chunk in self._chunks for block in chunk]
+
+    def _reparse(self, first, offset, old_len, new_text, window):
+        # Parses the edited text of blocks first .. first + window. Returns
+        # (new head or None, prefix for the block before first, new blocks,
+        # index of the first old block kept), or None when the new blocks do
+        # not line up with the old ones inside the window.
+        count = self._firsts[-1]
+        stop = min(first + window, count)
+        at_end = stop == count
+        blocks = self._slice(first, stop)
+        if first == 0:
+            region_start = 0
+            old = self._head + "".join(block.piece for block in blocks)
+        else:
+            region_start = self._start(first)
+            old = "".join(block.piece for block in blocks)
+        local_offset = offset - region_start
+        text = old[:local_offset] + new_text + old[local_offset + old_len:]
+        delta = len(new_text) - old_len
+        edit_end = local_offset + len(new_text)
+
+        spans = []
+        resume = first
+        resync = None
+        for start, end, in_open_fence in iter_block_spans(text):
+            if start >= edit_end and not in_open_fence:
+                # Once a block starts where an old one did, the splitter is
+                # in the same state and everything after is unchanged
+                old_start = region_start + start - delta
+                while resume < stop and self._start(resume) < old_start:
+                    resume += 1
+                if resume < stop and self._start(resume) == old_start and not blocks[resume - first].in_open_fence:
+                    resync = start
+                    break
+            spans.append((start, end, in_open_fence))
+        if resync is None:
+            if not at_end:
+                return None
+            resume = count
+            resync = len(text)
+
+        spans = _with_piece_ends(spans, resync)
+        leading = text[:spans[0][0]] if spans else text[:resync]
+        reusable = {block.source: block for block in blocks[:resume - first]}
+        parsed = _parse_spans(text, spans, region_start, reusable)
+        if first == 0:
+            return leading, None, parsed, resume
+        return None, leading, parsed, resume
+
+    def apply_edit(self, offset: int, old_len: int, new_text: str):
+        # Replaces text[offset:offset + old_len] with new_text and returns the
+        # blocks that had to be parsed again. A block that fails to parse
+        # raises ValueError and leaves the document unchanged.
+        if offset < 0 or old_len < 0 or offset + old_len > self._length:
+            raise ValueError("edit is outside the document")
+        first = max(self._block_at(offset), 0)
+        # Blocks after an unclosed fence hang off the fence's opening line
+        while first > 0 and self._block(first).in_open_fence and self._block(first - 1).in_open_fence:
+            first -= 1
+        last = max(self._block_at(offset + old_len), first)
+
+        window = last - first + 3
+        while True:
+            result = self._reparse(first, offset, old_len, new_text, window)
+            if result is not None:
+                break
+            window *= 4
+        head, prefix, parsed, resume = result
+
+        delta = len(new_text) - old_len
+        if head is not None:
+            self._head = head
+        elif prefix:
+            # The edit left blank lines where block first used to start
+            self._block(first - 1).piece += prefix
+        self._splice(first, resume, parsed, delta)
+        self._length += delta
+        self._text = None
+        return parsed
+
+    def to_html_node(self):
+        children = [block.html_node for chunk in self._chunks for block in chunk]
+        return ParentNode("div", children or [LeafNode(None, "")])
+
+    def to_html(self):
+        return self.to_html_node().to_html()
@@ -1,4 +1,12 @@
+import html
+from types import MappingProxyType
+
+# Leaves never have children; they all share this instead of an empty list each
+_NO_CHILDREN = ()
+
 class HTMLNode:
+    __slots__ = ("tag", "value", "children", "_props", "_props_key", "_props_html")
+
     def __init__(self, tag: str = None, value: str = None, children: list = None, props: dict = None):
         self.tag = tag
         self.value = value
@@ -21,16 +29,47 @@ class HTMLNode:
 
     def to_html(self):
         raise NotImplementedError("TBD")
+
+    def iter_html(self):
+        return _iter_html(self)
+
+    def write_html(self, stream):
+        stream.writelines(_iter_html(self))
     
+    @property
+    def props(self):
+        return self._props
+
+    @props.setter
+    def props(self, props):
+        self._props = props
+        self._props_key = None
+        self._props_html = None
+
     def props_to_html(self):
-        prop_string = ""
-        for prop in self.props or {}:
-            prop_string += f'{prop}="{self.props[prop]}" '
-        return prop_string.strip()
+        # The rendered attributes are cached per node against a snapshot of
+        # the items, so a dict changed in place is rendered afresh too
+        key = tuple(self._props.items()) if self._props else ()
+        if key != self._props_key:
+            self._props_html = " ".join([
+                f'{prop}="{_escape_attribute(value)}"' for prop, value in key
+            ])
+            self._props_key = key
+        return self._props_html
+
+def _escape_attribute(value):
+    value = str(value)
+    # Most URLs and class names have nothing to escape; checking with `in`
+    # is cheaper than letting html.escape run its five replacements
+    if "&" in value or "<" in value or ">" in value or '"' in value or "'" in value:
+        return html.escape(value)
+    return value
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag: str, value: str, props: dict = None):
-        super().__init__(tag, value, [], props)
+        super().__init__(tag, value, _NO_CHILDREN, props)
 
     def to_html(self):
         if self.value is None:
@@ -45,11 +84,37 @@ class LeafNode(HTMLNode):
 
         return f"<{self.tag}{prop_string}>{self.value}</{self.tag}>"
     
+class FrozenLeafNode(LeafNode):
+    # A LeafNode that is safe to share between trees: its attributes can't
+    # be reassigned and its props are a read-only mapping
+    __slots__ = ()
+
+    def __init__(self, tag: str, value: str, props: dict = None):
+        set_attribute = object.__setattr__
+        set_attribute(self, "tag", tag)
+        set_attribute(self, "value", value)
+        set_attribute(self, "children", _NO_CHILDREN)
+        set_attribute(self, "_props", None if props is None else MappingProxyType(dict(props)))
+        set_attribute(self, "_props_key", None)
+        set_attribute(self, "_props_html", None)
+
+    def __setattr__(self, name, value):
+        if name in ("_props_key", "_props_html"):
+            # The rendered attribute cache
+            object.__setattr__(self, name, value)
+            return
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag: str, children: list, props: dict = None):
         super().__init__(tag, None, children, props)
 
-    def to_html(self):
+    def _opening_tag(self):
         if self.tag is None:
             raise ValueError("ParentNode must have a tag")
         
@@ -60,5 +125,53 @@ class ParentNode(HTMLNode):
         if self.props is not None and len(self.props) > 0:
             prop_string = f" {self.props_to_html()}"
 
-        children_html = "".join(child.to_html() for child in self.children)
-        return f"<{self.tag}{prop_string}>{children_html}</{self.tag}>"
+        return f"<{self.tag}{prop_string}>"
+
+    def to_html(self):
+        return "".join(_iter_html(self))
+
+# Leaf classes whose to_html _iter_html renders in place instead of calling
+_PLAIN_LEAVES = {LeafNode, FrozenLeafNode}
+# _iter_html hands out its output once it has gathered this many pieces
+_CHUNK_PARTS = 512
+
+def _iter_html(node):
+    # Depth-first walk over an explicit stack rather than recursing into
+    # children, so nesting depth is not limited by the interpreter's
+    # recursion limit. Only parents go on the stack, as an iterator over
+    # their remaining children; runs of leaves are rendered in place.
+    if not isinstance(node, ParentNode):
+        yield node.to_html()
+        return
+    parts = [node._opening_tag()]
+    append = parts.append
+    stack = [(iter(node.children), f"</{node.tag}>")]
+    while stack:
+        children, closing = stack[-1]
+        for child in children:
+            if child.__class__ in _PLAIN_LEAVES:
+                # LeafNode.to_html, inlined
+                value = child.value
+                if value is None:
+                    raise ValueError("LeafNode must have a value")
+                tag = child.tag
+                if tag is None:
+                    append(value)
+                elif child._props:
+                    append(f"<{tag} {child.props_to_html()}>{value}</{tag}>")
+                else:
+                    append(f"<{tag}>{value}</{tag}>")
+            elif isinstance(child, ParentNode):
+                append(child._opening_tag())
+                stack.append((iter(child.children), f"</{child.tag}>"))
+                break
+            else:
+                append(child.to_html())
+        else:
+            append(closing)
+            stack.pop()
+        if len(parts) >= _CHUNK_PARTS:
+            yield "".join(parts)
+            parts.clear()
+    if parts:
+        yield "".join(parts)
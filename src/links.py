@@ -0,0 +1,93 @@
+import posixpath
+import re
+from urllib.parse import unquote
+
+from htmlnode import ParentNode
+
+_SCHEME_RE = re.compile(r"[A-Za-z][A-Za-z0-9+.-]*:")
+
+def page_links(node):
+    # Every href and img src in a rendered tree, in document order, read from
+    # the nodes instead of the HTML they serialize to
+    urls = []
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, ParentNode):
+            stack.extend(reversed(item.children))
+            continue
+        props = item.props
+        if not props:
+            continue
+        if item.tag == "a" and "href" in props:
+            urls.append(props["href"])
+        elif item.tag == "img" and "src" in props:
+            urls.append(props["src"])
+    return urls
+
+def resolve_link(page_output: str, url: str):
+    # The site-relative path a link from page_output points to, or None for
+    # external links and same-page anchors
+    if not url or url.startswith(("#", "//")) or _SCHEME_RE.match(url):
+        return None
+    path = unquote(url.split("#", 1)[0].split("?", 1)[0])
+    if not path:
+        return None
+    if path.startswith("/"):
+        target = posixpath.normpath(path.lstrip("/") or ".")
+    else:
+        target = posixpath.normpath(posixpath.join(posixpath.dirname(page_output), path))
+    if target == ".":
+        return "index.html"
+    if path.endswith("/"):
+        return posixpath.join(target, "index.html")
+    return target
+
+def _candidates(target):
+    # "/docs/intro" may be served from docs/intro.html or docs/intro/index.html
+    yield target
+    if not target.endswith(".html"):
+        yield target + ".html"
+        yield posixpath.join(target, "index.html")
+
+class LinkReport:
+    def __init__(self, broken, orphans):
+        self.broken = broken  # (source page, url) pairs
+        self.orphans = orphans  # source pages nothing links to
+
+    def summary(self):
+        return f"{len(self.broken)} broken links, {len(self.orphans)} orphan pages"
+
+class LinkIndex:
+    # Internal links and image references of every page, checked against the
+    # pages and static files a build produces. Holds one list of urls per
+    # page, so memory grows with the number of links.
+    def __init__(self):
+        self._pages = {}
+        self._static = set()
+
+    def add_page(self, source: str, output: str, urls):
+        self._pages[output.replace("\\", "/")] = (source, urls)
+
+    def add_static(self, path: str):
+        self._static.add(path.replace("\\", "/"))
+
+    def check(self, root_page: str = "index.html"):
+        targets = self._static | self._pages.keys()
+        broken = []
+        linked = set()
+        for output, (source, urls) in self._pages.items():
+            for url in urls:
+                target = resolve_link(output, url)
+                if target is None:
+                    continue
+                found = next((candidate for candidate in _candidates(target) if candidate in targets), None)
+                if found is None:
+                    broken.append((source, url))
+                elif found != output:
+                    linked.add(found)
+        orphans = [
+            source for output, (source, _) in self._pages.items()
+            if output not in linked and output != root_page
+        ]
+        return LinkReport(broken, sorted(orphans))
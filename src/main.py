@@ -1,5 +1,133 @@
-from textnode import TextNode, TextType
+import argparse
+import os
+import sys
 
-node = TextNode("Hello, World!", TextType.CODE, "http://example.com")
+# Subsystems are imported by the commands that use them, so a short-lived
+# invocation such as rendering one fragment loads only the converter
 
-print(node)
\ No newline at end of file
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="main.py", description="Build the static site.")
+    subcommands = parser.add_subparsers(dest="command")
+
+    site_options = argparse.ArgumentParser(add_help=False)
+    site_options.add_argument("--content", default="content", help="directory of markdown pages")
+    site_options.add_argument("--template", default="template.html", help="page template with {{ Title }} and {{ Content }}")
+    site_options.add_argument("--static", default="static", help="directory of files copied into public/ as-is")
+    site_options.add_argument("--public", default="public", help="output directory")
+
+    build = subcommands.add_parser("build", parents=[site_options], help="render content/ into public/, skipping unchanged pages")
+    build.add_argument("--force", action="store_true", help="rebuild every page")
+    build.add_argument("-j", "--jobs", type=int, default=1, help="render pages in N worker processes")
+    build.add_argument("--io-workers", type=int, default=8, help="threads for reading and writing files")
+    build.add_argument("--search", action="store_true", help="write a search index to public/search/")
+    build.add_argument("--intern", action="store_true", help="share one node between identical inline links, images and snippets")
+    build.add_argument("--check-links", action="store_true", help="list broken internal links and orphan pages; exit 1 on broken links")
+    build.add_argument("--profile", action="store_true", help="print time spent in each conversion stage (also SSG_PROFILE=1)")
+    build.add_argument("--profile-trace", metavar="PATH", help="with profiling, write a Chrome trace JSON file to PATH")
+
+    convert = subcommands.add_parser("convert", help="convert one large markdown file, a block at a time")
+    convert.add_argument("input", help="markdown file")
+    convert.add_argument("-o", "--output", required=True, help="HTML file to write")
+    convert.add_argument("--template", help="page template; without one only the content <div> is written")
+    convert.add_argument("--max-block-mb", type=float, default=16, help="largest block held in memory (code fences are streamed past it)")
+
+    render = subcommands.add_parser("render", help="convert a markdown fragment to HTML on stdout")
+    render.add_argument("input", nargs="?", help="markdown file (default: stdin)")
+
+    render_server = subcommands.add_parser("render-server", help="keep rendering framed fragments until the input ends")
+    render_server.add_argument("--socket", metavar="PATH", help="listen on a Unix socket instead of stdin/stdout")
+
+    serve = subcommands.add_parser("serve", parents=[site_options], help="build, then serve public/ locally")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.add_argument("--watch", action="store_true", help="re-render saved pages and reload the browser")
+    serve.add_argument("--interval", type=float, default=0.01, help="seconds between checks for changes")
+
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or (argv[0].startswith("-") and argv[0] not in ("-h", "--help")):
+        argv = ["build", *argv]  # build is the default command
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "render":
+            from conversion import markdown_to_html_node
+
+            if args.input is None:
+                markdown = sys.stdin.read()
+            else:
+                with open(args.input, encoding="utf-8") as f:
+                    markdown = f.read()
+            sys.stdout.write(markdown_to_html_node(markdown).to_html())
+            return
+
+        if args.command == "render-server":
+            from render_server import serve_stream, serve_unix_socket
+
+            if args.socket:
+                serve_unix_socket(args.socket)
+            else:
+                serve_stream(sys.stdin.buffer, sys.stdout.buffer)
+            return
+
+        if args.command == "convert":
+            from pages import stream_page
+
+            # Written aside first, so a failure never leaves half a page
+            partial = args.output + ".tmp"
+            try:
+                with open(partial, "w", encoding="utf-8") as out:
+                    stream_page(args.input, args.template, out, int(args.max_block_mb * 1024 * 1024))
+                os.replace(partial, args.output)
+            finally:
+                if os.path.exists(partial):
+                    os.remove(partial)
+            return
+
+        if args.command == "serve":
+            from server import serve as serve_site
+
+            serve_site(
+                args.content, args.template, args.public, args.static,
+                host=args.host, port=args.port, watch=args.watch, interval=args.interval,
+            )
+            return
+
+        from build import build_site
+        from profiling import Profiler, enabled_from_env
+
+        profiler = None
+        if args.profile or args.profile_trace or enabled_from_env():
+            # Stages are only instrumented in this process, so render here
+            profiler = Profiler(trace=args.profile_trace is not None)
+            args.jobs = 1
+            profiler.install()
+        try:
+            report = build_site(
+                args.content, args.template, args.public, args.static,
+                force=args.force, jobs=args.jobs, io_workers=args.io_workers, search=args.search,
+                intern=args.intern,
+            )
+        finally:
+            if profiler is not None:
+                profiler.uninstall()
+        if profiler is not None and args.profile_trace:
+            profiler.write_trace(args.profile_trace)
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"error: {e}\n")
+    print(report.summary())
+    print(report.timing_summary())
+    if report.cache_hits or report.cache_misses:
+        print(report.cache_summary())
+    if profiler is not None:
+        print(profiler.summary_table())
+    if args.check_links:
+        print(report.links.summary())
+        for source, url in report.links.broken:
+            print(f"  broken: {source} -> {url}")
+        for source in report.links.orphans:
+            print(f"  orphan: {source}")
+        if report.links.broken:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import functools
+import os
+import re
+
+from conversion import DEFAULT_MAX_BLOCK_SIZE, markdown_to_html_node, stream_markdown_to_html
+from links import page_links
+from search import page_terms
+
+_SLOT_RE = re.compile(r"\{\{ (Title|Content) \}\}")
+
+def extract_title(markdown: str):
+    return _first_title(markdown.split("\n"))
+
+def _first_title(lines):
+    for line in lines:
+        if line.startswith("# "):
+            return line[2:].strip()
+    raise ValueError("page has no h1 title")
+
+class CompiledTemplate:
+    # A template split once into literal text and {{ Title }} / {{ Content }}
+    # slots, so a page is assembled with a single join instead of a
+    # replace() pass over the whole template per slot
+    def __init__(self, text: str):
+        pieces = _SLOT_RE.split(text)
+        # split() with a group alternates literal, slot name, literal, ...
+        self.segments = [
+            (piece, index % 2 == 1)
+            for index, piece in enumerate(pieces)
+            if piece or index % 2 == 1
+        ]
+        self._content_slots = pieces[1::2].count("Content")
+
+    def render_parts(self, title: str, content_parts):
+        if self._content_slots > 1:
+            content_parts = list(content_parts)
+        parts = []
+        for value, is_slot in self.segments:
+            if not is_slot:
+                parts.append(value)
+            elif value == "Title":
+                parts.append(title)
+            else:
+                parts.extend(content_parts)
+        return "".join(parts)
+
+    def render(self, title: str, content: str):
+        return self.render_parts(title, (content,))
+
+@functools.lru_cache(maxsize=32)
+def compile_template(text: str):
+    return CompiledTemplate(text)
+
+# path -> (mtime_ns, size, CompiledTemplate)
+_loaded_templates = {}
+
+def load_template(path: str):
+    # Re-reads the file only after it changed on disk
+    stat = os.stat(path)
+    cached = _loaded_templates.get(path)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    with open(path, encoding="utf-8") as f:
+        template = compile_template(f.read())
+    _loaded_templates[path] = (stat.st_mtime_ns, stat.st_size, template)
+    return template
+
+def _as_template(template):
+    if isinstance(template, CompiledTemplate):
+        return template
+    return load_template(template)
+
+def fill_template(template: str, title: str, content: str):
+    return compile_template(template).render(title, content)
+
+def page_html(markdown: str, template):
+    # template is template text or a CompiledTemplate. The content slot is
+    # filled straight from the node tree, so the body is never joined twice.
+    if not isinstance(template, CompiledTemplate):
+        template = compile_template(template)
+    return template.render_parts(extract_title(markdown), markdown_to_html_node(markdown).iter_html())
+
+def render_markdown_page(markdown: str, template, with_terms: bool = False, cache=None, leaf_factory=None):
+    # The page as page_html renders it, plus what the build indexes from the
+    # node tree: (html, link urls, search terms or None). With a
+    # BlockRenderCache, blocks it has seen before are not rendered again;
+    # leaf_factory is passed on to markdown_to_html_node.
+    if not isinstance(template, CompiledTemplate):
+        template = compile_template(template)
+    if cache is not None:
+        content, urls, terms = cache.render_page(markdown, with_terms, leaf_factory)
+        return template.render(extract_title(markdown), content), urls, terms
+    tree = markdown_to_html_node(markdown, leaf_factory)
+    html = template.render_parts(extract_title(markdown), tree.iter_html())
+    return html, page_links(tree), page_terms(tree) if with_terms else None
+
+def render_page(markdown_path: str, template):
+    # template is a template file path or a CompiledTemplate
+    with open(markdown_path, encoding="utf-8") as f:
+        markdown = f.read()
+    return page_html(markdown, _as_template(template))
+
+def render_pages(markdown_paths, template):
+    template = _as_template(template)
+    return [render_page(path, template) for path in markdown_paths]
+
+def stream_page(markdown_path: str, template, out, max_block_size: int = DEFAULT_MAX_BLOCK_SIZE):
+    # render_page for documents too large to hold: the content slot is
+    # converted straight into out one block at a time. template may be None
+    # for the bare <div> of content.
+    if template is None:
+        with open(markdown_path, encoding="utf-8") as f:
+            stream_markdown_to_html(f, out, max_block_size)
+        return
+    template = _as_template(template)
+    title = None
+    for value, is_slot in template.segments:
+        if not is_slot:
+            out.write(value)
+        elif value == "Title":
+            if title is None:
+                with open(markdown_path, encoding="utf-8") as f:
+                    title = _first_title(f)
+            out.write(title)
+        else:
+            with open(markdown_path, encoding="utf-8") as f:
+                stream_markdown_to_html(f, out, max_block_size)
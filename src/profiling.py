@@ -0,0 +1,194 @@
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+import conversion
+import htmlnode
+from htmlnode import LeafNode, ParentNode
+
+def _text_length(args, result):
+    return len(args[0])
+
+def _nodes_length(args, result):
+    return sum(len(node.text) for node in args[0])
+
+def _node_length(args, result):
+    return len(args[0].text)
+
+def _blocks_length(args, result):
+    return sum(len(block) for block in args[0])
+
+def _html_length(args, result):
+    return len(result) if result is not None else 0
+
+# (owner, attribute, how many bytes a call processed)
+_STAGES = [
+    (conversion, "markdown_to_blocks", _text_length),
+    (conversion, "block_to_block_type", _text_length),
+    (conversion, "blocks_to_block_types", _blocks_length),
+    (conversion, "text_to_text_nodes", _text_length),
+    (conversion, "split_nodes_images", _nodes_length),
+    (conversion, "split_nodes_links", _nodes_length),
+    (conversion, "split_nodes_delimiter", _nodes_length),
+    (conversion, "text_node_to_html_node", _node_length),
+    (LeafNode, "to_html", _html_length),
+    (ParentNode, "to_html", _html_length),
+]
+
+# Generators timed across every chunk they produce: (owner, attribute, stage
+# name). Builds serialize pages by joining _iter_html's chunks into the
+# template, never calling ParentNode.to_html.
+_GENERATOR_STAGES = [
+    (htmlnode, "_iter_html", "serialize_html"),
+]
+
+def enabled_from_env():
+    return os.environ.get("SSG_PROFILE", "") not in ("", "0")
+
+class Profiler:
+    # Records call counts, cumulative time and bytes processed for each
+    # conversion stage. Nothing is wrapped until install(), so there is no
+    # cost at all while profiling is off. With trace=True every call is also
+    # kept (up to max_events) for a Chrome trace.
+    def __init__(self, trace: bool = False, max_events: int = 1_000_000):
+        self.stats = {}
+        self.events = [] if trace else None
+        self.max_events = max_events
+        self._patched = []
+        self._started = None
+
+    def _wrap(self, name, func, measure):
+        stats = self.stats.setdefault(name, [0, 0.0, 0])
+        events = self.events
+        max_events = self.max_events
+        perf_counter = time.perf_counter
+        get_ident = threading.get_ident
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            result = None
+            start = perf_counter()
+            try:
+                result = func(*args, **kwargs)
+                return result
+            finally:
+                end = perf_counter()
+                stats[0] += 1
+                stats[1] += end - start
+                stats[2] += measure(args, result)
+                if events is not None and len(events) < max_events:
+                    events.append((name, start, end, get_ident()))
+
+        return wrapper
+
+    def _wrap_generator(self, name, func):
+        # One call per generator; time and bytes are summed over its chunks,
+        # and each chunk is one trace event
+        stats = self.stats.setdefault(name, [0, 0.0, 0])
+        events = self.events
+        max_events = self.max_events
+        perf_counter = time.perf_counter
+        get_ident = threading.get_ident
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            stats[0] += 1
+            iterator = func(*args, **kwargs)
+            while True:
+                start = perf_counter()
+                try:
+                    chunk = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    end = perf_counter()
+                    stats[1] += end - start
+                    if events is not None and len(events) < max_events:
+                        events.append((name, start, end, get_ident()))
+                stats[2] += len(chunk)
+                yield chunk
+
+        return wrapper
+
+    def install(self):
+        if self._patched:
+            return
+        self._started = time.perf_counter()
+        source_dir = os.path.dirname(os.path.abspath(conversion.__file__))
+        modules = [
+            module for module in list(sys.modules.values())
+            if os.path.dirname(os.path.abspath(getattr(module, "__file__", None) or "")) == source_dir
+        ]
+        for owner, attribute, measure in _STAGES:
+            original = owner.__dict__[attribute]
+            name = attribute if owner is conversion else f"{owner.__name__}.{attribute}"
+            wrapper = self._wrap(name, original, measure)
+            setattr(owner, attribute, wrapper)
+            self._patched.append((owner, attribute, original))
+            if owner is conversion:
+                # Modules that did `from conversion import ...` hold their
+                # own reference to the function
+                for module in modules:
+                    if module is not conversion and getattr(module, attribute, None) is original:
+                        setattr(module, attribute, wrapper)
+                        self._patched.append((module, attribute, original))
+        for owner, attribute, name in _GENERATOR_STAGES:
+            original = getattr(owner, attribute)
+            setattr(owner, attribute, self._wrap_generator(name, original))
+            self._patched.append((owner, attribute, original))
+
+    def uninstall(self):
+        for owner, attribute, original in reversed(self._patched):
+            setattr(owner, attribute, original)
+        self._patched = []
+
+    def __enter__(self):
+        self.install()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.uninstall()
+
+    def summary(self):
+        return {
+            name: {"calls": calls, "seconds": seconds, "bytes": size}
+            for name, (calls, seconds, size) in self.stats.items()
+            if calls
+        }
+
+    def summary_table(self):
+        lines = [f"{'stage':<24} {'calls':>9} {'total ms':>10} {'us/call':>9} {'MB':>8} {'MB/s':>8}"]
+        rows = sorted(self.summary().items(), key=lambda item: item[1]["seconds"], reverse=True)
+        for name, row in rows:
+            megabytes = row["bytes"] / 2**20
+            rate = megabytes / row["seconds"] if row["seconds"] else 0.0
+            lines.append(
+                f"{name:<24} {row['calls']:>9} {row['seconds'] * 1e3:>10.2f} "
+                f"{row['seconds'] / row['calls'] * 1e6:>9.2f} {megabytes:>8.2f} {rate:>8.1f}"
+            )
+        return "\n".join(lines)
+
+    def chrome_trace(self):
+        # Complete ("X") events in microseconds, loadable in chrome://tracing
+        # or Perfetto; the per-stage totals ride along in otherData
+        pid = os.getpid()
+        events = [
+            {
+                "name": name,
+                "cat": "conversion",
+                "ph": "X",
+                "ts": (start - self._started) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": pid,
+                "tid": tid,
+            }
+            for name, start, end, tid in self.events or []
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"summary": self.summary()}}
+
+    def write_trace(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
@@ -0,0 +1,120 @@
+import functools
+import hashlib
+import json
+import os
+import tempfile
+
+import conversion
+import htmlnode
+import links
+import pages
+import search
+import textnode
+from links import page_links
+from search import page_terms
+
+@functools.cache
+def converter_version():
+    # Any edit to the conversion code changes the version and empties caches
+    # written by the previous code. links and search are included because
+    # skipped pages keep the links and search terms they were indexed with.
+    digest = hashlib.sha256()
+    for module in (textnode, htmlnode, conversion, pages, links, search):
+        with open(module.__file__, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def _entry_size(entry):
+    html, urls, terms = entry
+    return len(html) + sum(map(len, urls)) + (sum(map(len, terms)) if terms else 0)
+
+def block_key(block: str):
+    return hashlib.blake2b(block.encode("utf-8"), digest_size=16).hexdigest()
+
+class BlockRenderCache:
+    # Maps a hash of each block's markdown to its rendered HTML, persisted as
+    # JSON between builds. Alongside the HTML each entry keeps the block's
+    # link urls and, once a search build asked for them, its search terms,
+    # so a page assembled from cached blocks needs no node tree at all.
+    # Entries are kept in least-recently-used order and the oldest are
+    # evicted once the cached data exceeds max_bytes.
+    def __init__(self, path: str, max_bytes: int = 64 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}  # key -> [html, urls, terms or None]
+        self._size = 0
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if data.get("version") != converter_version():
+            return
+        for key, entry in data.get("entries", {}).items():
+            if isinstance(entry, list) and len(entry) == 3:
+                self._store(key, entry)
+
+    def _store(self, key, entry):
+        self._entries[key] = entry
+        self._size += _entry_size(entry)
+        while self._size > self.max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            self._size -= _entry_size(self._entries.pop(oldest))
+
+    def _lookup(self, block: str, with_terms: bool, leaf_factory=None):
+        key = block_key(block)
+        entry = self._entries.pop(key, None)
+        if entry is not None and (entry[2] is not None or not with_terms):
+            self.hits += 1
+            self._entries[key] = entry  # move to the most recently used end
+            return entry
+        if entry is not None:
+            self._size -= _entry_size(entry)
+        self.misses += 1
+        node = conversion.block_to_html_node(block, leaf_factory=leaf_factory)
+        entry = [node.to_html(), page_links(node), page_terms(node) if with_terms else None]
+        self._store(key, entry)
+        return entry
+
+    def render_block(self, block: str):
+        return self._lookup(block, False)[0]
+
+    def render_page(self, markdown: str, with_terms: bool = False, leaf_factory=None):
+        # What markdown_to_html_node gives for markdown: (content html, link
+        # urls, search terms or None)
+        blocks = conversion.markdown_to_blocks(markdown)
+        if not blocks:
+            return conversion.markdown_to_html_node(markdown).to_html(), [], [] if with_terms else None
+        entries = [self._lookup(block, with_terms, leaf_factory) for block in blocks]
+        html = f"<div>{''.join(entry[0] for entry in entries)}</div>"
+        urls = [url for entry in entries for url in entry[1]]
+        terms = [term for entry in entries for term in entry[2]] if with_terms else None
+        return html, urls, terms
+
+    def render_markdown(self, markdown: str):
+        return self.render_page(markdown)[0]
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def save(self):
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".render-cache-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": converter_version(), "entries": self._entries}, f)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
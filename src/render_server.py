@@ -0,0 +1,137 @@
+import os
+import socket
+import socketserver
+import stat
+
+from conversion import markdown_to_html_node
+
+# A long-lived process that renders markdown fragments, so interpreter
+# startup and imports are paid once rather than per fragment. Requests and
+# replies are frames: a header line "<kind> <length>\n" followed by <length>
+# bytes of UTF-8. A request is "render"; the reply is "ok" with the HTML or
+# "error" with the message.
+
+def render_fragment(markdown: str):
+    return markdown_to_html_node(markdown).to_html()
+
+def write_frame(wfile, kind: str, body: str):
+    data = body.encode("utf-8")
+    wfile.write(f"{kind} {len(data)}\n".encode("ascii") + data)
+    wfile.flush()
+
+def read_frame(rfile):
+    # (kind, body), or None at the end of the input
+    header = rfile.readline()
+    if not header:
+        return None
+    try:
+        kind, length = header.decode("ascii").split()
+        length = int(length)
+    except ValueError:
+        raise ValueError(f"malformed frame header: {header[:80]!r}") from None
+    data = rfile.read(length)
+    if len(data) != length:
+        raise ValueError("input ended inside a frame")
+    return kind, data.decode("utf-8")
+
+def serve_stream(rfile, wfile):
+    # Answers requests until rfile ends. Returns the number of fragments
+    # rendered. A fragment that fails to render gets an error reply; a
+    # malformed frame ends the stream, since the framing is lost.
+    rendered = 0
+    while True:
+        frame = read_frame(rfile)
+        if frame is None:
+            return rendered
+        kind, body = frame
+        if kind != "render":
+            write_frame(wfile, "error", f"unknown request: {kind}")
+            continue
+        try:
+            html = render_fragment(body)
+        except ValueError as e:
+            write_frame(wfile, "error", str(e))
+            continue
+        write_frame(wfile, "ok", html)
+        rendered += 1
+
+def _remove_stale_socket(path):
+    # Removes a socket left by a server that did not shut down cleanly.
+    # Anything else at path, or a socket a live server still answers on,
+    # is left alone and raises ValueError.
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise ValueError(f"{path} exists and is not a socket")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.remove(path)
+            return
+    raise ValueError(f"a render server is already listening on {path}")
+
+class _RenderHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            serve_stream(self.rfile, self.wfile)
+        except (ValueError, OSError):
+            pass  # the client sent garbage or went away
+
+class RenderServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str):
+        _remove_stale_socket(path)
+        super().__init__(path, _RenderHandler)
+        self.path = path
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+def serve_unix_socket(path: str):
+    with RenderServer(path) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+class RenderClient:
+    # Sends fragments to a render server, over a Unix socket or any pair of
+    # binary file objects (such as a child process's stdout and stdin)
+    def __init__(self, rfile, wfile, sock=None):
+        self._rfile = rfile
+        self._wfile = wfile
+        self._sock = sock
+
+    @classmethod
+    def connect(cls, path: str):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(path)
+        return cls(sock.makefile("rb"), sock.makefile("wb"), sock)
+
+    def render(self, markdown: str):
+        write_frame(self._wfile, "render", markdown)
+        frame = read_frame(self._rfile)
+        if frame is None:
+            raise OSError("render server closed the connection")
+        kind, body = frame
+        if kind != "ok":
+            raise ValueError(body)
+        return body
+
+    def close(self):
+        if self._sock is not None:
+            self._rfile.close()
+            self._wfile.close()
+            self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
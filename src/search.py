@@ -0,0 +1,203 @@
+import json
+import os
+import re
+
+from htmlnode import ParentNode
+from site_io import write_if_changed
+
+SEARCH_DIR = "search"
+INDEX_VERSION = 1
+
+# Leaves holding plain, bold and italic text; code, link text and image alt
+# text are left out of the index
+_TEXT_TAGS = {None, "b", "i"}
+_TERM_RE = re.compile(r"\w+")
+
+def tokenize(text: str):
+    return _TERM_RE.findall(text.lower())
+
+def page_terms(node):
+    # The terms of a rendered tree in document order; a term's position is
+    # its index in this list
+    terms = []
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, ParentNode):
+            stack.extend(reversed(item.children))
+        elif item.tag in _TEXT_TAGS and item.value:
+            terms.extend(tokenize(item.value))
+    return terms
+
+def shard_for(term: str):
+    # One shard per leading character, so a front end loads only the shards
+    # of the terms it looks up
+    first = term[:1]
+    return first if "a" <= first <= "z" or "0" <= first <= "9" else "_"
+
+def page_url(output: str):
+    url = "/" + output.replace(os.sep, "/")
+    return url[:-len("index.html")] if url.endswith("/index.html") else url
+
+def _encode_positions(positions):
+    # Gaps between positions are smaller numbers than the positions
+    previous = 0
+    gaps = []
+    for position in positions:
+        gaps.append(position - previous)
+        previous = position
+    return gaps
+
+def _decode_positions(gaps):
+    position = 0
+    positions = []
+    for gap in gaps:
+        position += gap
+        positions.append(position)
+    return positions
+
+class SearchIndex:
+    # term -> {page id -> positions}, written to public/search/ as pages.json
+    # plus one terms-<shard>.json per leading character. Page ids stay the
+    # same across builds, so an incremental build only replaces the postings
+    # of the pages it re-rendered.
+    def __init__(self):
+        self.pages = {}  # page id -> {"source", "url", "title"}
+        self.postings = {}
+        self._ids = {}  # source -> page id
+        self._page_terms = {}  # page id -> terms it has postings under
+        self._next_id = 0
+
+    def __len__(self):
+        return len(self.pages)
+
+    def add_page(self, source: str, url: str, title: str, terms):
+        self.remove_page(source)
+        page_id = self._next_id
+        self._next_id += 1
+        self._ids[source] = page_id
+        self.pages[page_id] = {"source": source, "url": url, "title": title}
+        positions = {}
+        for position, term in enumerate(terms):
+            positions.setdefault(term, []).append(position)
+        for term, term_positions in positions.items():
+            self.postings.setdefault(term, {})[page_id] = term_positions
+        self._page_terms[page_id] = list(positions)
+        return page_id
+
+    def remove_page(self, source: str):
+        page_id = self._ids.pop(source, None)
+        if page_id is None:
+            return
+        del self.pages[page_id]
+        for term in self._page_terms.pop(page_id):
+            postings = self.postings[term]
+            del postings[page_id]
+            if not postings:
+                del self.postings[term]
+
+    def sources(self):
+        return set(self._ids)
+
+    def shards(self):
+        shards = {}
+        for term, postings in self.postings.items():
+            shards.setdefault(shard_for(term), {})[term] = {
+                str(page_id): _encode_positions(positions) for page_id, positions in postings.items()
+            }
+        return shards
+
+    def write(self, public_dir: str):
+        directory = os.path.join(public_dir, SEARCH_DIR)
+        shards = self.shards()
+        pages = {str(page_id): page for page_id, page in self.pages.items()}
+        written = {}
+        for shard, terms in shards.items():
+            written[f"terms-{shard}.json"] = json.dumps(terms, separators=(",", ":"), sort_keys=True)
+        written["pages.json"] = json.dumps(
+            {"version": INDEX_VERSION, "next_id": self._next_id, "shards": sorted(shards), "pages": pages},
+            separators=(",", ":"),
+            sort_keys=True,
+        )
+        for name, data in written.items():
+            write_if_changed(os.path.join(directory, name), data.encode("utf-8"))
+        for name in os.listdir(directory):
+            if name.startswith("terms-") and name not in written:
+                os.remove(os.path.join(directory, name))
+
+    @classmethod
+    def load(cls, public_dir: str):
+        # None when there is no index, or one in an older format
+        directory = os.path.join(public_dir, SEARCH_DIR)
+        try:
+            with open(os.path.join(directory, "pages.json"), encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("version") != INDEX_VERSION:
+                return None
+            index = cls()
+            for shard in meta["shards"]:
+                with open(os.path.join(directory, f"terms-{shard}.json"), encoding="utf-8") as f:
+                    for term, postings in json.load(f).items():
+                        index.postings[term] = {
+                            int(page_id): _decode_positions(gaps) for page_id, gaps in postings.items()
+                        }
+        except (FileNotFoundError, ValueError, KeyError):
+            return None
+        index._next_id = meta["next_id"]
+        for page_id, page in meta["pages"].items():
+            index.pages[int(page_id)] = page
+            index._ids[page["source"]] = int(page_id)
+            index._page_terms[int(page_id)] = []
+        for term, postings in index.postings.items():
+            for page_id in postings:
+                index._page_terms[page_id].append(term)
+        return index
+
+def _phrase_positions(first_positions, later_postings):
+    # Start positions where the later terms follow the first one in order
+    starts = set(first_positions)
+    for offset, positions in enumerate(later_postings, 1):
+        starts &= {position - offset for position in positions}
+    return starts
+
+def search(search_dir: str, query: str, limit: int = 10, phrase: bool = False):
+    # Reference lookup, reading only the shards the query needs, the way a
+    # front end would. Pages must contain every term; they are ranked by how
+    # often the terms occur. With phrase=True the terms must be adjacent.
+    terms = tokenize(query)
+    if not terms:
+        return []
+    shards = {}
+    postings = []
+    for term in terms:
+        shard = shard_for(term)
+        if shard not in shards:
+            try:
+                with open(os.path.join(search_dir, f"terms-{shard}.json"), encoding="utf-8") as f:
+                    shards[shard] = json.load(f)
+            except FileNotFoundError:
+                return []
+        term_postings = shards[shard].get(term)
+        if term_postings is None:
+            return []
+        postings.append(term_postings)
+
+    page_ids = set(postings[0]).intersection(*postings[1:])
+    scores = {}
+    for page_id in page_ids:
+        if phrase:
+            matches = _phrase_positions(
+                _decode_positions(postings[0][page_id]),
+                [_decode_positions(term_postings[page_id]) for term_postings in postings[1:]],
+            )
+            if matches:
+                scores[page_id] = len(matches)
+        else:
+            scores[page_id] = sum(len(term_postings[page_id]) for term_postings in postings)
+    if not scores:
+        return []
+
+    with open(os.path.join(search_dir, "pages.json"), encoding="utf-8") as f:
+        pages = json.load(f)["pages"]
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], int(item[0])))[:limit]
+    return [(pages[page_id]["url"], pages[page_id]["title"], score) for page_id, score in ranked]
@@ -0,0 +1,214 @@
+import os
+import threading
+import time
+import traceback
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from build import RENDER_CACHE_NAME, _file_digest, build_site, load_manifest, output_path_for
+from pages import extract_title, load_template
+from render_cache import BlockRenderCache
+from site_io import write_if_changed
+
+# Seconds between checks for changes. Polling adds up to this much to the
+# 50 ms save-to-reload budget, so it stays well below it.
+WATCH_INTERVAL = 0.01
+
+# A file modified this recently may be saved again within the same mtime
+# tick, at the same size, so its contents are compared as well
+_RECENT_NS = 2_000_000_000
+
+LIVE_RELOAD_PATH = "/__livereload"
+LIVE_RELOAD_SCRIPT = (
+    f'<script>new EventSource("{LIVE_RELOAD_PATH}").onmessage = () => location.reload();</script>'
+)
+
+def _file_state(path, now):
+    stat = os.stat(path)
+    digest = _file_digest(path) if now - stat.st_mtime_ns < _RECENT_NS else None
+    return stat.st_mtime_ns, stat.st_size, digest
+
+def _same_state(previous, current):
+    # Digests are only compared when both snapshots took one
+    if previous is None or previous[:2] != current[:2]:
+        return False
+    return previous[2] is None or current[2] is None or previous[2] == current[2]
+
+class LiveSite:
+    # Pages are rendered through one BlockRenderCache shared with the builds,
+    # so a save only re-renders the blocks whose markdown actually changed
+    def __init__(self, content_dir: str, template_path: str, public_dir: str, static_dir: str = None):
+        self.content_dir = content_dir
+        self.template_path = template_path
+        self.public_dir = public_dir
+        self.static_dir = static_dir
+        self.version = 0
+        self._changed = threading.Condition()
+        self._template = None
+        self._snapshot = None
+        self._built_pages = set()
+        self._cache = None
+        self._seeded = set()
+
+    def build(self):
+        # Snapshot first, so edits made while building are picked up by watch
+        self._snapshot = self._watched_files()
+        if self._cache is None:
+            self._cache = BlockRenderCache(os.path.join(self.public_dir, RENDER_CACHE_NAME))
+        report = build_site(self.content_dir, self.template_path, self.public_dir, self.static_dir, cache=self._cache)
+        self._template = load_template(self.template_path)
+        self._built_pages = set(load_manifest(self.public_dir).get("pages", {}))
+        self._seeded.update(report.rebuilt)
+        self._seed(report.skipped)
+        return report
+
+    def _seed(self, sources):
+        # Puts the blocks of pages the build skipped into the cache, so the
+        # first save of each renders only what it changed. Blocks the cache
+        # file already holds are not rendered again.
+        misses = self._cache.misses
+        for source in sources:
+            if source in self._seeded:
+                continue
+            with open(os.path.join(self.content_dir, source), encoding="utf-8") as f:
+                self._cache.render_page(f.read())
+            self._seeded.add(source)
+        if self._cache.misses != misses:
+            self._cache.save()
+
+    def render_page(self, source: str):
+        # Returns how many blocks had to be rendered
+        with open(os.path.join(self.content_dir, source), encoding="utf-8") as f:
+            markdown = f.read()
+        misses = self._cache.misses
+        content, _, _ = self._cache.render_page(markdown)
+        html = self._template.render(extract_title(markdown), content)
+        write_if_changed(os.path.join(self.public_dir, output_path_for(source)), html.encode("utf-8"))
+        return self._cache.misses - misses
+
+    def apply_changes(self, paths):
+        content_root = os.path.abspath(self.content_dir)
+        edited_pages = []
+        for path in paths:
+            relative = os.path.relpath(os.path.abspath(path), content_root)
+            if relative in self._built_pages and os.path.exists(path):
+                edited_pages.append(relative)
+        try:
+            if len(edited_pages) == len(paths):
+                for source in edited_pages:
+                    self.render_page(source)
+            else:
+                # New or deleted pages, templates and static files go through
+                # the manifest-driven build, which handles each of them
+                self.build()
+        except Exception:
+            # A half-saved file must not stop the watcher
+            traceback.print_exc()
+            return
+        self.notify()
+
+    def notify(self):
+        with self._changed:
+            self.version += 1
+            self._changed.notify_all()
+
+    def wait_for_change(self, version: int, timeout: float = None):
+        with self._changed:
+            self._changed.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+    def _watched_files(self):
+        # path -> (mtime_ns, size, content digest of recently modified files)
+        now = time.time_ns()
+        snapshot = {}
+        roots = [self.content_dir] + ([self.static_dir] if self.static_dir and os.path.isdir(self.static_dir) else [])
+        for root in roots:
+            for directory, _, names in os.walk(root):
+                for name in names:
+                    path = os.path.join(directory, name)
+                    try:
+                        snapshot[path] = _file_state(path, now)
+                    except FileNotFoundError:
+                        continue
+        snapshot[self.template_path] = _file_state(self.template_path, now)
+        return snapshot
+
+    def watch(self, interval: float = WATCH_INTERVAL, stop: threading.Event = None):
+        # Polls instead of using inotify, which the standard library lacks
+        stop = stop or threading.Event()
+        if self._snapshot is None:
+            self._snapshot = self._watched_files()
+        while not stop.wait(interval):
+            current = self._watched_files()
+            changed = [path for path, state in current.items() if not _same_state(self._snapshot.get(path), state)]
+            changed += [path for path in self._snapshot if path not in current]
+            self._snapshot = current
+            if changed:
+                self.apply_changes(changed)
+
+class LiveReloadHandler(SimpleHTTPRequestHandler):
+    def __init__(self, *args, site: LiveSite = None, **kwargs):
+        self.site = site
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        if self.path == LIVE_RELOAD_PATH:
+            self._stream_reloads()
+            return
+        path = self.translate_path(self.path)
+        if os.path.isdir(path) and self.path.split("?", 1)[0].endswith("/"):
+            path = os.path.join(path, "index.html")
+        if path.endswith(".html") and os.path.isfile(path):
+            self._send_page(path)
+        else:
+            super().do_GET()
+
+    def _send_page(self, path):
+        with open(path, "rb") as f:
+            html = f.read()
+        script = LIVE_RELOAD_SCRIPT.encode("utf-8")
+        index = html.rfind(b"</body>")
+        html = html[:index] + script + html[index:] if index != -1 else html + script
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(html)))
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(html)
+
+    def _stream_reloads(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        version = self.site.version
+        try:
+            while True:
+                latest = self.site.wait_for_change(version, timeout=15)
+                # Comment lines keep idle connections from timing out
+                self.wfile.write(b"data: reload\n\n" if latest != version else b": keepalive\n\n")
+                self.wfile.flush()
+                version = latest
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+def make_server(site: LiveSite, host: str = "127.0.0.1", port: int = 8000):
+    def handler(*args, **kwargs):
+        return LiveReloadHandler(*args, site=site, directory=site.public_dir, **kwargs)
+
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+def serve(content_dir, template_path, public_dir, static_dir=None, host="127.0.0.1", port=8000, watch=False, interval=WATCH_INTERVAL):
+    site = LiveSite(content_dir, template_path, public_dir, static_dir)
+    print(site.build().summary())
+    if watch:
+        threading.Thread(target=site.watch, args=(interval,), daemon=True).start()
+    server = make_server(site, host, port)
+    print(f"Serving {public_dir} at http://{host}:{server.server_address[1]}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,212 @@
+import os
+import tempfile
+import unittest
+
+from build import MANIFEST_NAME, RENDER_CACHE_NAME, build_site, extract_title
+from search import search
+
+TEMPLATE = "<html><title>{{ Title }}</title><body>{{ Content }}</body></html>"
+
+class TestBuildSite(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        self.content = os.path.join(self.root, "content")
+        self.static = os.path.join(self.root, "static")
+        self.public = os.path.join(self.root, "public")
+        self.template = os.path.join(self.root, "template.html")
+        self.write(self.template, TEMPLATE)
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome to the **site**.")
+        self.write(os.path.join(self.content, "blog", "first.md"), "# First post\n\nHello.")
+        self.write(os.path.join(self.static, "styles.css"), "body { color: black; }")
+
+    def write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def read(self, *parts):
+        with open(os.path.join(self.public, *parts), encoding="utf-8") as f:
+            return f.read()
+
+    def build(self, **kwargs):
+        return build_site(self.content, self.template, self.public, self.static, **kwargs)
+
+    def test_first_build_renders_everything(self):
+        report = self.build()
+        self.assertEqual(sorted(report.rebuilt), ["blog/first.md", "index.md"])
+        self.assertEqual(report.copied, ["styles.css"])
+        self.assertEqual(
+            self.read("index.html"),
+            "<html><title>Home</title><body><div><h1>Home</h1><p>Welcome to the <b>site</b>.</p></div></body></html>",
+        )
+        self.assertEqual(self.read("blog", "first.html").count("First post"), 2)
+        self.assertEqual(self.read("styles.css"), "body { color: black; }")
+        self.assertTrue(os.path.exists(os.path.join(self.public, MANIFEST_NAME)))
+
+    def test_no_op_build_skips_everything(self):
+        self.build()
+        report = self.build()
+        self.assertEqual(report.rebuilt, [])
+        self.assertEqual(sorted(report.skipped), ["blog/first.md", "index.md"])
+        self.assertEqual(report.copied, [])
+
+    def test_only_changed_page_is_rebuilt(self):
+        self.build()
+        self.write(os.path.join(self.content, "blog", "first.md"), "# First post\n\nEdited.")
+        report = self.build()
+        self.assertEqual(report.rebuilt, ["blog/first.md"])
+        self.assertEqual(report.skipped, ["index.md"])
+        self.assertIn("Edited.", self.read("blog", "first.html"))
+
+    def test_touch_without_edit_is_skipped(self):
+        self.build()
+        path = os.path.join(self.content, "index.md")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertEqual(self.build().rebuilt, [])
+
+    def test_template_change_rebuilds_all_pages(self):
+        self.build()
+        self.write(self.template, "<main>{{ Content }}</main>")
+        report = self.build()
+        self.assertEqual(sorted(report.rebuilt), ["blog/first.md", "index.md"])
+        self.assertTrue(self.read("index.html").startswith("<main>"))
+
+    def test_changed_static_file_is_copied(self):
+        self.build()
+        self.write(os.path.join(self.static, "styles.css"), "body { color: red; }")
+        report = self.build()
+        self.assertEqual(report.copied, ["styles.css"])
+        self.assertEqual(report.rebuilt, [])
+        self.assertEqual(self.read("styles.css"), "body { color: red; }")
+
+    def test_removed_sources_delete_their_outputs(self):
+        self.write(os.path.join(self.public, "untracked.html"), "keep me")
+        self.build()
+        os.remove(os.path.join(self.content, "blog", "first.md"))
+        os.remove(os.path.join(self.static, "styles.css"))
+        report = self.build()
+        self.assertEqual(sorted(report.deleted), ["blog/first.md", "styles.css"])
+        self.assertFalse(os.path.exists(os.path.join(self.public, "blog")))
+        self.assertFalse(os.path.exists(os.path.join(self.public, "styles.css")))
+        self.assertEqual(self.read("untracked.html"), "keep me")
+
+    def test_deleted_output_is_rebuilt(self):
+        self.build()
+        os.remove(os.path.join(self.public, "index.html"))
+        self.assertEqual(self.build().rebuilt, ["index.md"])
+
+    def test_force_rebuilds_everything(self):
+        self.build()
+        self.assertEqual(len(self.build(force=True).rebuilt), 2)
+
+    def test_identical_outputs_keep_their_mtime(self):
+        self.build()
+        output = os.path.join(self.public, "index.html")
+        os.utime(output, ns=(0, 0))
+        report = self.build(force=True)
+        self.assertEqual(sorted(report.unchanged), ["blog/first.md", "index.md"])
+        self.assertEqual(os.stat(output).st_mtime_ns, 0)
+
+    def test_parallel_build_matches_serial_build(self):
+        for i in range(12):
+            self.write(os.path.join(self.content, "docs", f"page-{i}.md"), f"# Page {i}\n\n- item **{i}**")
+        self.build()
+        serial = {name: self.read(*name.split("/")) for name in ("index.html", "docs/page-3.html", "docs/page-11.html")}
+
+        report = self.build(force=True, jobs=3)
+        self.assertEqual(len(report.rebuilt), 14)
+        for name, html in serial.items():
+            self.assertEqual(self.read(*name.split("/")), html)
+
+    def test_interning_build_matches_plain_build(self):
+        for i in range(6):
+            self.write(os.path.join(self.content, "docs", f"page-{i}.md"), f"# Page {i}\n\n[Home](/) and ![logo](/logo.png) **{i}**")
+        self.build()
+        plain = {name: self.read(*name.split("/")) for name in ("index.html", "docs/page-0.html", "docs/page-5.html")}
+        for jobs in (1, 2):
+            with self.subTest(jobs=jobs):
+                self.build(force=True, jobs=jobs, intern=True)
+                for name, html in plain.items():
+                    self.assertEqual(self.read(*name.split("/")), html)
+
+    def test_rebuilt_pages_reuse_cached_blocks(self):
+        body = "\n\n".join(f"Paragraph {i} with a [link](/blog/first.html) and _words_." for i in range(5))
+        self.write(os.path.join(self.content, "index.md"), f"# Home\n\n{body}")
+        report = self.build(search=True)
+        self.assertEqual((report.cache_hits, report.cache_misses), (0, 8))
+
+        self.write(os.path.join(self.content, "index.md"), f"# Home\n\n{body}\n\nOne more paragraph.")
+        report = self.build(search=True)
+        self.assertEqual(report.rebuilt, ["index.md"])
+        self.assertEqual((report.cache_hits, report.cache_misses), (6, 1))
+        self.assertEqual(report.cache_hit_rate, 6 / 7)
+        self.assertIn("6 of 7 blocks", report.cache_summary())
+        self.assertEqual(report.links.orphans, [])
+        self.assertEqual(search(os.path.join(self.public, "search"), "one more", phrase=True), [("/", "Home", 1)])
+
+        cached = self.read("index.html")
+        os.remove(os.path.join(self.public, RENDER_CACHE_NAME))
+        report = self.build(force=True)
+        self.assertEqual(report.cache_hits, 0)
+        self.assertEqual(self.read("index.html"), cached)
+
+    def test_large_cache_is_skipped_for_small_rebuilds(self):
+        self.build()
+        with open(os.path.join(self.public, RENDER_CACHE_NAME), "w", encoding="utf-8") as f:
+            f.write(" " * 100_000 + "{}")
+        self.write(os.path.join(self.content, "blog", "first.md"), "# First post\n\nEdited.")
+        report = self.build()
+        self.assertEqual(report.rebuilt, ["blog/first.md"])
+        self.assertEqual((report.cache_hits, report.cache_misses), (0, 0))
+        self.assertIn("Edited.", self.read("blog", "first.html"))
+
+    def test_reports_broken_links_and_orphans(self):
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\n[Post](/blog/first.html) ![css](/styles.css)")
+        self.write(os.path.join(self.content, "about.md"), "# About\n\n[Gone](/blog/second.html)")
+        report = self.build()
+        self.assertEqual(report.links.broken, [("about.md", "/blog/second.html")])
+        self.assertEqual(report.links.orphans, ["about.md"])
+
+        # Skipped pages keep their links through the manifest
+        self.write(os.path.join(self.content, "blog", "second.md"), "# Second\n\n[About](/about.html)")
+        report = self.build()
+        self.assertEqual(report.rebuilt, ["blog/second.md"])
+        self.assertEqual(report.links.broken, [])
+        self.assertEqual(report.links.orphans, [])
+
+    def test_search_index_follows_incremental_builds(self):
+        search_dir = os.path.join(self.public, "search")
+        self.build(search=True)
+        self.assertEqual(search(search_dir, "welcome"), [("/", "Home", 1)])
+        self.assertEqual(search(search_dir, "hello"), [("/blog/first.html", "First post", 1)])
+
+        self.write(os.path.join(self.content, "blog", "first.md"), "# First post\n\nWelcome back.")
+        os.remove(os.path.join(self.content, "index.md"))
+        report = self.build(search=True)
+        self.assertEqual(report.rebuilt, ["blog/first.md"])
+        self.assertEqual(search(search_dir, "welcome"), [("/blog/first.html", "First post", 1)])
+        self.assertEqual(search(search_dir, "hello"), [])
+
+        # A build without the index would leave it stale, so it is removed
+        self.build()
+        self.assertFalse(os.path.exists(search_dir))
+        self.assertEqual(len(self.build(search=True).rebuilt), 1)
+        self.assertEqual(search(search_dir, "back"), [("/blog/first.html", "First post", 1)])
+
+    def test_missing_content_directory(self):
+        self.build()
+        with self.assertRaises(FileNotFoundError):
+            build_site(os.path.join(self.root, "missing"), self.template, self.public)
+        self.assertTrue(os.path.exists(os.path.join(self.public, "index.html")))
+
+class TestExtractTitle(unittest.TestCase):
+    def test_extract_title(self):
+        self.assertEqual(extract_title("Intro\n# Hello  \n## Sub"), "Hello")
+        with self.assertRaises(ValueError):
+            extract_title("## Only a subheading")
+
+if __name__ == "__main__":
+    unittest.main()
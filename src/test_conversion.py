@@ -1,16 +1,33 @@
+import importlib.util
+import io
+import os
+import random
+import re
+import tempfile
+import time
+import tracemalloc
 import unittest
 from textnode import TextNode, TextType
-from htmlnode import LeafNode
+from htmlnode import LeafNode, ParentNode
 from conversion import (
     BlockType,
+    InlineGrammar,
+    LeafNodeInterner,
     block_to_block_type,
+    block_to_html_node,
+    blocks_to_block_types,
     extract_markdown_images, 
     extract_markdown_links, 
+    iter_block_spans,
+    iter_markdown_blocks,
+    load_regex_engine,
     markdown_to_blocks,
+    markdown_to_html_node,
     text_node_to_html_node, 
     split_nodes_delimiter,
     split_nodes_images,
     split_nodes_links,
+    stream_markdown_to_html,
     text_to_text_nodes
 )
 
@@ -72,6 +89,58 @@ class TestHTMLNodeConversion(unittest.TestCase):
         with self.assertRaises(Exception):
             text_node_to_html_node(text_node_wrong)
 
+class TestLeafNodeInterner(unittest.TestCase):
+    def test_reuses_nodes_for_identical_text_nodes(self):
+        interner = LeafNodeInterner()
+        first = interner(TextNode("Home", TextType.LINKS, "/"))
+        second = interner(TextNode("Home", TextType.LINKS, "/"))
+        self.assertIs(first, second)
+        self.assertEqual(first, text_node_to_html_node(TextNode("Home", TextType.LINKS, "/")))
+        self.assertIsNot(first, interner(TextNode("Home", TextType.LINKS, "/index.html")))
+        self.assertIsNot(first, interner(TextNode("Home", TextType.TEXT)))
+
+    def test_shared_nodes_are_read_only(self):
+        node = LeafNodeInterner()(TextNode("Home", TextType.LINKS, "/"))
+        with self.assertRaises(TypeError):
+            node.props["href"] = "/elsewhere"
+        for name, value in (("value", "Away"), ("tag", "b"), ("props", {"href": "/x"})):
+            with self.subTest(name=name), self.assertRaises(AttributeError):
+                setattr(node, name, value)
+        self.assertEqual(node.to_html(), '<a href="/">Home</a>')
+        self.assertEqual(ParentNode("p", [node, LeafNode(None, "!")]).to_html(), '<p><a href="/">Home</a>!</p>')
+
+    def test_counts_hits_and_misses(self):
+        interner = LeafNodeInterner()
+        for _ in range(3):
+            interner(TextNode("badge", TextType.IMAGES, "/badge.svg"))
+        info = interner.cache_info()
+        self.assertEqual((info.hits, info.misses), (2, 1))
+        self.assertAlmostEqual(interner.hit_rate, 2 / 3)
+        interner.clear()
+        self.assertEqual(interner.hit_rate, 0.0)
+
+    def test_size_is_bounded(self):
+        interner = LeafNodeInterner(maxsize=2)
+        nodes = [TextNode(f"word {i}", TextType.BOLD) for i in range(3)]
+        first = interner(nodes[0])
+        interner(nodes[1])
+        interner(nodes[2])
+        self.assertEqual(interner.cache_info().currsize, 2)
+        self.assertIsNot(interner(nodes[0]), first)
+
+    def test_invalid_text_type_raises(self):
+        with self.assertRaises(Exception):
+            LeafNodeInterner()(TextNode("Hello, world!", "wrong"))
+
+    def test_pages_rendered_with_interning(self):
+        interner = LeafNodeInterner()
+        page = "# [Home](/) ![badge](/b.svg)\n\n- [Home](/)\n- **new**\n\n> `code` and _words_\n\n[Home](/) again"
+        interned = markdown_to_html_node(page, leaf_factory=interner)
+        self.assertEqual(interned.to_html(), markdown_to_html_node(page).to_html())
+        # The heading's link and the list item's link are the same node
+        self.assertIs(interned.children[0].children[0], interned.children[1].children[0].children[0])
+        self.assertGreater(interner.hit_rate, 0)
+
 class TestNodeSplitting(unittest.TestCase):
     def test_split_nodes_bold_delimiter(self):
         old_nodes = [
@@ -168,6 +237,19 @@ class TestSplitNodeImages(unittest.TestCase):
             new_nodes,
         )
 
+    def test_split_nodes_images_keeps_surrounding_text(self):
+        node = TextNode("![a](1.png)![b](2.png) tail", TextType.TEXT)
+        new_nodes = split_nodes_images([node, TextNode("bold", TextType.BOLD)])
+        self.assertListEqual(
+            [
+                TextNode("a", TextType.IMAGES, "1.png"),
+                TextNode("b", TextType.IMAGES, "2.png"),
+                TextNode(" tail", TextType.TEXT),
+                TextNode("bold", TextType.BOLD),
+            ],
+            new_nodes,
+        )
+
 class TestSplitNodesLinks(unittest.TestCase):
     def test_split_nodes_links(self):
         node = TextNode(
@@ -185,6 +267,24 @@ class TestSplitNodesLinks(unittest.TestCase):
             new_nodes,
         )
 
+    def test_split_nodes_links_same_markdown_earlier_in_image(self):
+        node = TextNode("![docs](a.html) see [docs](a.html)", TextType.TEXT)
+        new_nodes = split_nodes_links([node])
+        self.assertListEqual(
+            [
+                TextNode("![docs](a.html) see ", TextType.TEXT),
+                TextNode("docs", TextType.LINKS, "a.html"),
+            ],
+            new_nodes,
+        )
+
+    def test_split_nodes_links_many_links(self):
+        text = " | ".join(f"[v{i}](https://example.com/v{i})" for i in range(1000))
+        new_nodes = split_nodes_links([TextNode(text, TextType.TEXT)])
+        self.assertEqual(len(new_nodes), 1999)
+        self.assertEqual(new_nodes[-1], TextNode("v999", TextType.LINKS, "https://example.com/v999"))
+        self.assertEqual(new_nodes[1], TextNode(" | ", TextType.TEXT))
+
 class TestTextToNodes(unittest.TestCase):
     def test_text_to_text_nodes(self):
         text = "This is **bold** text with _italic_ and `code`."
@@ -211,6 +311,121 @@ class TestTextToNodes(unittest.TestCase):
         self.assertEqual(nodes[6], TextNode("link", TextType.LINKS, "https://example.com"))
         self.assertEqual(nodes[7], TextNode(".", TextType.TEXT))
 
+def split_in_passes(text):
+    # The original five-pass pipeline, kept here as the parity reference
+    nodes = [TextNode(text, TextType.TEXT)]
+    nodes = split_nodes_images(nodes)
+    nodes = split_nodes_links(nodes)
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    return nodes
+
+class TestNoMarkupShortcut(unittest.TestCase):
+    # text_to_text_nodes returns text without "[", "*", "_" or "`" as one
+    # node; anything else must still get exactly what the split passes give
+    def assertMatchesSplitPasses(self, text):
+        try:
+            expected = split_in_passes(text)
+        except ValueError as e:
+            with self.assertRaises(ValueError) as raised:
+                text_to_text_nodes(text)
+            self.assertEqual(str(raised.exception), str(e))
+            return
+        self.assertListEqual(text_to_text_nodes(text), expected, repr(text))
+
+    def test_known_cases(self):
+        cases = [
+            "",
+            "plain text",
+            "no markup: a ! (b) ] c",
+            "**bold** and _italic_ and `code`",
+            "****",
+            "***a***",
+            "**a _b_ c**",
+            "_a `b` c_",
+            "**[link](https://example.com)**",
+            "![image](a.png)[link](b.html)",
+            "!![image](a.png)",
+            "![[a](b)",
+            "[a](b![c)](d)",
+            "`a_b`",
+            "_a**b**c_",
+            "_a**b",
+            "trailing **",
+        ]
+        for text in cases:
+            with self.subTest(text=text):
+                self.assertMatchesSplitPasses(text)
+
+    def test_random_markup(self):
+        rng = random.Random(1234)
+        alphabet = list("ab !![]()*_` ") + ["**", "![", "](", "[x](y)", "![i](u)"]
+        for _ in range(5000):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+            self.assertMatchesSplitPasses(text)
+
+def best_time(func, *args):
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+class TestInlineGrammar(unittest.TestCase):
+    def test_links_match_the_lookbehind_pattern(self):
+        # The pattern the link check replaced
+        lookbehind = re.compile(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)")
+        rng = random.Random(4321)
+        alphabet = list("ab!![]()") + ["![", "](", "[x](y)", "![i](u)"]
+        for _ in range(5000):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+            self.assertEqual(extract_markdown_links(text), lookbehind.findall(text), repr(text))
+
+    def test_adversarial_inputs_scale_linearly(self):
+        def parse(text):
+            try:
+                return text_to_text_nodes(text)
+            except ValueError:
+                return None
+
+        shapes = ["[", "(", "![", "[a](", "[a]", "](", "!", "[](", "![a](b[", "![a](b)", "**["]
+        for shape in shapes:
+            with self.subTest(shape=shape):
+                small = shape * 5_000
+                large = shape * 20_000
+                for func in (extract_markdown_links, extract_markdown_images, parse):
+                    # Quadratic work would be 16 times slower
+                    self.assertLess(best_time(func, large), 8 * best_time(func, small) + 0.01)
+
+    def test_unclosed_bracket_runs_scale_linearly(self):
+        small = "[" + "a" * 50_000 + "[" * 20_000
+        large = "[" + "a" * 200_000 + "[" * 80_000
+        self.assertEqual(text_to_text_nodes(large), [TextNode(large, TextType.TEXT)])
+        self.assertLess(best_time(text_to_text_nodes, large), 8 * best_time(text_to_text_nodes, small) + 0.01)
+
+    def test_load_regex_engine(self):
+        self.assertIs(load_regex_engine("re"), re)
+        self.assertTrue(hasattr(load_regex_engine("auto"), "compile"))
+        with self.assertRaises(ValueError):
+            load_regex_engine("pcre")
+
+    @unittest.skipIf(importlib.util.find_spec("regex") is not None, "regex is installed")
+    def test_missing_engine_raises(self):
+        with self.assertRaises(ImportError):
+            load_regex_engine("regex")
+
+    def test_engines_agree(self):
+        engines = [name for name in ("re", "regex", "re2") if importlib.util.find_spec(name)]
+        text = "![img](a.png) [link](b) !x [c](d) **[e](f)**"
+        expected = [match.groups() for match in InlineGrammar(re).iter_links(text)]
+        for name in engines:
+            with self.subTest(engine=name):
+                grammar = InlineGrammar(load_regex_engine(name))
+                self.assertEqual([match.groups() for match in grammar.iter_links(text)], expected)
+                self.assertEqual([match.groups() for match in grammar.iter_images(text)], [("img", "a.png")])
+
 class TestMarkdownToBlocks(unittest.TestCase):
     def test_markdown_to_blocks(self):
         markdown = """
@@ -246,6 +461,96 @@ This is the same paragraph on a new line
             ],
         )
 
+class TestIterMarkdownBlocks(unittest.TestCase):
+    markdown = "# Title\n\n\n\nFirst paragraph\nsecond line\n\n  \n\n- item\n- item\n"
+
+    def write_markdown(self, text):
+        fd, path = tempfile.mkstemp(suffix=".md")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_matches_split_on_blank_lines(self):
+        rng = random.Random(99)
+        pieces = ["a", "b", " ", "\t", "\n", "\n\n"]
+        for _ in range(2000):
+            text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 20)))
+            expected = [p.strip() for p in text.split("\n\n") if p.strip()]
+            self.assertEqual(markdown_to_blocks(text), expected, repr(text))
+
+    def test_reads_file_handle(self):
+        path = self.write_markdown(self.markdown)
+        with open(path, encoding="utf-8") as f:
+            blocks = list(iter_markdown_blocks(f))
+        self.assertEqual(blocks, ["# Title", "First paragraph\nsecond line", "- item\n- item"])
+
+    def test_reads_through_mmap(self):
+        path = self.write_markdown(self.markdown + "Ünïcode ✓")
+        with open(path, "rb") as f:
+            blocks = list(iter_markdown_blocks(f, use_mmap=True))
+        self.assertEqual(blocks, markdown_to_blocks(self.markdown + "Ünïcode ✓"))
+
+    def test_mmap_empty_file(self):
+        path = self.write_markdown("")
+        with open(path, "rb") as f:
+            self.assertEqual(list(iter_markdown_blocks(f, use_mmap=True)), [])
+
+    def test_mmap_crlf_file(self):
+        path = self.write_markdown("")
+        with open(path, "wb") as f:
+            f.write(b"# T\r\n\r\npara one\r\n\r\n- a\r\n- b\r\n\rold mac\rline")
+        with open(path, encoding="utf-8") as f:
+            expected = list(iter_markdown_blocks(f))
+        self.assertEqual(expected, ["# T", "para one", "- a\n- b", "old mac\nline"])
+        with open(path, "rb") as f:
+            self.assertEqual(list(iter_markdown_blocks(f, use_mmap=True)), expected)
+
+    def test_yields_blocks_lazily(self):
+        consumed = []
+
+        def lines():
+            for line in ["first\n", "\n", "second\n", "\n", "third\n"]:
+                consumed.append(line)
+                yield line
+
+        blocks = iter_markdown_blocks(lines())
+        self.assertEqual(next(blocks), "first")
+        self.assertEqual(consumed, ["first\n", "\n"])
+
+    def test_keeps_fenced_code_whole(self):
+        md = "Intro\n\n```\nfirst()\n\n\nsecond()\n```\n\nOutro"
+        self.assertEqual(markdown_to_blocks(md), ["Intro", "```\nfirst()\n\n\nsecond()\n```", "Outro"])
+
+    def test_fence_must_open_a_block(self):
+        md = "text\n```\na\n\nb\n```"
+        self.assertEqual(markdown_to_blocks(md), ["text\n```\na", "b\n```"])
+
+    def test_one_line_fence(self):
+        self.assertEqual(markdown_to_blocks("```a```\n\nb"), ["```a```", "b"])
+
+    def test_unclosed_fence_splits_on_blank_lines(self):
+        md = "```\na\n\nb\n\n\nc"
+        self.assertEqual(markdown_to_blocks(md), ["```\na", "b", "c"])
+
+    def test_fence_through_mmap(self):
+        md = "```\nline one\n\nline two\n```\n\n# Title\n"
+        path = self.write_markdown(md)
+        with open(path, "rb") as f:
+            self.assertEqual(list(iter_markdown_blocks(f, use_mmap=True)), markdown_to_blocks(md))
+
+    def test_block_spans_match_blocks(self):
+        rng = random.Random(31)
+        pieces = ["a", "b", " ", "\n", "\n\n", "```", "```\n", "x```"]
+        for _ in range(3000):
+            text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 25)))
+            spans = list(iter_block_spans(text))
+            self.assertEqual([text[start:end].strip() for start, end, _ in spans], markdown_to_blocks(text), repr(text))
+
+    def test_block_spans_after_unclosed_fence(self):
+        text = "a\n\n```\nb\n\nc"
+        self.assertEqual(list(iter_block_spans(text)), [(0, 2, False), (3, 9, True), (10, 11, True)])
+
 class TestBlockToBlockType(unittest.TestCase):
     def test_block_to_block_type(self):
         md = """
@@ -278,5 +583,179 @@ def hello_world():
             ],
         )
 
+    def test_block_to_block_type_edge_cases(self):
+        cases = {
+            "": BlockType.PARAGRAPH,
+            "# h1": BlockType.HEADING,
+            "###### h6": BlockType.HEADING,
+            "####### seven": BlockType.PARAGRAPH,
+            "#no space": BlockType.PARAGRAPH,
+            ">no space": BlockType.PARAGRAPH,
+            "* star item": BlockType.UNORDERED_LIST,
+            "-dash": BlockType.PARAGRAPH,
+            "12. twelfth": BlockType.ORDERED_LIST,
+            "12) twelfth": BlockType.PARAGRAPH,
+            "\u0661. arabic-indic digit": BlockType.ORDERED_LIST,
+            "```": BlockType.CODE,
+            "```\nunterminated": BlockType.PARAGRAPH,
+            "plain ```code```": BlockType.PARAGRAPH,
+        }
+        for block, expected in cases.items():
+            with self.subTest(block=block):
+                self.assertEqual(block_to_block_type(block), expected)
+
+    def test_blocks_to_block_types(self):
+        blocks = ["# Title", "text", "> quote", "- a", "1. a", "```\ncode\n```", ""]
+        self.assertEqual(
+            blocks_to_block_types(blocks),
+            [block_to_block_type(block) for block in blocks],
+        )
+        self.assertEqual(blocks_to_block_types([]), [])
+
+class TestMarkdownToHTMLNode(unittest.TestCase):
+    def test_paragraphs(self):
+        md = """
+This is **bolded** paragraph
+text in a p
+tag here
+
+This is another paragraph with _italic_ text and `code` here
+
+"""
+        self.assertEqual(
+            markdown_to_html_node(md).to_html(),
+            "<div><p>This is <b>bolded</b> paragraph text in a p tag here</p>"
+            "<p>This is another paragraph with <i>italic</i> text and <code>code</code> here</p></div>",
+        )
+
+    def test_headings_quotes_and_lists(self):
+        md = """
+### Third level
+
+> A quote with a [link](/about)
+> over two lines
+
+- first
+- second with **bold**
+
+1. one
+2. two
+"""
+        self.assertEqual(
+            markdown_to_html_node(md).to_html(),
+            "<div><h3>Third level</h3>"
+            '<blockquote>A quote with a <a href="/about">link</a> over two lines</blockquote>'
+            "<ul><li>first</li><li>second with <b>bold</b></li></ul>"
+            "<ol><li>one</li><li>two</li></ol></div>",
+        )
+
+    def test_code_block(self):
+        block = "``` python\ndef hello():\n    print(\"hi\")\n```"
+        self.assertEqual(
+            block_to_html_node(block).to_html(),
+            '<pre><code>def hello():\n    print("hi")\n</code></pre>',
+        )
+
+    def test_code_block_is_escaped_and_not_parsed(self):
+        block = "```\nif a < b && c > d:\n    x = **y** + _z_ + `w` + [l](u)\n```"
+        self.assertEqual(
+            block_to_html_node(block).to_html(),
+            "<pre><code>if a &lt; b &amp;&amp; c &gt; d:\n    x = **y** + _z_ + `w` + [l](u)\n</code></pre>",
+        )
+
+    def test_code_block_with_blank_lines(self):
+        md = "# API\n\n```\nGET /items\n\n\nsnake_case_name = 1\n```"
+        self.assertEqual(
+            markdown_to_html_node(md).to_html(),
+            "<div><h1>API</h1><pre><code>GET /items\n\n\nsnake_case_name = 1\n</code></pre></div>",
+        )
+
+    def test_empty_markup_and_document(self):
+        self.assertEqual(block_to_html_node("****").to_html(), "<p></p>")
+        self.assertEqual(markdown_to_html_node("").to_html(), "<div></div>")
+
+class TestStreamMarkdownToHTML(unittest.TestCase):
+    def stream(self, markdown, **kwargs):
+        out = io.StringIO()
+        stream_markdown_to_html(io.StringIO(markdown), out, **kwargs)
+        return out.getvalue()
+
+    def test_matches_markdown_to_html_node(self):
+        for markdown in [
+            "",
+            "# Title\n\nSome **bold** & <b> text.\n\n- a\n- b",
+            "```\nx < y\n\n\nz\n```\n\n> quote",
+            "\n\n\n1. one\n2. two\n\n",
+        ]:
+            self.assertEqual(self.stream(markdown), markdown_to_html_node(markdown).to_html())
+
+    def test_large_fence_is_streamed(self):
+        code = "".join(f"line {i} <tag>\n" for i in range(200))
+        markdown = f"# Big\n\n```\n{code}```\n\nAfter."
+        self.assertEqual(self.stream(markdown, max_block_size=100), markdown_to_html_node(markdown).to_html())
+
+    def test_large_unclosed_fence_runs_to_the_end(self):
+        markdown = "```\n" + "x\n" * 100 + "\nmore"
+        self.assertEqual(self.stream(markdown, max_block_size=50), "<div><pre><code>" + "x\n" * 100 + "\nmore</code></pre></div>")
+
+    def test_text_right_after_a_streamed_fence_raises(self):
+        # Held whole, this is one paragraph; streamed, the fence has already
+        # been written as code
+        with self.assertRaises(ValueError):
+            self.stream("```\nb\n\n```  \nb", max_block_size=5)
+        for markdown in ("```\nb\n\n```  \n\nb", "```\nb\n\n```  "):
+            self.assertEqual(self.stream(markdown, max_block_size=5), markdown_to_html_node(markdown).to_html())
+
+    def test_large_paragraph_raises(self):
+        with self.assertRaises(ValueError):
+            self.stream("# T\n\n" + "word " * 100, max_block_size=100)
+
+    def test_mmap_input(self):
+        markdown = "# T\n\n```\ncode\n```\n\ntext _here_"
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "page.md")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(markdown)
+            out = io.StringIO()
+            with open(path, "rb") as f:
+                stream_markdown_to_html(f, out, use_mmap=True)
+        self.assertEqual(out.getvalue(), markdown_to_html_node(markdown).to_html())
+
+    def test_mmap_crlf_input(self):
+        markdown = "# T\n\n```\ncode\n```\n\n- a\n- b"
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "page.md")
+            with open(path, "w", encoding="utf-8", newline="\r\n") as f:
+                f.write(markdown)
+            out = io.StringIO()
+            with open(path, "rb") as f:
+                stream_markdown_to_html(f, out, use_mmap=True)
+        self.assertEqual(out.getvalue(), markdown_to_html_node(markdown).to_html())
+
+    def test_memory_does_not_grow_with_the_document(self):
+        def peak(paragraphs):
+            lines = (line for i in range(paragraphs) for line in (f"Paragraph {i} with **bold** text.\n", "\n"))
+            tracemalloc.start()
+            try:
+                stream_markdown_to_html(lines, _NullWriter())
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        # The first run pays for compiling the inline grammar, so it is not
+        # measured
+        peak(100)
+        small = peak(2_000)
+        self.assertLess(peak(20_000), small * 2)
+
+class _NullWriter:
+    def write(self, text):
+        pass
+
+    def writelines(self, texts):
+        # Drains the chunks, so the HTML is still generated
+        for _ in texts:
+            pass
+
 if __name__ == "__main__":
     unittest.main()
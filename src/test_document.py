@@ -0,0 +1,106 @@
+import random
+import unittest
+from unittest import mock
+
+import document
+from conversion import markdown_to_blocks, markdown_to_html_node
+from document import Document
+
+MARKDOWN = "# Title\n\nFirst **paragraph**.\n\n- one\n- two\n\n> quote\n\nLast paragraph."
+
+class TestDocument(unittest.TestCase):
+    def assertMatchesFullParse(self, doc):
+        self.assertEqual(doc.to_html(), markdown_to_html_node(doc.text).to_html())
+        blocks = doc.blocks
+        self.assertEqual([block.source for block in blocks], markdown_to_blocks(doc.text))
+        for block in blocks:
+            self.assertEqual(doc.text[block.start:block.start + block.length].strip(), block.source)
+
+    def test_parses_like_markdown_to_html_node(self):
+        self.assertMatchesFullParse(Document(MARKDOWN))
+        self.assertEqual(Document("").to_html(), "<div></div>")
+
+    def test_edit_inside_a_block_reparses_only_that_block(self):
+        doc = Document(MARKDOWN)
+        before = [block.html_node for block in doc.blocks]
+        offset = doc.text.index("First")
+        parsed = doc.apply_edit(offset, len("First"), "Second")
+        self.assertEqual([block.source for block in parsed], ["Second **paragraph**."])
+        after = [block.html_node for block in doc.blocks]
+        for index in (0, 2, 3, 4):
+            self.assertIs(after[index], before[index])
+        self.assertMatchesFullParse(doc)
+
+    def test_edits_that_merge_and_split_blocks(self):
+        doc = Document(MARKDOWN)
+        doc.apply_edit(doc.text.index("\n\n- one"), 2, "\n")
+        self.assertEqual(len(doc.blocks), 4)
+        self.assertMatchesFullParse(doc)
+        doc.apply_edit(doc.text.index("- two"), 0, "\n")
+        self.assertMatchesFullParse(doc)
+
+    def test_blank_lines_inside_a_fence(self):
+        doc = Document("Intro\n\n```\nfirst()\n```\n\nOutro")
+        parsed = doc.apply_edit(doc.text.index("first()") + 7, 0, "\n\n\nsecond()")
+        self.assertEqual([block.source for block in parsed], ["```\nfirst()\n\n\nsecond()\n```"])
+        self.assertMatchesFullParse(doc)
+
+    def test_fence_opened_by_an_edit(self):
+        doc = Document("Intro\n\nlet x\n\nlet y\n\n```\n\nOutro")
+        doc.apply_edit(doc.text.index("let x"), 0, "```\n")
+        self.assertEqual(len(doc.blocks), 3)
+        self.assertEqual(doc.blocks[1].source, "```\nlet x\n\nlet y\n\n```")
+        self.assertMatchesFullParse(doc)
+
+    def test_invalid_markup_leaves_document_unchanged(self):
+        doc = Document(MARKDOWN)
+        with self.assertRaises(ValueError):
+            doc.apply_edit(doc.text.index("Last"), 0, "**")
+        self.assertEqual(doc.text, MARKDOWN)
+        self.assertMatchesFullParse(doc)
+
+    def test_edit_outside_document(self):
+        doc = Document("text")
+        with self.assertRaises(ValueError):
+            doc.apply_edit(3, 5, "")
+        with self.assertRaises(ValueError):
+            doc.apply_edit(-1, 0, "")
+
+    def random_edits(self, seed, documents, size, edits):
+        rng = random.Random(seed)
+        pieces = ["a", "b ", "# h", "- i", "1. x", "> q", " ", "\n", "\n\n", "```", "```\n", "**b**", "[l](u)"]
+        for _ in range(documents):
+            try:
+                doc = Document("".join(rng.choice(pieces) for _ in range(rng.randint(0, size))))
+            except ValueError:
+                continue
+            for _ in range(edits):
+                offset = rng.randint(0, len(doc.text))
+                old_len = rng.randint(0, min(5, len(doc.text) - offset))
+                try:
+                    doc.apply_edit(offset, old_len, "".join(rng.choice(pieces) for _ in range(rng.randint(0, 3))))
+                except ValueError:
+                    pass
+            self.assertMatchesFullParse(doc)
+
+    def test_random_edits(self):
+        self.random_edits(2024, 300, 30, 20)
+
+    def test_random_edits_across_chunks(self):
+        # Tiny chunks, so edits split, merge and shift many of them
+        with mock.patch.object(document, "_CHUNK_BLOCKS", 3):
+            self.random_edits(7, 60, 120, 60)
+
+    def test_edits_at_both_ends(self):
+        markdown = "\n\n".join(f"Paragraph {i}" for i in range(1000))
+        doc = Document(markdown)
+        for i in range(20):
+            if i % 2:
+                doc.apply_edit(len(doc), 0, "\n\nx")
+            else:
+                doc.apply_edit(0, 0, "x")
+        self.assertEqual(doc.text, "x" * 10 + markdown + "\n\nx" * 10)
+        self.assertMatchesFullParse(doc)
+
+if __name__ == "__main__":
+    unittest.main()
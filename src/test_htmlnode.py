@@ -1,3 +1,4 @@
+import io
 import unittest
 from htmlnode import HTMLNode, LeafNode, ParentNode
 
@@ -18,6 +19,35 @@ class TestHTMLNode(unittest.TestCase):
         self.assertIn('class="container"', props_html)
         self.assertIn('id="main"', props_html)
 
+    def test_props_to_html_escapes_values(self):
+        node = HTMLNode("a", "x", None, {"href": 'https://example.com/?q="a"&b=<c>', "title": "it's"})
+        self.assertEqual(
+            node.props_to_html(),
+            'href="https://example.com/?q=&quot;a&quot;&amp;b=&lt;c&gt;" title="it&#x27;s"',
+        )
+
+    def test_props_to_html_is_cached_until_props_change(self):
+        node = LeafNode("a", "link", {"href": "/one"})
+        first = node.props_to_html()
+        self.assertIs(node.props_to_html(), first)
+
+        node.props = {"href": "/two"}
+        self.assertEqual(node.props_to_html(), 'href="/two"')
+        self.assertEqual(node.to_html(), '<a href="/two">link</a>')
+
+        node.props = None
+        self.assertEqual(node.props_to_html(), "")
+
+    def test_props_changed_in_place(self):
+        node = LeafNode("a", "x", {"href": "/a"})
+        self.assertEqual(node.to_html(), '<a href="/a">x</a>')
+        node.props["href"] = "/b"
+        self.assertEqual(node.to_html(), '<a href="/b">x</a>')
+        node.props["title"] = "t"
+        self.assertEqual(node.to_html(), '<a href="/b" title="t">x</a>')
+        node.props.clear()
+        self.assertEqual(node.to_html(), "<a>x</a>")
+
 class TestLeafNode(unittest.TestCase):
     def test_leaf_to_html_p(self):
         node = LeafNode("p", "Hello, world!")
@@ -26,6 +56,20 @@ class TestLeafNode(unittest.TestCase):
         node2 = LeafNode("p", "Hello, world!", {"class": "text"})
         self.assertEqual(node2.to_html(), '<p class="text">Hello, world!</p>')
 
+    def test_leaves_share_empty_children(self):
+        node = LeafNode("b", "one")
+        node2 = LeafNode("i", "two")
+        self.assertEqual(len(node.children), 0)
+        self.assertIs(node.children, node2.children)
+        self.assertEqual(node, LeafNode("b", "one"))
+
+    def test_nodes_have_no_instance_dict(self):
+        for node in (HTMLNode("div"), LeafNode("b", "x"), ParentNode("p", [LeafNode(None, "x")])):
+            with self.subTest(node=type(node).__name__):
+                self.assertFalse(hasattr(node, "__dict__"))
+                with self.assertRaises(AttributeError):
+                    node.extra = 1
+
 class TestParentNode(unittest.TestCase):
     def test_to_html_with_children(self):
         child_node = LeafNode("span", "child")
@@ -54,5 +98,75 @@ class TestParentNode(unittest.TestCase):
             "<div><span><b>grandchild a</b><b>grandchild b</b></span><span><b>grandchild c</b><b>grandchild d</b></span></div>",
         )
 
+class TestWriteHTML(unittest.TestCase):
+    def render(self, node):
+        stream = io.StringIO()
+        node.write_html(stream)
+        return stream.getvalue()
+
+    def test_write_html_matches_to_html(self):
+        nodes = [
+            LeafNode(None, "plain text"),
+            LeafNode("a", "link", {"href": "https://example.com"}),
+            ParentNode("div", [LeafNode("b", "bold"), LeafNode(None, " text")], {"class": "box"}),
+            ParentNode("ul", [ParentNode("li", [ParentNode("ul", [ParentNode("li", [LeafNode(None, "deep")])])])]),
+        ]
+        for node in nodes:
+            with self.subTest(node=node.tag):
+                self.assertEqual(self.render(node), node.to_html())
+
+    def test_write_html_validates_like_to_html(self):
+        with self.assertRaises(ValueError):
+            self.render(ParentNode("div", []))
+        with self.assertRaises(ValueError):
+            self.render(ParentNode(None, [LeafNode("b", "x")]))
+        with self.assertRaises(ValueError):
+            self.render(ParentNode("div", [LeafNode("b", None)]))
+
+class TestDeepNesting(unittest.TestCase):
+    def nest(self, depth):
+        node = LeafNode("b", "core")
+        for _ in range(depth):
+            node = ParentNode("div", [node, LeafNode(None, "!")])
+        return node
+
+    def test_to_html_beyond_recursion_limit(self):
+        for depth in (10_000, 50_000):
+            with self.subTest(depth=depth):
+                html = self.nest(depth).to_html()
+                self.assertEqual(html, "<div>" * depth + "<b>core</b>" + "!</div>" * depth)
+
+    def test_write_html_beyond_recursion_limit(self):
+        stream = io.StringIO()
+        self.nest(20_000).write_html(stream)
+        self.assertEqual(stream.getvalue(), "<div>" * 20_000 + "<b>core</b>" + "!</div>" * 20_000)
+
+    def test_iter_html_yields_chunks_in_order(self):
+        node = ParentNode("p", [LeafNode(None, "a "), ParentNode("i", [LeafNode(None, "b")])], {"id": "x"})
+        self.assertEqual(list(node.iter_html()), ['<p id="x">a <i>b</i></p>'])
+        # Large trees come out in several chunks rather than one string
+        wide = ParentNode("ul", [ParentNode("li", [LeafNode("a", str(i), {"href": f"/{i}"})]) for i in range(2000)])
+        chunks = list(wide.iter_html())
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunks), wide.to_html())
+        self.assertTrue(wide.to_html().startswith('<ul><li><a href="/0">0</a></li>'))
+
+    def test_leaf_subclasses_render_with_their_own_to_html(self):
+        class Shouting(LeafNode):
+            __slots__ = ()
+
+            def to_html(self):
+                return self.value.upper()
+
+        node = ParentNode("p", [LeafNode(None, "a "), Shouting(None, "b")])
+        self.assertEqual(node.to_html(), "<p>a B</p>")
+
+    def test_error_in_deep_child(self):
+        node = ParentNode("div", [LeafNode("b", None)])
+        for _ in range(10_000):
+            node = ParentNode("div", [node])
+        with self.assertRaises(ValueError):
+            node.to_html()
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+from conversion import markdown_to_html_node
+from links import LinkIndex, page_links, resolve_link
+
+class TestPageLinks(unittest.TestCase):
+    def test_collects_hrefs_and_srcs_in_order(self):
+        tree = markdown_to_html_node(
+            "# Title with [home](/)\n\n"
+            "- [one](one.html)\n- ![logo](/img/logo.png)\n\n"
+            "> quoted [two](../two/)"
+        )
+        self.assertEqual(page_links(tree), ["/", "one.html", "/img/logo.png", "../two/"])
+
+    def test_page_without_links(self):
+        self.assertEqual(page_links(markdown_to_html_node("# Plain\n\ntext")), [])
+
+class TestResolveLink(unittest.TestCase):
+    def test_external_and_anchor_links(self):
+        for url in ("https://example.com", "mailto:a@b.c", "//cdn.example.com/x.js", "#section", "?page=2", ""):
+            with self.subTest(url=url):
+                self.assertIsNone(resolve_link("docs/intro.html", url))
+
+    def test_relative_and_absolute_links(self):
+        cases = {
+            "/": "index.html",
+            "/blog/": "blog/index.html",
+            "/styles.css": "styles.css",
+            "setup.html": "docs/setup.html",
+            "./setup.html#install": "docs/setup.html",
+            "../blog/first.html?ref=docs": "blog/first.html",
+            "../": "index.html",
+            "sub%20dir/page.html": "docs/sub dir/page.html",
+        }
+        for url, expected in cases.items():
+            with self.subTest(url=url):
+                self.assertEqual(resolve_link("docs/intro.html", url), expected)
+
+class TestLinkIndex(unittest.TestCase):
+    def test_broken_links_and_orphans(self):
+        index = LinkIndex()
+        index.add_page("index.md", "index.html", ["/docs/intro", "/missing.html", "https://example.com", "/logo.png"])
+        index.add_page("docs/intro.md", "docs/intro.html", ["../", "setup/", "#top"])
+        index.add_page("docs/setup/index.md", "docs/setup/index.html", [])
+        index.add_page("drafts/old.md", "drafts/old.html", ["/broken.png", "old.html"])
+        index.add_static("logo.png")
+        report = index.check()
+        self.assertEqual(report.broken, [("index.md", "/missing.html"), ("drafts/old.md", "/broken.png")])
+        # Linking to itself does not count
+        self.assertEqual(report.orphans, ["drafts/old.md"])
+        self.assertEqual(report.summary(), "2 broken links, 1 orphan pages")
+
+if __name__ == "__main__":
+    unittest.main()
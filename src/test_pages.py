@@ -0,0 +1,94 @@
+import io
+import os
+import tempfile
+import unittest
+
+from pages import CompiledTemplate, compile_template, fill_template, load_template, page_html, render_page, render_pages, stream_page
+
+TEMPLATE = "<html><title>{{ Title }}</title><body>{{ Content }}</body></html>"
+
+class TestCompiledTemplate(unittest.TestCase):
+    def test_splits_literals_and_slots(self):
+        template = CompiledTemplate(TEMPLATE)
+        self.assertEqual(
+            template.segments,
+            [
+                ("<html><title>", False),
+                ("Title", True),
+                ("</title><body>", False),
+                ("Content", True),
+                ("</body></html>", False),
+            ],
+        )
+
+    def test_render_matches_replace(self):
+        self.assertEqual(
+            compile_template(TEMPLATE).render("Home", "<p>hi</p>"),
+            TEMPLATE.replace("{{ Title }}", "Home").replace("{{ Content }}", "<p>hi</p>"),
+        )
+
+    def test_repeated_and_adjacent_slots(self):
+        template = CompiledTemplate("{{ Content }}{{ Title }}|{{ Content }}")
+        self.assertEqual(template.render_parts("T", iter(["a", "b"])), "abT|ab")
+
+    def test_values_are_not_substituted_again(self):
+        self.assertEqual(fill_template(TEMPLATE, "{{ Content }}", "x"), "<html><title>{{ Content }}</title><body>x</body></html>")
+
+    def test_other_placeholders_are_literal(self):
+        self.assertEqual(CompiledTemplate("{{ Author }}{{Title}}").render("T", "C"), "{{ Author }}{{Title}}")
+
+class TestRenderPage(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        self.template_path = self.write("template.html", TEMPLATE)
+
+    def write(self, name, text):
+        path = os.path.join(self.root, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def test_render_page(self):
+        page = self.write("index.md", "# Home\n\nWelcome **back**.")
+        self.assertEqual(
+            render_page(page, self.template_path),
+            "<html><title>Home</title><body><div><h1>Home</h1><p>Welcome <b>back</b>.</p></div></body></html>",
+        )
+
+    def test_render_pages(self):
+        paths = [self.write(f"p{i}.md", f"# Page {i}") for i in range(3)]
+        template = load_template(self.template_path)
+        self.assertEqual(render_pages(paths, template), [render_page(path, template) for path in paths])
+        self.assertEqual(render_pages(paths, self.template_path), render_pages(paths, template))
+
+    def test_stream_page(self):
+        page = self.write("big.md", "Intro\n\n# Big\n\n```\n" + "a < b\n" * 50 + "```")
+        out = io.StringIO()
+        stream_page(page, self.template_path, out, max_block_size=64)
+        self.assertEqual(out.getvalue(), render_page(page, self.template_path))
+        bare = io.StringIO()
+        stream_page(page, None, bare)
+        self.assertTrue(bare.getvalue().startswith("<div><p>Intro</p><h1>Big</h1>"))
+
+    def test_page_html_accepts_template_text(self):
+        self.assertEqual(page_html("# A", TEMPLATE), page_html("# A", compile_template(TEMPLATE)))
+
+    def test_template_is_cached_until_it_changes(self):
+        first = load_template(self.template_path)
+        self.assertIs(load_template(self.template_path), first)
+        self.write("template.html", "<main>{{ Content }}</main>")
+        stat = os.stat(self.template_path)
+        os.utime(self.template_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        second = load_template(self.template_path)
+        self.assertIsNot(second, first)
+        self.assertEqual(second.render("T", "C"), "<main>C</main>")
+
+    def test_missing_title(self):
+        page = self.write("untitled.md", "no title")
+        with self.assertRaises(ValueError):
+            render_page(page, self.template_path)
+
+if __name__ == "__main__":
+    unittest.main()
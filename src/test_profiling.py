@@ -0,0 +1,111 @@
+import json
+import os
+import tempfile
+import unittest
+
+import conversion
+import document
+import htmlnode
+from build import build_site
+from htmlnode import LeafNode, ParentNode
+from profiling import Profiler
+
+MARKDOWN = "# Title\n\nSome **bold** and `code` with a [link](/a).\n\n- one\n- two"
+
+class TestProfiler(unittest.TestCase):
+    def test_records_each_stage(self):
+        with Profiler() as profiler:
+            html = conversion.markdown_to_html_node(MARKDOWN).to_html()
+        summary = profiler.summary()
+        self.assertEqual(summary["markdown_to_blocks"]["calls"], 1)
+        self.assertEqual(summary["markdown_to_blocks"]["bytes"], len(MARKDOWN))
+        self.assertEqual(summary["block_to_block_type"]["calls"], 3)
+        self.assertGreater(summary["text_to_text_nodes"]["calls"], 0)
+        self.assertGreater(summary["text_node_to_html_node"]["calls"], 0)
+        self.assertEqual(summary["ParentNode.to_html"]["calls"], 1)
+        self.assertEqual(summary["ParentNode.to_html"]["bytes"], len(html))
+        # Leaves inside a tree are rendered by the tree's walk, not to_html
+        self.assertNotIn("LeafNode.to_html", summary)
+        self.assertEqual(summary["serialize_html"]["bytes"], len(html))
+
+    def test_profiles_a_build(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            content = os.path.join(tmp, "content")
+            os.makedirs(content)
+            for name in ("index", "about"):
+                with open(os.path.join(content, f"{name}.md"), "w", encoding="utf-8") as f:
+                    f.write(MARKDOWN)
+            template = os.path.join(tmp, "template.html")
+            with open(template, "w", encoding="utf-8") as f:
+                f.write("<html>{{ Title }}{{ Content }}</html>")
+            with Profiler() as profiler:
+                build_site(content, template, os.path.join(tmp, "public"), None)
+        summary = profiler.summary()
+        self.assertEqual(summary["markdown_to_blocks"]["calls"], 2)
+        # Blocks are serialized once; the second page reuses them from the
+        # build's block cache
+        self.assertEqual(summary["serialize_html"]["calls"], 3)
+        html = conversion.markdown_to_html_node(MARKDOWN).to_html()
+        self.assertEqual(summary["serialize_html"]["bytes"], len(html) - len("<div></div>"))
+
+    def test_uninstall_restores_originals(self):
+        originals = (
+            conversion.block_to_block_type,
+            document.block_to_block_type,
+            LeafNode.__dict__["to_html"],
+            ParentNode.__dict__["to_html"],
+            htmlnode._iter_html,
+        )
+        with Profiler():
+            self.assertIsNot(conversion.block_to_block_type, originals[0])
+            # Names imported into other modules are instrumented too
+            self.assertIsNot(document.block_to_block_type, originals[1])
+        self.assertEqual(
+            (
+                conversion.block_to_block_type,
+                document.block_to_block_type,
+                LeafNode.__dict__["to_html"],
+                ParentNode.__dict__["to_html"],
+                htmlnode._iter_html,
+            ),
+            originals,
+        )
+
+    def test_errors_are_counted_and_propagate(self):
+        with Profiler() as profiler:
+            with self.assertRaises(ValueError):
+                conversion.text_to_text_nodes("an **unclosed delimiter")
+        self.assertEqual(profiler.summary()["text_to_text_nodes"]["calls"], 1)
+
+    def test_summary_table(self):
+        with Profiler() as profiler:
+            conversion.markdown_to_html_node(MARKDOWN).to_html()
+        table = profiler.summary_table().splitlines()
+        self.assertTrue(table[0].startswith("stage"))
+        self.assertTrue(any(line.startswith("markdown_to_blocks") for line in table))
+
+    def test_chrome_trace(self):
+        with Profiler(trace=True) as profiler:
+            conversion.markdown_to_html_node(MARKDOWN).to_html()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trace.json")
+            profiler.write_trace(path)
+            with open(path, encoding="utf-8") as f:
+                trace = json.load(f)
+        events = trace["traceEvents"]
+        self.assertEqual(
+            sum(event["name"] == "markdown_to_blocks" for event in events),
+            trace["otherData"]["summary"]["markdown_to_blocks"]["calls"],
+        )
+        for event in events:
+            self.assertEqual(event["ph"], "X")
+            self.assertGreaterEqual(event["ts"], 0)
+            self.assertGreaterEqual(event["dur"], 0)
+
+    def test_trace_is_capped(self):
+        with Profiler(trace=True, max_events=5) as profiler:
+            conversion.markdown_to_html_node(MARKDOWN).to_html()
+        self.assertEqual(len(profiler.chrome_trace()["traceEvents"]), 5)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import json
+import os
+import tempfile
+import unittest
+
+from conversion import markdown_to_html_node
+from render_cache import BlockRenderCache, converter_version
+
+MARKDOWN = """# Release notes
+
+Fixed **three** bugs in the [parser](/parser).
+
+- faster builds
+- smaller pages
+"""
+
+class TestBlockRenderCache(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "cache", "blocks.json")
+
+    def test_matches_uncached_rendering(self):
+        cache = BlockRenderCache(self.path)
+        expected = markdown_to_html_node(MARKDOWN).to_html()
+        self.assertEqual(cache.render_markdown(MARKDOWN), expected)
+        self.assertEqual(cache.render_markdown(MARKDOWN), expected)
+        self.assertEqual(cache.render_markdown(""), "<div></div>")
+        self.assertEqual((cache.hits, cache.misses), (3, 3))
+
+    def test_persists_between_builds(self):
+        first = BlockRenderCache(self.path)
+        first.render_markdown(MARKDOWN)
+        first.save()
+
+        second = BlockRenderCache(self.path)
+        self.assertEqual(len(second), 3)
+        second.render_markdown(MARKDOWN + "\n\nA new paragraph.")
+        self.assertEqual((second.hits, second.misses), (3, 1))
+        self.assertEqual(second.hit_rate, 0.75)
+
+    def test_invalidated_by_converter_version(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"version": "older", "entries": {"key": "<p>stale</p>"}}, f)
+        self.assertEqual(len(BlockRenderCache(self.path)), 0)
+
+        cache = BlockRenderCache(self.path)
+        cache.render_block("Some paragraph")
+        cache.save()
+        with open(self.path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["version"], converter_version())
+
+    def test_evicts_least_recently_used(self):
+        cache = BlockRenderCache(self.path, max_bytes=len("<p>block 0</p>") * 2)
+        cache.render_block("block 0")
+        cache.render_block("block 1")
+        cache.render_block("block 0")  # now more recently used than block 1
+        cache.render_block("block 2")
+        self.assertEqual(len(cache), 2)
+
+        cache.render_block("block 0")
+        self.assertEqual(cache.hits, 2)
+        cache.render_block("block 1")
+        self.assertEqual(cache.misses, 4)
+
+    def test_ignores_unreadable_cache_file(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("not json")
+        self.assertEqual(len(BlockRenderCache(self.path)), 0)
+
+if __name__ == "__main__":
+    unittest.main()
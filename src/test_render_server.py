@@ -0,0 +1,121 @@
+import io
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+
+from render_server import RenderClient, RenderServer, read_frame, render_fragment, serve_stream, write_frame
+
+def _requests(*frames):
+    data = io.BytesIO()
+    for kind, body in frames:
+        write_frame(data, kind, body)
+    data.seek(0)
+    return data
+
+def _replies(data):
+    data.seek(0)
+    replies = []
+    while (frame := read_frame(data)) is not None:
+        replies.append(frame)
+    return replies
+
+class TestServeStream(unittest.TestCase):
+    def test_renders_each_fragment(self):
+        out = io.BytesIO()
+        rendered = serve_stream(_requests(("render", "# Hi"), ("render", "café **b**")), out)
+        self.assertEqual(rendered, 2)
+        self.assertEqual(_replies(out), [
+            ("ok", "<div><h1>Hi</h1></div>"),
+            ("ok", "<div><p>café <b>b</b></p></div>"),
+        ])
+
+    def test_errors_do_not_end_the_stream(self):
+        out = io.BytesIO()
+        serve_stream(_requests(("render", "**open"), ("stop", ""), ("render", "ok")), out)
+        replies = _replies(out)
+        self.assertEqual([kind for kind, _ in replies], ["error", "error", "ok"])
+        self.assertIn("unmatched", replies[0][1])
+        self.assertEqual(replies[1][1], "unknown request: stop")
+
+    def test_malformed_frames(self):
+        with self.assertRaises(ValueError):
+            serve_stream(io.BytesIO(b"render\n"), io.BytesIO())
+        with self.assertRaises(ValueError):
+            serve_stream(io.BytesIO(b"render 10\nshort"), io.BytesIO())
+
+    def test_fragment_matches_conversion(self):
+        self.assertEqual(render_fragment(""), "<div></div>")
+
+class TestUnixSocket(unittest.TestCase):
+    def test_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "render.sock")
+            # A socket nothing listens on any more is replaced
+            stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            stale.bind(path)
+            stale.close()
+            server = RenderServer(path)
+            thread = threading.Thread(target=server.serve_forever)
+            thread.start()
+            try:
+                with RenderClient.connect(path) as first, RenderClient.connect(path) as second:
+                    self.assertEqual(first.render("_a_"), "<div><p><i>a</i></p></div>")
+                    self.assertEqual(second.render("b"), "<div><p>b</p></div>")
+                    with self.assertRaises(ValueError):
+                        first.render("`open")
+                    self.assertEqual(first.render("c"), "<div><p>c</p></div>")
+            finally:
+                server.shutdown()
+                server.server_close()
+                thread.join()
+            self.assertFalse(os.path.exists(path))
+
+    def test_refuses_to_replace_other_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            page = os.path.join(tmp, "page.html")
+            with open(page, "w") as f:
+                f.write("keep")
+            with self.assertRaises(ValueError):
+                RenderServer(page)
+            with open(page) as f:
+                self.assertEqual(f.read(), "keep")
+
+            path = os.path.join(tmp, "render.sock")
+            with RenderServer(path):
+                with self.assertRaises(ValueError):
+                    RenderServer(path)
+                self.assertTrue(os.path.exists(path))
+
+class TestCommandLine(unittest.TestCase):
+    def run_main(self, *args, stdin=""):
+        main = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+        return subprocess.run([sys.executable, main, *args], input=stdin, capture_output=True, text=True)
+
+    def test_render(self):
+        result = self.run_main("render", stdin="# T\n\nbody")
+        self.assertEqual(result.stdout, "<div><h1>T</h1><p>body</p></div>")
+
+    def test_render_server_over_stdin(self):
+        requests = _requests(("render", "x"), ("render", "**y**")).getvalue().decode("utf-8")
+        result = self.run_main("render-server", stdin=requests)
+        self.assertEqual(_replies(io.BytesIO(result.stdout.encode("utf-8"))), [
+            ("ok", "<div><p>x</p></div>"),
+            ("ok", "<div><p><b>y</b></p></div>"),
+        ])
+
+    def test_fragments_load_only_the_converter(self):
+        src = os.path.dirname(os.path.abspath(__file__))
+        code = (
+            f"import sys; sys.path.insert(0, {src!r}); sys.argv = ['main.py', 'render']; "
+            "sys.stdin = __import__('io').StringIO('plain'); import main; main.main(); "
+            "print(sorted({'build', 'pages', 'profiling', 'search', 'links', 'server', 'multiprocessing'} & set(sys.modules)))"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertTrue(result.stdout.endswith("[]\n"), result.stdout)
+
+if __name__ == "__main__":
+    unittest.main()
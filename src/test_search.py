@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+
+from conversion import markdown_to_html_node
+from search import SearchIndex, page_terms, page_url, search, shard_for, tokenize
+
+class TestTerms(unittest.TestCase):
+    def test_tokenize(self):
+        self.assertEqual(tokenize("Hello, World! snake_case 42 Ünïcode"), ["hello", "world", "snake_case", "42", "ünïcode"])
+
+    def test_page_terms_skip_code_links_and_images(self):
+        tree = markdown_to_html_node(
+            "# Static Sites\n\nBuild **fast** _pages_ with `code` and [a link](/x) ![alt](/y.png).\n\n```\nignored\n```"
+        )
+        self.assertEqual(page_terms(tree), ["static", "sites", "build", "fast", "pages", "with", "and"])
+
+    def test_shard_for(self):
+        self.assertEqual([shard_for(term) for term in ("apple", "42", "ünïcode", "_x")], ["a", "4", "_", "_"])
+
+    def test_page_url(self):
+        self.assertEqual(page_url("index.html"), "/")
+        self.assertEqual(page_url("blog/index.html"), "/blog/")
+        self.assertEqual(page_url("blog/first.html"), "/blog/first.html")
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.public = tmp.name
+        self.search_dir = os.path.join(self.public, "search")
+        self.index = SearchIndex()
+        self.index.add_page("a.md", "/a.html", "A", tokenize("static site generator builds a static site"))
+        self.index.add_page("b.md", "/b.html", "B", tokenize("site generator"))
+        self.index.add_page("c.md", "/c.html", "C", tokenize("zebra"))
+
+    def test_positions(self):
+        self.assertEqual(self.index.postings["static"], {0: [0, 5]})
+        self.assertEqual(self.index.postings["site"], {0: [1, 6], 1: [0]})
+
+    def test_remove_page(self):
+        self.index.remove_page("c.md")
+        self.assertNotIn("zebra", self.index.postings)
+        self.assertEqual(len(self.index), 2)
+        self.index.remove_page("missing.md")
+
+    def test_readding_a_page_replaces_it(self):
+        self.index.add_page("b.md", "/b.html", "B", tokenize("rewritten"))
+        self.assertNotIn(1, self.index.postings["site"])
+        self.assertEqual(list(self.index.postings["rewritten"].values()), [[0]])
+
+    def test_write_and_load(self):
+        self.index.write(self.public)
+        self.assertEqual(
+            sorted(os.listdir(self.search_dir)),
+            ["pages.json", "terms-a.json", "terms-b.json", "terms-g.json", "terms-s.json", "terms-z.json"],
+        )
+        loaded = SearchIndex.load(self.public)
+        self.assertEqual(loaded.postings, self.index.postings)
+        self.assertEqual(loaded.pages, self.index.pages)
+        loaded.remove_page("c.md")
+        self.assertEqual(loaded.add_page("d.md", "/d.html", "D", []), 3)
+        loaded.write(self.public)
+        self.assertNotIn("terms-z.json", os.listdir(self.search_dir))
+
+    def test_load_without_index(self):
+        self.assertIsNone(SearchIndex.load(self.public))
+
+    def test_search(self):
+        self.index.write(self.public)
+        self.assertEqual(search(self.search_dir, "Site"), [("/a.html", "A", 2), ("/b.html", "B", 1)])
+        self.assertEqual(search(self.search_dir, "static site"), [("/a.html", "A", 4)])
+        self.assertEqual(search(self.search_dir, "site generator", phrase=True), [("/a.html", "A", 1), ("/b.html", "B", 1)])
+        self.assertEqual(search(self.search_dir, "generator site", phrase=True), [])
+        self.assertEqual(search(self.search_dir, "site", limit=1), [("/a.html", "A", 2)])
+        self.assertEqual(search(self.search_dir, "missing"), [])
+        self.assertEqual(search(self.search_dir, "quokka"), [])
+        self.assertEqual(search(self.search_dir, "!!"), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+import http.client
+import os
+import statistics
+import tempfile
+import threading
+import time
+import unittest
+
+from conversion import markdown_to_html_node
+from server import LIVE_RELOAD_PATH, LIVE_RELOAD_SCRIPT, LiveSite, make_server
+
+TEMPLATE = "<html><title>{{ Title }}</title><body>{{ Content }}</body></html>"
+
+def typical_page(edit=""):
+    blocks = ["# Guide"]
+    for i in range(30):
+        blocks.append(f"Paragraph {i} with **bold**, _italic_ and a [link](/docs/{i}).")
+        blocks.append(f"- item {i}\n- another item")
+    blocks.append(f"Last paragraph{edit}.")
+    return "\n\n".join(blocks)
+
+class TestLiveRendering(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        root = tmp.name
+        self.content = os.path.join(root, "content")
+        self.public = os.path.join(root, "public")
+        self.template = os.path.join(root, "template.html")
+        os.makedirs(self.content)
+        with open(self.template, "w", encoding="utf-8") as f:
+            f.write(TEMPLATE)
+        self.write_page(typical_page())
+
+    def write_page(self, markdown, name="guide.md"):
+        with open(os.path.join(self.content, name), "w", encoding="utf-8") as f:
+            f.write(markdown)
+
+    def read_output(self):
+        with open(os.path.join(self.public, "guide.html"), encoding="utf-8") as f:
+            return f.read()
+
+    def test_renders_like_markdown_to_html_node(self):
+        site = LiveSite(self.content, self.template, self.public)
+        site.build()
+        for markdown in (typical_page(" edited"), "# Short\n\nbody"):
+            self.write_page(markdown)
+            site.render_page("guide.md")
+            self.assertIn(markdown_to_html_node(markdown).to_html(), self.read_output())
+
+    def test_only_changed_blocks_are_rendered(self):
+        site = LiveSite(self.content, self.template, self.public)
+        site.build()
+        self.write_page(typical_page(" edited"))
+        self.assertEqual(site.render_page("guide.md"), 1)
+        self.assertEqual(site.render_page("guide.md"), 0)
+
+    def test_first_save_after_restart_renders_one_block(self):
+        LiveSite(self.content, self.template, self.public).build()
+        # The next session's build skips the page it already wrote
+        site = LiveSite(self.content, self.template, self.public)
+        self.assertEqual(site.build().skipped, ["guide.md"])
+        self.write_page(typical_page(" edited"))
+        self.assertEqual(site.render_page("guide.md"), 1)
+
+    def test_first_save_after_full_build_renders_one_block(self):
+        site = LiveSite(self.content, self.template, self.public)
+        site.build()
+        self.write_page("# New", "new.md")
+        site.apply_changes([os.path.join(self.content, "new.md")])
+        self.write_page(typical_page(" edited"))
+        self.assertEqual(site.render_page("guide.md"), 1)
+
+class TestLiveSite(unittest.TestCase):
+    # Save-to-reload budget for a typical page
+    LATENCY_TARGET = 0.050
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        root = tmp.name
+        self.content = os.path.join(root, "content")
+        self.public = os.path.join(root, "public")
+        self.template = os.path.join(root, "template.html")
+        os.makedirs(self.content)
+        self.write(self.template, TEMPLATE)
+        self.page = os.path.join(self.content, "guide.md")
+        self.write(self.page, typical_page())
+
+        self.site = LiveSite(self.content, self.template, self.public)
+        self.site.build()
+        self.stop = threading.Event()
+        # At the default interval, so the latency test covers what users get
+        watcher = threading.Thread(target=self.site.watch, kwargs={"stop": self.stop}, daemon=True)
+        watcher.start()
+        self.addCleanup(watcher.join)
+        self.addCleanup(self.stop.set)
+
+    def write(self, path, text):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def read_output(self):
+        with open(os.path.join(self.public, "guide.html"), encoding="utf-8") as f:
+            return f.read()
+
+    def save_and_wait(self, text):
+        version = self.site.version
+        start = time.perf_counter()
+        self.write(self.page, text)
+        self.assertNotEqual(self.site.wait_for_change(version, timeout=2), version)
+        return time.perf_counter() - start
+
+    def test_save_to_reload_latency(self):
+        latencies = [self.save_and_wait(typical_page(f" edit {i}")) for i in range(7)]
+        self.assertIn("Last paragraph edit 6.", self.read_output())
+        self.assertLess(statistics.median(latencies), self.LATENCY_TARGET)
+
+    def test_same_size_save_in_the_same_mtime_tick(self):
+        stat = os.stat(self.page)
+        version = self.site.version
+        self.write(self.page, typical_page().replace("Last", "Lost"))
+        os.utime(self.page, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(os.stat(self.page).st_size, stat.st_size)
+        self.assertNotEqual(self.site.wait_for_change(version, timeout=2), version)
+        self.assertIn("Lost paragraph.", self.read_output())
+
+    def test_new_and_removed_pages(self):
+        version = self.site.version
+        self.write(os.path.join(self.content, "new.md"), "# New\n\nFresh page")
+        version = self.site.wait_for_change(version, timeout=2)
+        self.assertTrue(os.path.exists(os.path.join(self.public, "new.html")))
+
+        os.remove(os.path.join(self.content, "new.md"))
+        self.site.wait_for_change(version, timeout=2)
+        self.assertFalse(os.path.exists(os.path.join(self.public, "new.html")))
+
+    def test_serves_pages_and_pushes_reloads(self):
+        server = make_server(self.site, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        port = server.server_address[1]
+
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        connection.request("GET", "/guide.html")
+        body = connection.getresponse().read().decode("utf-8")
+        self.assertIn(LIVE_RELOAD_SCRIPT + "</body>", body)
+        connection.close()
+
+        events = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        events.request("GET", LIVE_RELOAD_PATH)
+        response = events.getresponse()
+        self.assertEqual(response.getheader("Content-Type"), "text/event-stream")
+        self.write(self.page, typical_page(" pushed"))
+        self.assertEqual(response.fp.readline(), b"data: reload\n")
+        events.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import errno
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import site_io
+from site_io import BulkIO, copy_if_changed, fast_copy, write_if_changed
+
+class TestSiteIO(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+
+    def path(self, *parts):
+        return os.path.join(self.root, *parts)
+
+    def test_write_if_changed_skips_identical_bytes(self):
+        path = self.path("out", "page.html")
+        self.assertTrue(write_if_changed(path, b"<p>one</p>"))
+        os.utime(path, ns=(0, 0))
+        self.assertFalse(write_if_changed(path, b"<p>one</p>"))
+        self.assertEqual(os.stat(path).st_mtime_ns, 0)
+        self.assertTrue(write_if_changed(path, b"<p>two</p>"))
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"<p>two</p>")
+
+    def test_write_if_changed_replaces_the_file(self):
+        path = self.path("page.html")
+        write_if_changed(path, b"<p>old</p>")
+        # A reader that opened the old file keeps reading it whole
+        with open(path, "rb") as reader:
+            write_if_changed(path, b"<p>new</p>")
+            self.assertEqual(reader.read(), b"<p>old</p>")
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"<p>new</p>")
+        self.assertEqual(os.listdir(self.root), ["page.html"])
+
+    def test_fast_copy(self):
+        data = os.urandom(3 * 1024 * 1024 + 7)
+        with open(self.path("src.bin"), "wb") as f:
+            f.write(data)
+        fast_copy(self.path("src.bin"), self.path("nested", "dst.bin"))
+        with open(self.path("nested", "dst.bin"), "rb") as f:
+            self.assertEqual(f.read(), data)
+
+    def test_fast_copy_falls_back_when_kernel_copy_is_unsupported(self):
+        with open(self.path("src.css"), "w") as f:
+            f.write("body {}")
+        unsupported = OSError(errno.EXDEV, "cross-device")
+        with mock.patch.object(site_io, "_copy_file_range", side_effect=unsupported), \
+                mock.patch.object(site_io, "_sendfile", side_effect=unsupported):
+            fast_copy(self.path("src.css"), self.path("dst.css"))
+        with open(self.path("dst.css")) as f:
+            self.assertEqual(f.read(), "body {}")
+
+    def test_copy_if_changed(self):
+        with open(self.path("styles.css"), "w") as f:
+            f.write("body {}")
+        self.assertTrue(copy_if_changed(self.path("styles.css"), self.path("public", "styles.css")))
+        self.assertFalse(copy_if_changed(self.path("styles.css"), self.path("public", "styles.css")))
+        with open(self.path("styles.css"), "w") as f:
+            f.write("body {color: red}")
+        self.assertTrue(copy_if_changed(self.path("styles.css"), self.path("public", "styles.css")))
+
+    def test_bulk_io_keeps_order(self):
+        paths = [self.path(f"{i}.md") for i in range(50)]
+        texts = [f"# Page {i} ✓" for i in range(50)]
+        for workers in (1, 4):
+            with BulkIO(workers) as bulk:
+                self.assertEqual(bulk.write_texts(paths, texts), [workers == 1] * 50)
+                self.assertEqual(bulk.read_texts(paths), texts)
+
+if __name__ == "__main__":
+    unittest.main()